@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""
+ASYNC GAUNTLET ENGINE
+Runs many explorer gauntlets at once on AsyncOpenAI
+- One gauntlet per cycle, all cycles share one global concurrency cap
+- Optional speculative branches per iteration (first good answer wins)
+- Population mode: N ideas, K perturbed children each, keep the top N
+Wall time for a batch is set by the slowest chain, not the sum of chains.
+"""
+
+import sys
+import random
+import asyncio
+import argparse
+from datetime import datetime
+
+from explorer_gauntlet import (
+    GAUNTLET_PROVIDER,
+    GAUNTLET_MODEL,
+    GAUNTLET_TIMEOUT,
+    TOPIC_MAX_ATTEMPTS,
+    GAUNTLET_SIDECAR,
+    noise_scheduler,
+    pick_perturbations,
+    credit_perturbations,
+    as_messages,
+    build_phase_1_2_messages,
+    build_phase_3_messages,
+    build_reflection_messages,
+    build_translation_messages,
+    extract_idea_from_response,
+    is_error_response,
+    require_answer,
+    write_gauntlet_report,
+    clean_topic,
+    build_topic_prompt,
+    report_repeat,
+    convergence_monitor,
+    reseed_size,
+)
+from similarity import tokenize, novelty
+from llm_client import achat_completion, LLMError
+from run_store import start_run, prompt_cache_summary
+from telemetry import phase
+from topic_index import default_topic_index
+from transcript_writer import GauntletReportWriter
+
+DEFAULT_CONCURRENCY = 16
+
+# Children longer than this get their score scaled down (prompt asks for 2-4 sentences)
+MAX_IDEA_WORDS = 120
+
+def score_child(parent_idea, child_idea):
+    """
+    Cheap local fitness for a perturbed child: how far it moved from its
+    parent, discounted when it rambles past the requested length.
+    """
+    if not child_idea or is_error_response(child_idea):
+        return 0.0
+    words = len(tokenize(child_idea))
+    brevity = 1.0 if words <= MAX_IDEA_WORDS else MAX_IDEA_WORDS / words
+    return novelty(parent_idea, child_idea) * brevity
+
+def _child_rng():
+    """A private Random drawn from the global one, so random.seed() (e.g. a
+    cassette replay) fixes every concurrent cycle's choices"""
+    return random.Random(random.getrandbits(64))
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+
+class AsyncGauntletEngine:
+    """Shared client + global concurrency cap for every gauntlet in a batch"""
+
+    def __init__(self, max_concurrency=DEFAULT_CONCURRENCY, client=None):
+        # None = the pooled llm_client client for the running event loop
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.calls = 0
+        self.errors = 0
+
+    async def call_deepseek(self, prompt, max_tokens=4000, label="", bypass_cache=False):
+        """Async twin of explorer_gauntlet.call_deepseek"""
+        return (await self.call_deepseek_with_usage(prompt, max_tokens, label, bypass_cache))[0]
+
+    async def call_deepseek_with_usage(self, prompt, max_tokens=4000, label="",
+                                       bypass_cache=False):
+        """call_deepseek, returning (content, usage); usage is None for a failed call"""
+        async with self.semaphore:
+            self.calls += 1
+            try:
+                response = await achat_completion(
+                    GAUNTLET_PROVIDER,
+                    client=self.client,
+                    bypass_cache=bypass_cache,
+                    model=GAUNTLET_MODEL,
+                    messages=as_messages(prompt),
+                    max_tokens=max_tokens,
+                    timeout=GAUNTLET_TIMEOUT
+                )
+                return response.choices[0].message.content, response.usage
+            except LLMError as e:
+                self.errors += 1
+                print(f"  {label} ✗ ERROR: {e}")
+                return f"ERROR: {e}", None
+
+    async def _reflect(self, current_idea, perturbations, label, bypass_cache=False):
+        """(evolved idea, completion tokens the call spent)"""
+        response, usage = await self.call_deepseek_with_usage(
+            build_reflection_messages(current_idea, perturbations),
+            max_tokens=800,
+            label=label,
+            bypass_cache=bypass_cache
+        )
+        return response.strip(), getattr(usage, "completion_tokens", None)
+
+    async def _speculate(self, current_idea, candidates, label, bypass_cache=False):
+        """
+        Run one reflection per candidate perturbation set concurrently.
+        The first non-error answer wins and the others are cancelled.
+        Returns (winning candidate index, evolved idea, its completion tokens).
+        """
+        tasks = {
+            asyncio.create_task(
+                self._reflect(current_idea, perturbations, label, bypass_cache)
+            ): index
+            for index, (noise_ops, perturbations) in enumerate(candidates)
+        }
+        fallback = None
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    evolved_idea, tokens = task.result()
+                    if not is_error_response(evolved_idea):
+                        return tasks[task], evolved_idea, tokens
+                    if fallback is None:
+                        fallback = (tasks[task], evolved_idea, tokens)
+            return fallback
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def gauntlet(self, initial_idea, num_iterations=None, branches=1,
+                       rng=None, label="", scheduler=None):
+        """
+        Async idea_gauntlet. With branches > 1 every iteration fans out
+        that many perturbation sets and keeps the first to come back; only
+        the winner's score reaches the noise scheduler.
+        Returns the same dict shape as explorer_gauntlet.idea_gauntlet.
+        """
+        rng = rng or _child_rng()
+        if scheduler is None:
+            scheduler = noise_scheduler()
+
+        if num_iterations is None:
+            num_iterations = rng.randint(8, 20)
+
+        current_idea = extract_idea_from_response(initial_idea)
+        reflection_chain = []
+        monitor = convergence_monitor()
+        reseed = False
+        stop_reason = "completed"
+
+        for i in range(num_iterations):
+            candidates = []
+            for _ in range(branches):
+                num_ops = rng.randint(1, 3)
+                candidates.append(pick_perturbations(
+                    reseed_size(num_ops) if reseed else num_ops, rng, scheduler
+                ))
+
+            # No cached answers while the scheduler learns (as in idea_gauntlet)
+            with phase("gauntlet", iteration=i + 1):
+                winner, evolved_idea, tokens = await self._speculate(
+                    current_idea, candidates, f"{label}[{i+1}/{num_iterations}]",
+                    bypass_cache=scheduler is not None
+                )
+            noise_ops, perturbations = candidates[winner]
+
+            # Every branch failed - keep the current idea rather than the error
+            failed = is_error_response(evolved_idea)
+            if failed:
+                evolved_idea = current_idea
+
+            similarity = monitor.observe(current_idea, evolved_idea, failed)
+            score = None if failed else credit_perturbations(
+                scheduler, noise_ops, perturbations, current_idea, evolved_idea, tokens
+            )
+
+            reflection = {
+                "iteration": i + 1,
+                "perturbations": perturbations,
+                "noise_operations": noise_ops,
+                "idea_before": current_idea,
+                "idea_after": evolved_idea,
+                "branches": branches,
+                "similarity": None if similarity is None else round(similarity, 3),
+                "score": None if score is None else round(score, 3),
+                "completion_tokens": tokens
+            }
+            if reseed:
+                reflection["reseeded"] = True
+            reflection_chain.append(reflection)
+
+            print(f"{label} iteration {i+1}/{num_iterations}: {', '.join(noise_ops)}")
+
+            current_idea = evolved_idea
+
+            signal = monitor.signal()
+            reseed = signal == "reseed"
+            if signal == "stop":
+                stop_reason = "converged"
+                print(f"{label} converged at iteration {i+1}/{num_iterations}")
+                break
+
+        if reflection_chain:
+            reflection_chain[-1]["stop_reason"] = stop_reason
+
+        return {
+            "initial_idea": extract_idea_from_response(initial_idea),
+            "final_idea": current_idea,
+            "iterations": len(reflection_chain),
+            "planned_iterations": num_iterations,
+            "stop_reason": stop_reason,
+            "reflection_chain": reflection_chain
+        }
+
+    async def _spawn_child(self, parent, generation, rng, label, scheduler):
+        """
+        One perturbed child, ranked by score_child; the noise scheduler is
+        credited with its novelty per completion token (failed calls aren't),
+        so the call skips the response cache while a scheduler is learning.
+        """
+        noise_ops, perturbations = pick_perturbations(rng.randint(1, 3), rng, scheduler)
+        child_idea, tokens = await self._reflect(parent["idea"], perturbations, label,
+                                                 bypass_cache=scheduler is not None)
+        score = score_child(parent["idea"], child_idea)
+        if scheduler and child_idea and not is_error_response(child_idea):
+            scheduler.observe(noise_ops, perturbations, parent["idea"], child_idea, tokens)
+        return {
+            "idea": child_idea,
+            "score": score,
+            "reflection_chain": parent["reflection_chain"] + [{
+                "iteration": generation,
+                "perturbations": perturbations,
+                "noise_operations": noise_ops,
+                "idea_before": parent["idea"],
+                "idea_after": child_idea,
+                "score": score,
+                "completion_tokens": tokens
+            }]
+        }
+
+    async def population_gauntlet(self, initial_idea, population=4, branching=3,
+                                  generations=5, rng=None, label="", scheduler=None):
+        """
+        Evolutionary gauntlet: every generation each of the (up to)
+        `population` survivors spawns `branching` perturbed children in
+        parallel, children are scored locally, and the top `population`
+        survive. Each survivor carries its own lineage as a
+        reflection_chain list shaped like idea_gauntlet's.
+        """
+        rng = rng or _child_rng()
+        if scheduler is None:
+            scheduler = noise_scheduler()
+        start = datetime.now()
+
+        seed_idea = extract_idea_from_response(initial_idea)
+        survivors = [{"idea": seed_idea, "score": 0.0, "reflection_chain": []}]
+        explored = 0
+        # The population already explores wide; a plateaued best idea just stops
+        monitor = convergence_monitor(max_reseeds=0)
+        stop_reason = "completed"
+        generation = 0
+
+        for generation in range(1, generations + 1):
+            with phase("population", iteration=generation):
+                children = await asyncio.gather(*[
+                    self._spawn_child(
+                        parent, generation, rng,
+                        f"{label}[gen {generation}/{generations}]", scheduler
+                    )
+                    for parent in survivors
+                    for _ in range(branching)
+                ])
+            explored += len(children)
+
+            children.sort(key=lambda child: child["score"], reverse=True)
+            best_before = survivors[0]["idea"]
+            survivors = [c for c in children if c["score"] > 0][:population] or survivors
+
+            print(f"{label} generation {generation}/{generations}: "
+                  f"{len(children)} children, best score {children[0]['score']:.2f}")
+
+            monitor.observe(best_before, survivors[0]["idea"])
+            if monitor.signal() == "stop":
+                stop_reason = "converged"
+                print(f"{label} converged at generation {generation}/{generations}")
+                break
+
+        best = survivors[0]
+        minutes = max((datetime.now() - start).total_seconds() / 60, 1e-9)
+
+        return {
+            "initial_idea": seed_idea,
+            "final_idea": best["idea"],
+            "iterations": generation,
+            "planned_iterations": generations,
+            "stop_reason": stop_reason,
+            "reflection_chain": best["reflection_chain"],
+            "population": survivors,
+            "ideas_explored": explored,
+            "ideas_per_minute": explored / minutes
+        }
+
+    async def random_topic(self, label="", max_attempts=TOPIC_MAX_ATTEMPTS):
+        """
+        generate_random_topic on the async client. The duplicate check and
+        the add run without an await between them, so concurrent cycles
+        can't both claim the same topic.
+        """
+
+        index = default_topic_index()
+        rejected = []
+        for attempt in range(max_attempts):
+            with phase("topic", attempt=attempt + 1):
+                response = await self.call_deepseek(
+                    build_topic_prompt(rejected), max_tokens=100, label=label,
+                    bypass_cache=True
+                )
+            # Before clean_topic, which would strip the "ERROR:" prefix
+            topic = clean_topic(require_answer(response, "Topic generation"))
+            match = index.find_duplicate(topic)
+            if match is None:
+                break
+            report_repeat(topic, match)
+            rejected.append(topic)
+        else:
+            print(f"⚠️  Still a repeat after {max_attempts} tries - exploring it anyway")
+
+        index.add(topic, "topic")
+        return topic
+
+    async def run_cycle(self, cycle_num, topic=None, branches=1, seed=None,
+                        population=None):
+        """
+        One full explorer cycle, written to the same file as run_explorer.
+        population=(N, K, generations) swaps the serial gauntlet for
+        population_gauntlet.
+        """
+
+        rng = random.Random(seed) if seed is not None else _child_rng()
+        # Loaded before the first await, so every cycle of a batch starts
+        # from the same stats whatever order their calls finish in
+        scheduler = noise_scheduler()
+        label = f"[cycle {cycle_num}]"
+        start_time = datetime.now()
+        # Set inside this task, so only this cycle's calls are attributed to it
+        run = start_run("gauntlet", cycle_num, topic=topic, model=GAUNTLET_MODEL)
+
+        try:
+            if topic is None:
+                topic = await self.random_topic(label)
+            print(f"{label} Topic: {topic}")
+
+            with phase("phase_1_2"):
+                phase_1_2 = await self.call_deepseek(
+                    build_phase_1_2_messages(topic), max_tokens=4000, label=label
+                )
+            require_answer(phase_1_2, "Phase 1-2")
+
+            noise_ops, perturbations = pick_perturbations(rng.randint(1, 2), rng, scheduler)
+            with phase("phase_3"):
+                initial_idea = await self.call_deepseek(
+                    build_phase_3_messages(topic, phase_1_2, perturbations),
+                    max_tokens=1500,
+                    label=label
+                )
+            require_answer(initial_idea, "Phase 3")
+            phase_3 = {
+                "initial_idea": initial_idea,
+                "initial_perturbations": perturbations
+            }
+
+            if population:
+                size, branching, generations = population
+                gauntlet_result = await self.population_gauntlet(
+                    initial_idea,
+                    population=size,
+                    branching=branching,
+                    generations=generations,
+                    rng=rng,
+                    label=label,
+                    scheduler=scheduler
+                )
+            else:
+                gauntlet_result = await self.gauntlet(
+                    initial_idea,
+                    num_iterations=rng.randint(8, 20),
+                    branches=branches,
+                    rng=rng,
+                    label=label,
+                    scheduler=scheduler
+                )
+
+            with phase("translation"):
+                translation = await self.call_deepseek(
+                    build_translation_messages(gauntlet_result["final_idea"]),
+                    max_tokens=400,
+                    label=label
+                )
+            translation = require_answer(translation, "Translation").strip()
+
+            elapsed = (datetime.now() - start_time).total_seconds()
+
+            # Cycles share the event loop, so the report is written in one go
+            # at the end, in a worker thread (still via a temp file renamed
+            # into place)
+            output_file = f"explorer_cycle_{cycle_num}_gauntlet.txt"
+
+            def write_report():
+                write_gauntlet_report(
+                    GauntletReportWriter(output_file, cycle_num, start_time, topic=topic,
+                                         sidecar=GAUNTLET_SIDECAR),
+                    elapsed, phase_1_2, phase_3, gauntlet_result, translation
+                )
+                with open(output_file, encoding="utf-8") as f:
+                    return f.read()
+
+            full_output = await asyncio.to_thread(write_report)
+
+            run.record_iterations(gauntlet_result["reflection_chain"])
+            run.finish(file=output_file, output=full_output, elapsed=elapsed, topic=topic)
+        except BaseException:
+            run.finish(status="error")
+            raise
+        if not is_error_response(gauntlet_result["final_idea"]):
+            default_topic_index().add(gauntlet_result["final_idea"], "final_idea", run.id)
+
+        print(f"{label} ✅ complete in {elapsed:.1f}s → {output_file}")
+        totals = run.call_totals()
+        if totals:
+            print(f"{label} {prompt_cache_summary(totals)}")
+
+        return output_file
+
+    async def run_batch(self, cycle_nums, topics=None, branches=1, population=None):
+        """Run every cycle concurrently; failures don't stop the batch"""
+
+        topics = topics or {}
+        results = await asyncio.gather(
+            *[
+                self.run_cycle(
+                    n,
+                    topic=topics.get(n),
+                    branches=branches,
+                    population=population
+                )
+                for n in cycle_nums
+            ],
+            return_exceptions=True
+        )
+        return dict(zip(cycle_nums, results))
+
+def run_gauntlets(cycle_nums, topics=None, max_concurrency=DEFAULT_CONCURRENCY,
+                  branches=1, population=None):
+    """
+    Synchronous entry point: run a batch of gauntlet cycles concurrently.
+    Returns {cycle_num: output_file or exception}.
+    """
+
+    async def _main():
+        engine = AsyncGauntletEngine(max_concurrency=max_concurrency)
+        return await engine.run_batch(
+            cycle_nums,
+            topics=topics,
+            branches=branches,
+            population=population
+        )
+
+    return asyncio.run(_main())
+
+def population_gauntlet(initial_idea, population=4, branching=3, generations=5,
+                        max_concurrency=DEFAULT_CONCURRENCY):
+    """
+    Synchronous entry point for the evolutionary gauntlet.
+    Returns an idea_gauntlet-compatible dict plus the surviving population.
+    """
+
+    async def _main():
+        engine = AsyncGauntletEngine(max_concurrency=max_concurrency)
+        return await engine.population_gauntlet(
+            initial_idea,
+            population=population,
+            branching=branching,
+            generations=generations
+        )
+
+    return asyncio.run(_main())
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run gauntlet cycles concurrently")
+    parser.add_argument("--from", dest="first", type=int, required=True)
+    parser.add_argument("--to", dest="last", type=int, required=True)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="global cap on in-flight API calls")
+    parser.add_argument("--branches", type=int, default=1,
+                        help="speculative branches per gauntlet iteration")
+    parser.add_argument("--population", type=int, nargs=3,
+                        metavar=("N", "K", "GENERATIONS"),
+                        help="use population_gauntlet instead of the serial chain")
+    args = parser.parse_args()
+
+    cycle_nums = list(range(args.first, args.last + 1))
+
+    print(f"\n{'='*70}")
+    print(f"ASYNC GAUNTLET - {len(cycle_nums)} cycles, "
+          f"concurrency {args.concurrency}, branches {args.branches}")
+    print(f"{'='*70}\n")
+
+    start = datetime.now()
+    results = run_gauntlets(
+        cycle_nums,
+        max_concurrency=args.concurrency,
+        branches=args.branches,
+        population=args.population
+    )
+    elapsed = (datetime.now() - start).total_seconds()
+
+    failed = {n: r for n, r in results.items() if isinstance(r, BaseException)}
+
+    print(f"\n{'='*70}")
+    print(f"✅ {len(results) - len(failed)}/{len(results)} cycles complete in {elapsed:.1f}s")
+    for n, error in failed.items():
+        print(f"❌ Cycle {n}: {error}")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+BATCH CYCLE RUNNER
+Runs many cycles in one process as a three-stage pipeline:
+    explorer (N workers) → synthesis → commit
+Bounded queues sit between the stages, so synthesis of cycle N overlaps
+exploration of cycle N+1 and a slow stage applies back-pressure upstream.
+No per-cycle interpreter start, no re-globbing for the explorer's output.
+Commits go through one CommitQueue: cycles that synthesize close together
+share a push.
+"""
+
+import sys
+import time
+import queue
+import argparse
+import threading
+from pathlib import Path
+
+STOP = object()
+
+class StageStats:
+    """Counters for one pipeline stage"""
+
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.errors = 0
+        self.busy = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds, ok):
+        with self._lock:
+            self.busy += seconds
+            if ok:
+                self.items += 1
+            else:
+                self.errors += 1
+
+    def report(self, wall):
+        per_minute = self.items / wall * 60 if wall else 0.0
+        utilization = self.busy / (wall * self.workers) if wall else 0.0
+        return (f"{self.name:<10} {self.items:>5} ok {self.errors:>4} failed   "
+                f"{per_minute:7.2f}/min   busy {self.busy:8.1f}s   "
+                f"utilization {utilization:5.0%}")
+
+# ============================================================================
+# STAGES
+# ============================================================================
+
+def explore_loop(cycle_num, stream=False):
+    """run_explorer.py explorer → (cycle_num, output file)"""
+    from run_explorer import run_explorer
+    filepath, _ = run_explorer(cycle_num, stream=stream)
+    return cycle_num, Path(filepath)
+
+def explore_gauntlet(cycle_num, stream=False):
+    """explorer_gauntlet.py explorer on a fresh random topic → (cycle_num, output file)"""
+    if stream:
+        raise ValueError("the gauntlet explorer can't stream; its report is "
+                         "already written section by section")
+    from explorer_gauntlet import generate_random_topic, run_explorer
+    return cycle_num, Path(run_explorer(generate_random_topic(), cycle_num))
+
+EXPLORERS = {
+    "loop": explore_loop,
+    "gauntlet": explore_gauntlet,
+}
+
+# Explorers that can stream their transcript to disk (stream=True)
+STREAMING_EXPLORERS = ("loop",)
+
+def synthesize_stage(item):
+    from synthesize_and_commit import synthesize
+    cycle_num, filepath = item
+    title, body = synthesize(filepath, cycle_num)
+    return cycle_num, title, body
+
+def commit_stage(item, commit_queue):
+    from synthesize_and_commit import commit_to_github
+    cycle_num, title, body = item
+    if not commit_to_github(title, body, queue=commit_queue):
+        raise RuntimeError("git commit/push failed")
+    return cycle_num
+
+def _worker(func, inbox, outbox, stats, results, field):
+    """Pull items until STOP; record timing, result and any error per cycle"""
+    while True:
+        item = inbox.get()
+        if item is STOP:
+            return
+        cycle_num = item if isinstance(item, int) else item[0]
+        start = time.monotonic()
+        try:
+            output = func(item)
+        except Exception as e:
+            stats.record(time.monotonic() - start, ok=False)
+            results[cycle_num]["error"] = f"{stats.name}: {e}"
+            print(f"❌ Cycle {cycle_num} failed in {stats.name}: {e}")
+            continue
+        stats.record(time.monotonic() - start, ok=True)
+        results[cycle_num][field] = output
+        if outbox is not None:
+            outbox.put(output)
+
+def _run_stage(func, inbox, outbox, stats, results, field):
+    threads = [
+        threading.Thread(
+            target=_worker,
+            args=(func, inbox, outbox, stats, results, field),
+            name=f"{stats.name}-{i}",
+            daemon=True
+        )
+        for i in range(stats.workers)
+    ]
+    for thread in threads:
+        thread.start()
+    return threads
+
+def _finish_stage(threads, inbox, on_idle=None):
+    for _ in threads:
+        inbox.put(STOP)
+    for thread in threads:
+        while thread.is_alive():
+            thread.join(timeout=0.5)
+            if on_idle is not None and inbox.empty():
+                on_idle()
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+def run_cycles(cycle_nums, parallel=4, explorer="loop", commit=True, stream=False,
+               queue_size=None):
+    """
+    Run cycles through explorer → synthesis → commit.
+    Returns ({cycle_num: {"explorer", "synthesis", "commit", "error"}}, [StageStats]).
+    stream=True is only for STREAMING_EXPLORERS (ValueError otherwise).
+    """
+    if stream and explorer not in STREAMING_EXPLORERS:
+        raise ValueError(f"the {explorer} explorer can't stream its transcript")
+    Path("local_outputs").mkdir(exist_ok=True)
+    explore = EXPLORERS[explorer]
+    queue_size = queue_size or parallel
+
+    results = {n: {"explorer": None, "synthesis": None, "commit": None, "error": None}
+               for n in cycle_nums}
+
+    cycles_q = queue.Queue()
+    for n in cycle_nums:
+        cycles_q.put(n)
+    synth_q = queue.Queue(maxsize=queue_size)
+    commit_q = queue.Queue(maxsize=queue_size) if commit else None
+
+    explore_stats = StageStats("explorer", parallel)
+    synth_stats = StageStats("synthesis", 1)
+    commit_queue = None
+    if commit:
+        from commit_queue import CommitQueue
+        from synthesize_and_commit import FEED_REPO, FEED_BRANCH
+        commit_queue = CommitQueue(repo_dir=FEED_REPO, branch=FEED_BRANCH)
+    # Workers only wait on the queue, so one per batch slot lets a batch fill up
+    commit_stats = StageStats("commit", commit_queue.batch_size if commit else 1)
+
+    start = time.monotonic()
+
+    explorers = _run_stage(lambda n: explore(n, stream=stream), cycles_q, synth_q,
+                           explore_stats, results, "explorer")
+    synthesizers = _run_stage(synthesize_stage, synth_q, commit_q,
+                              synth_stats, results, "synthesis")
+    committers = _run_stage(lambda item: commit_stage(item, commit_queue), commit_q, None,
+                            commit_stats, results, "commit") if commit else []
+
+    _finish_stage(explorers, cycles_q)
+    _finish_stage(synthesizers, synth_q)
+    if commit:
+        # Nothing more is coming: push the last partial batch without waiting it out
+        _finish_stage(committers, commit_q, on_idle=commit_queue.flush)
+        commit_queue.close()
+
+    wall = time.monotonic() - start
+    stats = [explore_stats, synth_stats] + ([commit_stats] if commit else [])
+
+    print(f"\n{'='*70}")
+    print(f"BATCH COMPLETE - {len(cycle_nums)} cycles in {wall:.1f}s")
+    print(f"{'='*70}")
+    for stage in stats:
+        print(stage.report(wall))
+    if commit:
+        git = commit_queue.stats()
+        print(f"git        {git['commits']:>5} commits in {git['pushes']} pushes "
+              f"({git['push_rejections']} rejected pushes rebased)")
+    print(f"{'='*70}\n")
+
+    return results, stats
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run explorer → synthesis → commit for many cycles")
+    parser.add_argument("--from", dest="first", type=int, required=True)
+    parser.add_argument("--to", dest="last", type=int, required=True)
+    parser.add_argument("--parallel", type=int, default=4, help="explorer workers")
+    parser.add_argument("--explorer", choices=sorted(EXPLORERS), default="loop")
+    parser.add_argument("--no-commit", dest="commit", action="store_false")
+    parser.add_argument("--stream", action="store_true", help="stream explorer transcripts to disk")
+    args = parser.parse_args()
+    if args.stream and args.explorer not in STREAMING_EXPLORERS:
+        parser.error(f"--stream only works with --explorer {'/'.join(STREAMING_EXPLORERS)}")
+
+    results, _ = run_cycles(
+        list(range(args.first, args.last + 1)),
+        parallel=args.parallel,
+        explorer=args.explorer,
+        commit=args.commit,
+        stream=args.stream
+    )
+
+    sys.exit(1 if any(r["error"] for r in results.values()) else 0)
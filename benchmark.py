@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+ORCHESTRATION BENCHMARK
+Full explorer cycles against mock_llm_server.py - no key, no network
+- Each concurrency level (default 1, 8, 64 cycles in flight) runs in its
+  own subprocess, in a scratch directory with its own run store, so peak
+  RSS and outputs don't bleed between levels
+- Reports cycles/hour, p50/p99 cycle latency (run store elapsed), API
+  calls and retries per cycle, and peak RSS
+- --out saves the results; --baseline compares against saved results and
+  exits 1 on a regression beyond --tolerance (for CI)
+Modes: async (AsyncGauntletEngine) or threads (batch_runner pipeline,
+without commits).
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import random
+import asyncio
+import argparse
+import tempfile
+import resource
+import subprocess
+from pathlib import Path
+
+from mock_llm_server import MockLLMServer, add_config_arguments, config_from_args
+
+LEVELS = (1, 8, 64)
+
+# Client-side rate limits for benchmark runs: high enough that the mock's
+# latency, not the 120 RPM production budget, sets the pace
+BENCH_RPM = 1e6
+BENCH_TPM = 1e9
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))]
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+# ============================================================================
+# WORKER (one level, in a subprocess)
+# ============================================================================
+
+def run_async_level(level, cycle_nums):
+    from async_gauntlet import AsyncGauntletEngine
+
+    async def main():
+        engine = AsyncGauntletEngine(max_concurrency=level)
+        slots = asyncio.Semaphore(level)
+
+        async def one(n):
+            async with slots:
+                return await engine.run_cycle(n, seed=n)
+
+        return await asyncio.gather(*[one(n) for n in cycle_nums], return_exceptions=True)
+
+    results = asyncio.run(main())
+    return sum(isinstance(r, BaseException) for r in results)
+
+def run_threads_level(level, cycle_nums, explorer):
+    from batch_runner import run_cycles
+    results, _ = run_cycles(cycle_nums, parallel=level, explorer=explorer, commit=False)
+    return sum(bool(r["error"]) for r in results.values())
+
+def run_level(level, cycles, mode, explorer, seed):
+    """Run one level in the current directory; returns its results dict"""
+    from run_store import default_store
+    from telemetry import read_rows
+    from config.api_config import TELEMETRY_PATH
+
+    random.seed(seed)
+    cycle_nums = list(range(1, cycles + 1))
+    start = time.monotonic()
+    if mode == "async":
+        failed = run_async_level(level, cycle_nums)
+    else:
+        failed = run_threads_level(level, cycle_nums, explorer)
+    wall = time.monotonic() - start
+
+    runs = [r for r in default_store().recent_runs(limit=cycles * 2)
+            if r["status"] == "ok" and r["elapsed"] is not None]
+    latencies = [r["elapsed"] for r in runs]
+    calls = list(read_rows(TELEMETRY_PATH)) if os.path.exists(TELEMETRY_PATH) else []
+    completed = cycles - failed
+
+    return {
+        "level": level,
+        "mode": mode,
+        "cycles": cycles,
+        "failed": failed,
+        "wall": wall,
+        "cycles_per_hour": completed / wall * 3600 if wall else 0.0,
+        "p50": _percentile(latencies, 50),
+        "p99": _percentile(latencies, 99),
+        "calls_per_cycle": len(calls) / cycles if cycles else 0.0,
+        "retries": sum(c["retries"] for c in calls),
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+# ============================================================================
+# DRIVER
+# ============================================================================
+
+def level_env(url, workdir, args):
+    env = dict(os.environ)
+    env.update({
+        "DEEPSEEK_BASE_URL": url,
+        "OPENROUTER_BASE_URL": url,
+        "DEEPSEEK_API_KEY": "mock",
+        "OPENROUTER_API_KEY": "mock",
+        "LLM_CACHE": "off",
+        "LLM_CACHE_DIR": str(workdir / "llm_cache"),
+        "RUN_STORE_PATH": str(workdir / "runs.db"),
+        "TELEMETRY_PATH": str(workdir / "metrics.jsonl"),
+        "LLM_RPM": str(args.rpm),
+        "LLM_TPM": str(args.tpm),
+    })
+    return env
+
+def run_levels(args):
+    """Start the mock, run every level in a subprocess, return their results"""
+    results = []
+    with MockLLMServer(config_from_args(args)) as server:
+        for level in args.levels:
+            workdir = Path(tempfile.mkdtemp(prefix=f"bench_{level}_"))
+            result_file = workdir / "result.json"
+            cycles = args.cycles or max(2 * level, 4)
+            command = [sys.executable, os.path.abspath(__file__), "--worker",
+                       "--level", str(level), "--cycles", str(cycles),
+                       "--mode", args.mode, "--explorer", args.explorer,
+                       "--seed", str(args.seed), "--result", str(result_file)]
+            log = open(workdir / "worker.log", "w")
+            try:
+                print(f"level {level:>3}: {cycles} cycles ({args.mode}) ...", flush=True)
+                status = subprocess.run(command, cwd=workdir, env=level_env(server.url, workdir, args),
+                                        stdout=log, stderr=subprocess.STDOUT).returncode
+            finally:
+                log.close()
+            if status != 0 or not result_file.exists():
+                print(f"❌ level {level} worker failed (exit {status}), log: {workdir / 'worker.log'}")
+                sys.exit(1)
+            results.append(json.loads(result_file.read_text()))
+            if args.keep:
+                print(f"   kept {workdir}")
+            else:
+                shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+def format_results(results):
+    def seconds(value):
+        return "-" if value is None else f"{value:.2f}"
+
+    lines = [f"{'level':>5} {'cycles':>6} {'failed':>6} {'wall_s':>8} {'cycles/h':>10} "
+             f"{'p50_s':>7} {'p99_s':>7} {'calls/cy':>8} {'retries':>7} {'rss_mb':>7}"]
+    for r in results:
+        lines.append(
+            f"{r['level']:>5} {r['cycles']:>6} {r['failed']:>6} {r['wall']:>8.1f} "
+            f"{r['cycles_per_hour']:>10.0f} {seconds(r['p50']):>7} {seconds(r['p99']):>7} "
+            f"{r['calls_per_cycle']:>8.1f} {r['retries']:>7} {r['peak_rss_mb']:>7.1f}"
+        )
+    return "\n".join(lines)
+
+def regressions(results, baseline, tolerance):
+    """Human-readable list of metrics worse than baseline by more than tolerance"""
+    previous = {(r["level"], r["mode"]): r for r in baseline}
+    problems = []
+    for r in results:
+        base = previous.get((r["level"], r["mode"]))
+        if base is None:
+            continue
+        if r["failed"] > base["failed"]:
+            problems.append(f"level {r['level']}: {r['failed']} failed cycles (was {base['failed']})")
+        if r["cycles_per_hour"] < base["cycles_per_hour"] * (1 - tolerance):
+            problems.append(f"level {r['level']}: {r['cycles_per_hour']:.0f} cycles/h "
+                            f"(was {base['cycles_per_hour']:.0f})")
+        for metric in ("p99", "peak_rss_mb"):
+            if r[metric] is not None and base[metric] and r[metric] > base[metric] * (1 + tolerance):
+                problems.append(f"level {r['level']}: {metric} {r[metric]:.2f} (was {base[metric]:.2f})")
+    return problems
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark explorer cycles against the mock LLM server")
+    parser.add_argument("--levels", default=",".join(map(str, LEVELS)),
+                        help="comma-separated concurrent-cycle counts")
+    parser.add_argument("--cycles", type=int, default=None,
+                        help="cycles per level (default: 2 x level, at least 4)")
+    parser.add_argument("--mode", choices=("async", "threads"), default="async")
+    parser.add_argument("--explorer", choices=("gauntlet", "loop"), default="gauntlet",
+                        help="explorer for --mode threads")
+    parser.add_argument("--rpm", type=float, default=BENCH_RPM)
+    parser.add_argument("--tpm", type=float, default=BENCH_TPM)
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative regression vs --baseline")
+    parser.add_argument("--keep", action="store_true", help="keep each level's scratch directory")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--level", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    add_config_arguments(parser)
+    parser.set_defaults(latency=0.05, reasoning_words=60)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_level(args.level, args.cycles, args.mode, args.explorer, args.seed)
+        Path(args.result).write_text(json.dumps(result))
+        sys.exit(0)
+
+    args.levels = [int(level) for level in args.levels.split(",") if level.strip()]
+    results = run_levels(args)
+    print()
+    print(format_results(results))
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2))
+        print(f"\nResults → {args.out}")
+
+    if args.baseline:
+        problems = regressions(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        if problems:
+            print("\n❌ Regressions vs baseline:")
+            for problem in problems:
+                print(f"   {problem}")
+            sys.exit(1)
+        print("\n✅ Within tolerance of baseline")
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+RECORD / REPLAY CASSETTES
+Tape every completion of a run, then replay the run offline at CPU speed
+- record: each llm_client completion (plain, async or streamed, errors
+  included) is appended to a JSONL cassette as it returns; the header
+  holds the seed `random` was seeded with, so NOISE_OPERATIONS picks and
+  iteration counts repeat on replay
+- replay: completions come straight from the cassette - no network, no
+  rate limiter, no retries - matched by request hash (the Nth identical
+  request sent gets the Nth recorded answer); an unknown request raises
+  CassetteMiss, so a prompt change can't silently fall back to live calls
+Recording also snapshots the run store (<cassette>.runs.db), since topic
+dedup reads past runs; replay runs against a scratch copy of it. Timestamps
+still come from the clock, and replaying a script replays all of it,
+including git commits it makes.
+
+    python3 cassette.py record c7.jsonl explorer_gauntlet.py 7
+    python3 cassette.py replay --profile c7.jsonl explorer_gauntlet.py 7
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+CASSETTE_VERSION = 1
+
+# Request fields that don't change what the model returns (as in llm_cache)
+UNKEYED_FIELDS = ("timeout", "extra_headers")
+
+class CassetteMiss(Exception):
+    """Replay hit a request the cassette never recorded"""
+
+def request_key(provider, request, stream=False, cache_salt=None):
+    keyed = {k: v for k, v in request.items() if k not in UNKEYED_FIELDS}
+    keyed.update(provider=provider, stream=stream, cache_salt=cache_salt)
+    blob = json.dumps(keyed, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+def _describe(request):
+    messages = request.get("messages") or [{}]
+    text = " ".join((messages[-1].get("content") or "").split())
+    return f"{request.get('model')}: {text[:80]}"
+
+class Cassette:
+    """One cassette file, opened for recording or replay"""
+
+    def __init__(self, path, mode, seed=None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"mode must be 'record' or 'replay', not {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._tape = defaultdict(deque)
+
+        if mode == "record":
+            self.seed = seed if seed is not None else random.SystemRandom().getrandbits(32)
+            self._file = open(path, "w", encoding="utf-8")
+            self._write({"cassette": CASSETTE_VERSION, "seed": self.seed,
+                         "created": time.time(), "argv": sys.argv})
+        else:
+            with open(path, encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                if header.get("cassette") != CASSETTE_VERSION:
+                    raise ValueError(f"{path} is not a version {CASSETTE_VERSION} cassette")
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._tape[entry["key"]].append(entry)
+            for key, entries in self._tape.items():
+                self._tape[key] = deque(sorted(entries, key=lambda e: e["seq"]))
+            self.seed = header["seed"] if seed is None else seed
+
+    @property
+    def replaying(self):
+        return self.mode == "replay"
+
+    def _write(self, row):
+        self._file.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+
+    def begin(self):
+        """Sequence number for a call about to be sent. Entries are written as
+        calls finish, but replayed in the order they were sent"""
+        with self._lock:
+            self.calls += 1
+            return self.calls
+
+    def record(self, seq, key, provider, request, response=None, error=None):
+        """Append one finished call (response is a JSON-able dict)"""
+        with self._lock:
+            self._write({"seq": seq, "key": key, "provider": provider,
+                         "request": request, "response": response, "error": error})
+
+    def replay(self, key, request):
+        """The next recorded entry for this request"""
+        with self._lock:
+            entries = self._tape.get(key)
+            if not entries:
+                raise CassetteMiss(f"No recorded response for {_describe(request)}")
+            self.calls += 1
+            return entries.popleft()
+
+    def remaining(self):
+        return sum(len(entries) for entries in self._tape.values())
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+_active = None
+
+def active_cassette():
+    """The cassette llm_client should tape to / replay from, or None"""
+    return _active
+
+@contextmanager
+def use_cassette(path, mode, seed=None):
+    """Record or replay every completion inside the block; seeds `random` first"""
+    global _active
+    cassette = Cassette(path, mode, seed)
+    random.seed(cassette.seed)
+    previous, _active = _active, cassette
+    try:
+        yield cassette
+    finally:
+        _active = previous
+        cassette.close()
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+def store_snapshot_path(path):
+    return path + ".runs.db"
+
+def snapshot_store(path):
+    """Copy the run store next to the cassette: topic dedup reads it, so a
+    replay has to start from the same history the recording saw"""
+    import sqlite3
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from config.api_config import RUN_STORE_PATH, RUN_STORE_ENABLED
+    snapshot = store_snapshot_path(path)
+    if os.path.exists(snapshot):
+        os.remove(snapshot)
+    if not RUN_STORE_ENABLED or not os.path.exists(RUN_STORE_PATH):
+        return
+    source = sqlite3.connect(RUN_STORE_PATH)
+    target = sqlite3.connect(snapshot)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+
+def replay_store(path):
+    """Point the run store (before anything imports its config) at a scratch
+    copy of the recording's snapshot; the real store is left alone"""
+    import shutil
+    import tempfile
+    scratch = os.path.join(tempfile.mkdtemp(prefix="cassette_"), "runs.db")
+    snapshot = store_snapshot_path(path)
+    if os.path.exists(snapshot):
+        shutil.copyfile(snapshot, scratch)
+    os.environ["RUN_STORE_PATH"] = scratch
+    os.environ["RUN_STORE"] = "on"
+    return scratch
+
+def _run_script(script, script_args, profile):
+    import runpy
+    sys.argv = [script] + script_args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    if not profile:
+        runpy.run_path(script, run_name="__main__")
+        return
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(runpy.run_path, script, run_name="__main__")
+    finally:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(30)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record or replay a script's LLM completions")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for command in ("record", "replay"):
+        run = sub.add_parser(command, help=f"{command} a script's completions")
+        run.add_argument("cassette")
+        run.add_argument("script", help="e.g. explorer_gauntlet.py, run_explorer.py")
+        run.add_argument("args", nargs=argparse.REMAINDER, help="arguments for the script")
+        run.add_argument("--seed", type=int, help="seed for random (default: fresh / from cassette)")
+        run.add_argument("--profile", action="store_true", help="cProfile the run")
+    info = sub.add_parser("info", help="summarize a cassette")
+    info.add_argument("cassette")
+    args = parser.parse_args()
+
+    # The script's `from cassette import ...` must see this module's _active,
+    # not a fresh copy imported under the name "cassette"
+    sys.modules.setdefault("cassette", sys.modules[__name__])
+
+    if args.command == "info":
+        cassette = Cassette(args.cassette, "replay")
+        print(f"Seed: {cassette.seed}")
+        print(f"Calls: {cassette.remaining()}")
+        sys.exit(0)
+
+    if args.command == "record":
+        snapshot_store(args.cassette)
+    else:
+        replay_store(args.cassette)
+
+    start = time.monotonic()
+    with use_cassette(args.cassette, args.command, args.seed) as cassette:
+        code = 0
+        try:
+            _run_script(args.script, args.args, args.profile)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        elapsed = time.monotonic() - start
+        left = f", {cassette.remaining()} unused" if cassette.replaying else ""
+        print(f"\n📼 {args.command}: {cassette.calls} calls in {elapsed:.2f}s "
+              f"(seed {cassette.seed}{left}) - {args.cassette}")
+    sys.exit(code)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+COMMIT QUEUE
+Coalesces per-cycle git commits into batches with a single push
+- Flushes every `batch_size` entries or `max_wait` seconds, whichever first
+- Each entry stays its own commit (the Atom feed needs one title per cycle),
+  or squash=True folds a batch into one commit
+- One writer per repo: a thread lock in-process, flock across processes
+- Non-fast-forward pushes are rebased onto the remote and retried
+- Plumbing mode (message-only commits): commit-tree + update-ref against the
+  branch tip, so no checkout or index scan - cost stays flat as the repo grows
+"""
+
+import os
+import sys
+import time
+import fcntl
+import threading
+import subprocess
+from pathlib import Path
+from concurrent.futures import Future
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from config.api_config import (
+    GIT_COMMIT_BATCH,
+    GIT_COMMIT_MAX_WAIT,
+    GIT_PUSH_RETRIES,
+    GIT_COMMIT_PLUMBING
+)
+
+# git's well-known empty tree, the parent tree of a repo's first commit
+EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+class GitError(Exception):
+    """A git command failed"""
+
+class CommitQueue:
+    """Background committer: submit() returns a Future resolved with the commit sha"""
+
+    def __init__(self, repo_dir=".", batch_size=GIT_COMMIT_BATCH, max_wait=GIT_COMMIT_MAX_WAIT,
+                 push=True, remote="origin", branch=None, squash=False,
+                 push_retries=GIT_PUSH_RETRIES, plumbing=GIT_COMMIT_PLUMBING):
+        self.repo_dir = Path(repo_dir)
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.push = push
+        self.remote = remote
+        self.branch = branch
+        self.squash = squash
+        self.push_retries = push_retries
+        self.plumbing = plumbing
+
+        self.pending = []
+        self.first_at = None
+        self.closing = False
+        self.commits = 0
+        self.pushes = 0
+        self.push_rejections = 0
+        self.flushes = 0
+
+        self._cond = threading.Condition()
+        self._repo_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="commit-queue", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, title, body="", paths=()):
+        """Queue a commit of `paths` (may be empty) with title/body"""
+        future = Future()
+        with self._cond:
+            if self.closing:
+                raise RuntimeError("CommitQueue is closed")
+            if not self.pending:
+                self.first_at = time.monotonic()
+            self.pending.append({
+                "title": title,
+                "body": body,
+                "paths": [str(p) for p in paths],
+                "future": future
+            })
+            self._cond.notify()
+        return future
+
+    def flush(self):
+        """Commit and push everything queued so far, now"""
+        with self._cond:
+            batch = self._take()
+        self._commit_batch(batch)
+
+    def close(self):
+        """Flush what's left and stop the background thread"""
+        with self._cond:
+            self.closing = True
+            self._cond.notify()
+        self._thread.join()
+
+    def stats(self):
+        return {
+            "flushes": self.flushes,
+            "commits": self.commits,
+            "pushes": self.pushes,
+            "push_rejections": self.push_rejections
+        }
+
+    # ------------------------------------------------------------------
+    # Background loop
+    # ------------------------------------------------------------------
+
+    def _take(self):
+        batch, self.pending, self.first_at = self.pending, [], None
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self.closing or len(self.pending) >= self.batch_size:
+                        break
+                    if self.pending:
+                        remaining = self.max_wait - (time.monotonic() - self.first_at)
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    else:
+                        self._cond.wait()
+                batch = self._take()
+                done = self.closing
+            self._commit_batch(batch)
+            if done:
+                return
+
+    # ------------------------------------------------------------------
+    # Git
+    # ------------------------------------------------------------------
+
+    def _git(self, *args, check=True):
+        result = subprocess.run(
+            ["git", *args], cwd=self.repo_dir, capture_output=True, text=True
+        )
+        if check and result.returncode != 0:
+            raise GitError(f"git {' '.join(args)}: {result.stderr.strip()}")
+        return result
+
+    def _locked(self):
+        """Cross-process lock file inside .git"""
+        git_dir = self._git("rev-parse", "--git-dir").stdout.strip()
+        lock_path = self.repo_dir / git_dir / "commit_queue.lock"
+        handle = open(lock_path, "w")
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def _commit(self, title, body, paths):
+        if paths:
+            self._git("add", "--", *paths)
+        args = ["commit", "--allow-empty", "-m", title]
+        if body:
+            args += ["-m", body]
+        self._git(*args)
+        self.commits += 1
+
+    # ------------------------------------------------------------------
+    # Plumbing: message-only commits written straight to the ref
+    # ------------------------------------------------------------------
+
+    def _rev(self, rev):
+        """sha of rev, or "" if it doesn't exist (unborn branch)"""
+        return self._git("rev-parse", "-q", "--verify", rev, check=False).stdout.strip()
+
+    def _chain(self, parent, commits):
+        """commit-tree each (title, body) on top of parent, reusing its tree"""
+        tree = f"{parent}^{{tree}}" if parent else EMPTY_TREE
+        for title, body, _ in commits:
+            args = ["commit-tree", tree]
+            if parent:
+                args += ["-p", parent]
+            args += ["-m", title]
+            if body:
+                args += ["-m", body]
+            parent = self._git(*args).stdout.strip()
+        return parent
+
+    def _write_chain(self, ref, commits):
+        """Append commits to ref; no checkout, no index, no working-tree scan.
+        Returns [base, tip]: the ref before and after"""
+        base = self._rev(ref)
+        tip = self._chain(base, commits)
+        self._git("update-ref", ref, tip, base)
+        self.commits += len(commits)
+        return [base, tip]
+
+    def _rechain(self, ref, branch, commits, written):
+        """
+        Non-fast-forward: rebuild only the commits this batch wrote (written =
+        [base, tip], updated in place) on the remote tip. Local commits under
+        them that the remote lacks aren't ours to move - that raises, and the
+        ref is left as it is.
+        """
+        base, ours = written
+        if self._rev(ref) != ours:
+            raise GitError(f"{ref} moved while its push was pending - not rewriting it")
+        self._git("fetch", self.remote, branch)
+        remote = self._rev("FETCH_HEAD")
+        if base and self._git("merge-base", "--is-ancestor", base, remote,
+                              check=False).returncode != 0:
+            raise GitError(f"{ref} has local commits that aren't on {self.remote}/{branch}; "
+                           f"rebase them and push before the queued commits")
+        tip = self._chain(remote, commits)
+        # Only a checked-out branch has a working tree to bring along, and only
+        # the paths the remote changed are touched
+        if self._git("symbolic-ref", "-q", "HEAD", check=False).stdout.strip() == ref:
+            self._git("read-tree", "-m", "-u", f"{ours}^{{tree}}", f"{tip}^{{tree}}")
+        self._git("update-ref", ref, tip, ours)
+        written[:] = [remote, tip]
+
+    # ------------------------------------------------------------------
+    # Push
+    # ------------------------------------------------------------------
+
+    def _push(self, source, branch, rebase):
+        """Push once; on a non-fast-forward, rebase() onto the remote and retry"""
+        for attempt in range(self.push_retries + 1):
+            result = self._git("push", self.remote, f"{source}:refs/heads/{branch}", check=False)
+            if result.returncode == 0:
+                self.pushes += 1
+                return
+            # Only a stale branch is worth a rebase; a hook or permission
+            # refusal ("[remote rejected]") would refuse the retry too
+            stale = ("[remote rejected]" not in result.stderr and
+                     any(reason in result.stderr for reason in ("non-fast-forward", "fetch first")))
+            if not stale or attempt == self.push_retries:
+                raise GitError(f"git push: {result.stderr.strip()}")
+            self.push_rejections += 1
+            rebase()
+
+    def _commit_batch(self, batch):
+        if not batch:
+            return
+        self.flushes += 1
+
+        if self.squash and len(batch) > 1:
+            title = f"{len(batch)} cycles: " + "; ".join(e["title"] for e in batch)
+            body = "\n\n".join(
+                "\n".join(filter(None, [e["title"], e["body"]])) for e in batch
+            )
+            commits = [(title[:200], body, [p for e in batch for p in e["paths"]])]
+        else:
+            commits = [(e["title"], e["body"], e["paths"]) for e in batch]
+        # Commits that add files need the index; message-only ones don't
+        plumbing = self.plumbing and not any(paths for _, _, paths in commits)
+
+        with self._repo_lock:
+            handle = None
+            try:
+                handle = self._locked()
+                branch = self.branch or self._git("symbolic-ref", "--short", "HEAD").stdout.strip()
+                ref = f"refs/heads/{branch}"
+
+                if plumbing:
+                    written = self._write_chain(ref, commits)
+                    source = ref
+                    rebase = lambda: self._rechain(ref, branch, commits, written)
+                else:
+                    if self._git("symbolic-ref", "-q", "HEAD", check=False).stdout.strip() != ref:
+                        self._git("checkout", branch)
+                    for commit in commits:
+                        self._commit(*commit)
+                    source = "HEAD"
+                    rebase = lambda: self._git("pull", "--rebase", self.remote, branch)
+
+                if self.push:
+                    self._push(source, branch, rebase)
+
+                # Read shas back after the push: a rebase rewrites them
+                shas = self._git("rev-list", f"-{len(commits)}", "--reverse", source).stdout.split()
+                if len(commits) == 1:
+                    shas = shas * len(batch)
+            except Exception as e:
+                for entry in batch:
+                    entry["future"].set_exception(e)
+                return
+            finally:
+                if handle is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+                    handle.close()
+
+        for entry, sha in zip(batch, shas):
+            entry["future"].set_result(sha)
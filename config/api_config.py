@@ -4,8 +4,96 @@ import os
 
 # DeepSeek API
 DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY", "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")
-DEEPSEEK_BASE_URL = "https://api.deepseek.com"
+DEEPSEEK_BASE_URL = os.environ.get("DEEPSEEK_BASE_URL", "https://api.deepseek.com")
+
+# OpenRouter (gauntlet explorer)
+OPENROUTER_API_KEY = os.environ.get("OPENROUTER_API_KEY")
+OPENROUTER_BASE_URL = os.environ.get("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
 
 # Model settings
 MODEL = "deepseek-reasoner"
 MAX_TOKENS = 8000
+TEMPERATURE = 0.8
+
+# night_01 experiment outputs
+NIGHT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "night_01")
+
+# HTTP connection pool shared by every client (see llm_client.py)
+LLM_POOL_MAX_CONNECTIONS = int(os.environ.get("LLM_POOL_MAX_CONNECTIONS", 64))
+LLM_POOL_MAX_KEEPALIVE = int(os.environ.get("LLM_POOL_MAX_KEEPALIVE", 32))
+LLM_POOL_KEEPALIVE_EXPIRY = float(os.environ.get("LLM_POOL_KEEPALIVE_EXPIRY", 120))
+LLM_HTTP2 = os.environ.get("LLM_HTTP2", "auto").lower()  # auto | on | off
+LLM_TIMEOUT = float(os.environ.get("LLM_TIMEOUT", 180))
+
+# Client-side rate limits per provider (see rate_limiter.py)
+LLM_RPM = float(os.environ.get("LLM_RPM", 120))
+LLM_TPM = float(os.environ.get("LLM_TPM", 400000))
+LLM_MIN_CONCURRENCY = int(os.environ.get("LLM_MIN_CONCURRENCY", 1))
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", 32))
+LLM_LATENCY_TARGET = float(os.environ.get("LLM_LATENCY_TARGET", 120))
+
+# Retries and hedged requests (see request_policy.py)
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", 4))
+LLM_BACKOFF_BASE = float(os.environ.get("LLM_BACKOFF_BASE", 1.0))
+LLM_BACKOFF_CAP = float(os.environ.get("LLM_BACKOFF_CAP", 60))
+LLM_HEDGE = os.environ.get("LLM_HEDGE", "off").lower() in ("1", "on", "true")
+LLM_HEDGE_PERCENTILE = float(os.environ.get("LLM_HEDGE_PERCENTILE", 95))
+LLM_HEDGE_BUDGET = float(os.environ.get("LLM_HEDGE_BUDGET", 0.1))  # extra calls / primary calls
+LLM_HEDGE_MIN_SAMPLES = int(os.environ.get("LLM_HEDGE_MIN_SAMPLES", 20))
+
+# Response cache (see llm_cache.py)
+LLM_CACHE_DIR = os.environ.get("LLM_CACHE_DIR", "llm_cache")
+LLM_CACHE_MAX_BYTES = int(os.environ.get("LLM_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+LLM_CACHE_MAX_AGE_DAYS = float(os.environ.get("LLM_CACHE_MAX_AGE_DAYS", 30))
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE", "on").lower() not in ("0", "off", "false")
+
+# Coalesced git commits (see commit_queue.py)
+GIT_COMMIT_BATCH = int(os.environ.get("GIT_COMMIT_BATCH", 10))
+GIT_COMMIT_MAX_WAIT = float(os.environ.get("GIT_COMMIT_MAX_WAIT", 30))
+GIT_PUSH_RETRIES = int(os.environ.get("GIT_PUSH_RETRIES", 3))
+GIT_COMMIT_PLUMBING = os.environ.get("GIT_COMMIT_PLUMBING", "on").lower() not in ("0", "off", "false")
+
+# Run store: runs, API calls, gauntlet iterations, syntheses (see run_store.py)
+RUN_STORE_PATH = os.environ.get(
+    "RUN_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "runs.db")
+)
+RUN_STORE_ENABLED = os.environ.get("RUN_STORE", "on").lower() not in ("0", "off", "false")
+
+# Near-duplicate topic check (see topic_index.py)
+TOPIC_DUPLICATE_THRESHOLD = float(os.environ.get("TOPIC_DUPLICATE_THRESHOLD", 0.5))
+TOPIC_MAX_ATTEMPTS = int(os.environ.get("TOPIC_MAX_ATTEMPTS", 3))
+
+# Gauntlet plateau detection (see similarity.ConvergenceMonitor)
+GAUNTLET_CONVERGENCE_THRESHOLD = float(os.environ.get("GAUNTLET_CONVERGENCE_THRESHOLD", 0.6))
+GAUNTLET_PATIENCE = int(os.environ.get("GAUNTLET_PATIENCE", 2))
+GAUNTLET_MIN_ITERATIONS = int(os.environ.get("GAUNTLET_MIN_ITERATIONS", 4))
+GAUNTLET_MAX_RESEEDS = int(os.environ.get("GAUNTLET_MAX_RESEEDS", 1))
+
+# How gauntlets pick NOISE_OPERATIONS: "bandit" (learned, see noise_scheduler.py) or "uniform"
+NOISE_SCHEDULER = os.environ.get("NOISE_SCHEDULER", "bandit").lower()
+
+# Also write each gauntlet report as JSON lines next to it (see transcript_writer.py)
+GAUNTLET_SIDECAR = os.environ.get("GAUNTLET_SIDECAR", "off").lower() in ("1", "on", "true")
+
+# Per-call metrics (see telemetry.py)
+TELEMETRY_PATH = os.environ.get(
+    "TELEMETRY_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "metrics.jsonl")
+)
+TELEMETRY_ENABLED = os.environ.get("TELEMETRY", "on").lower() not in ("0", "off", "false")
+
+# Durable cycle job queue with per-step checkpoints (see job_queue.py)
+JOB_QUEUE_PATH = os.environ.get(
+    "JOB_QUEUE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "jobs.db")
+)
+JOB_LEASE_SECONDS = float(os.environ.get("JOB_LEASE_SECONDS", 900))  # a silent worker's job is reclaimed after this
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", 3))
+
+# Resident explorer daemon (see daemon.py)
+DAEMON_SOCKET = os.environ.get(
+    "DAEMON_SOCKET",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "curious.sock")
+)
+DAEMON_WORKERS = int(os.environ.get("DAEMON_WORKERS", 4))
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+CURIOUS - one entry point for every explorer command
+    curious gauntlet 7              explorer_gauntlet.py (random topic)
+    curious explore 7 [--stream]    run_explorer.py
+    curious loop 7 [--stream]       proof_of_concept_loop.py
+    curious synthesize FILE 7       synthesize_and_commit.py
+    curious cycle 7                 run_cycle.py (explore → synthesize → commit)
+    curious resynthesize | search | runs | jobs | daemon | metrics | ...
+Each subcommand runs its script's own CLI, and this file imports nothing
+up front: a command loads only its own modules, so the quick ones
+(synthesize, resynthesize, search) never pull in openai/httpx.
+test_import_budget.py holds them to that.
+"""
+
+import sys
+
+# subcommand: (module, what it does)
+COMMANDS = {
+    "explore": ("run_explorer", "R1 boundary exploration for a cycle"),
+    "gauntlet": ("explorer_gauntlet", "explorer with the quantum noise gauntlet"),
+    "loop": ("proof_of_concept_loop", "proof-of-concept loop cycle"),
+    "synthesize": ("synthesize_and_commit", "synthesize a transcript (and commit it)"),
+    "cycle": ("run_cycle", "explore → synthesize → commit one cycle"),
+    "batch": ("batch_runner", "many cycles through the pipeline"),
+    "resynthesize": ("resynthesize", "rescore the transcript archive"),
+    "search": ("search_index", "full-text search over transcripts"),
+    "runs": ("run_store", "query the run store"),
+    "jobs": ("job_queue", "durable cycle job queue"),
+    "daemon": ("daemon", "resident explorer daemon and its client"),
+    "metrics": ("telemetry", "per-call metrics report"),
+    "noise": ("noise_scheduler", "learned noise operation stats"),
+    "cassette": ("cassette", "record / replay a script's completions"),
+    "bench": ("benchmark", "orchestration benchmark against the mock server"),
+}
+
+def usage():
+    width = max(len(name) for name in COMMANDS)
+    lines = ["usage: curious <command> [args...]", "", "commands:"]
+    lines += [f"  {name:<{width}}  {about}" for name, (_, about) in COMMANDS.items()]
+    lines += ["", "curious <command> --help shows the command's own options"]
+    return "\n".join(lines)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        print(usage())
+        return 0
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"curious: unknown command {command!r}\n\n{usage()}", file=sys.stderr)
+        return 2
+
+    import os
+    import runpy
+    module = COMMANDS[command][0]
+    here = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, here)
+    # The script sees the argv it would get when run directly
+    sys.argv = [os.path.join(here, f"{module}.py")] + args
+    runpy.run_module(module, run_name="__main__", alter_sys=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
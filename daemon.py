@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+EXPLORER DAEMON
+One resident process that runs cycles, fed over a local Unix socket
+- Imports the explorers once and keeps the pooled LLM clients, run store,
+  topic index and emotional state warm between cycles
+- Submissions go into the durable job queue (job_queue.py) and are picked
+  up by the daemon's workers, so a submitted cycle survives a daemon
+  restart and resumes from its checkpoints
+- The client half of this file imports nothing beyond the standard
+  library and config, so submitting a cycle takes milliseconds
+Protocol: one JSON object per line each way.
+
+    python3 daemon.py serve --workers 4 &
+    python3 daemon.py submit 12                 # one cycle
+    python3 daemon.py submit --from 1 --to 40 --commit --wait
+    python3 daemon.py status
+    python3 daemon.py stop
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from config.api_config import DAEMON_SOCKET, DAEMON_WORKERS
+
+# Idle workers look for jobs queued by other processes this often (s)
+IDLE_POLL_SECONDS = 5.0
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+class DaemonError(Exception):
+    """The daemon isn't reachable or rejected a request"""
+
+def request(command, socket_path=DAEMON_SOCKET, timeout=10.0, **fields):
+    """Send one command to the daemon and return its reply"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(socket_path)
+            conn.sendall((json.dumps({"command": command, **fields}) + "\n").encode("utf-8"))
+            with conn.makefile("r", encoding="utf-8") as f:
+                line = f.readline()
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        raise DaemonError(f"No daemon on {socket_path} (start one with: python3 daemon.py serve)") from e
+    except OSError as e:
+        raise DaemonError(f"Daemon on {socket_path} didn't answer: {e}") from e
+    if not line:
+        raise DaemonError("Daemon closed the connection without answering")
+    reply = json.loads(line)
+    if not reply.get("ok"):
+        raise DaemonError(reply.get("error", "request failed"))
+    return reply
+
+def wait_for(job_ids, socket_path=DAEMON_SOCKET, poll=1.0):
+    """Poll until every job is done or failed; returns their final rows"""
+    while True:
+        jobs = request("status", socket_path, ids=job_ids)["jobs"]
+        if all(job["status"] in ("done", "failed") for job in jobs):
+            return jobs
+        time.sleep(poll)
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+def warm_up():
+    """Load everything a cycle would otherwise build cold"""
+    import explorer_gauntlet  # noqa: F401 (imported to be warm)
+    import synthesize_and_commit  # noqa: F401
+    from run_explorer import load_emotional_state
+    from llm_client import PROVIDERS, get_client
+    from run_store import default_store
+    from topic_index import default_topic_index
+
+    for provider in PROVIDERS:
+        try:
+            get_client(provider)
+        except Exception as e:
+            print(f"⚠️  {provider} client not ready ({e})")
+    default_store()
+    default_topic_index()
+    load_emotional_state()
+
+class ExplorerDaemon:
+    """Worker threads over the job queue plus the socket commands that feed it"""
+
+    def __init__(self, socket_path=DAEMON_SOCKET, workers=DAEMON_WORKERS):
+        from job_queue import JobQueue
+        self.socket_path = socket_path
+        self.workers = workers
+        self.queue = JobQueue()
+        self.started = time.time()
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+        self.server = None
+        self._threads = []
+
+    # ------------------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------------------
+
+    def handle(self, message):
+        """Reply (a dict) to one client message"""
+        command = message.get("command")
+        if command == "ping":
+            return {"ok": True, "pid": os.getpid(), "workers": self.workers,
+                    "uptime": round(time.time() - self.started, 1)}
+        if command == "submit":
+            if self.stopping.is_set():
+                return {"ok": False, "error": "daemon is stopping"}
+            cycles = message.get("cycles") or []
+            ids = self.queue.enqueue(
+                cycles, message.get("explorer", "gauntlet"),
+                synthesize=bool(message.get("synthesize")),
+                commit=bool(message.get("commit")),
+                stream=bool(message.get("stream"))
+            )
+            self.wake.set()
+            return {"ok": True, "jobs": ids, "skipped": len(cycles) - len(ids)}
+        if command == "status":
+            ids = message.get("ids")
+            jobs = self.queue.get(ids) if ids else self.queue.jobs(limit=message.get("limit", 20))
+            return {"ok": True, "counts": self.queue.counts(), "jobs": jobs}
+        if command == "stop":
+            self.stop()
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown command {command!r}"}
+
+    def stop(self):
+        """Stop taking work; running jobs finish, queued ones wait for the next start"""
+        self.stopping.set()
+        self.wake.set()
+        if self.server is not None:
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _work(self, name):
+        from job_queue import work, worker_name
+        worker = f"{worker_name()}:{name}"
+        while not self.stopping.is_set():
+            work(self.queue, worker, stop=self.stopping)
+            self.wake.wait(IDLE_POLL_SECONDS)
+            self.wake.clear()
+
+    # ------------------------------------------------------------------
+    # Socket
+    # ------------------------------------------------------------------
+
+    def _claim_socket(self):
+        """Refuse to start next to a live daemon; clear a dead one's socket"""
+        if not os.path.exists(self.socket_path):
+            return
+        try:
+            request("ping", self.socket_path, timeout=2.0)
+        except DaemonError:
+            os.unlink(self.socket_path)
+            return
+        raise DaemonError(f"A daemon is already listening on {self.socket_path}")
+
+    def serve(self):
+        import socketserver
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        reply = daemon.handle(json.loads(line))
+                    except Exception as e:
+                        reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                    self.wfile.write((json.dumps(reply, default=str) + "\n").encode("utf-8"))
+                    self.wfile.flush()
+
+        class Server(socketserver.ThreadingUnixStreamServer):
+            daemon_threads = True
+
+        self._claim_socket()
+        start = time.monotonic()
+        warm_up()
+        print(f"🔥 Warm in {time.monotonic() - start:.1f}s")
+
+        # Only this user may submit cycles
+        old_umask = os.umask(0o177)
+        try:
+            self.server = Server(self.socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, args=(f"daemon-{i}",), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        print(f"👂 Listening on {self.socket_path} ({self.workers} workers, pid {os.getpid()})")
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            self.stopping.set()
+            self.wake.set()
+        finally:
+            self.server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+        print("⏳ Letting running jobs finish (Ctrl-C again to leave them for the next start)...")
+        for thread in self._threads:
+            while thread.is_alive():
+                thread.join(timeout=0.5)
+        print("👋 Daemon stopped")
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+def _print_jobs(jobs):
+    for job in jobs:
+        print(f"{job['id']:>6}  cycle {job['cycle']!s:<5} {job['explorer']:<9} {job['status']:<8} "
+              f"try {job['attempts']}  {job['error'] or job['result'] or ''}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resident explorer daemon and its client")
+    parser.add_argument("--socket", default=DAEMON_SOCKET)
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="run the daemon in the foreground")
+    serve.add_argument("--workers", type=int, default=DAEMON_WORKERS)
+    submit = sub.add_parser("submit", help="queue one cycle or a range")
+    submit.add_argument("cycle", type=int, nargs="?")
+    submit.add_argument("--from", dest="first", type=int)
+    submit.add_argument("--to", dest="last", type=int)
+    submit.add_argument("--explorer", choices=("gauntlet", "loop"), default="gauntlet")
+    submit.add_argument("--synthesize", action="store_true")
+    submit.add_argument("--commit", action="store_true", help="synthesize and commit each output")
+    submit.add_argument("--stream", action="store_true", help="stream loop transcripts to disk")
+    submit.add_argument("--wait", action="store_true", help="return once the jobs have finished")
+    status = sub.add_parser("status", help="job counts and recent (or given) jobs")
+    status.add_argument("ids", type=int, nargs="*")
+    sub.add_parser("ping", help="is the daemon up?")
+    sub.add_parser("stop", help="stop after the running jobs finish")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "serve":
+            ExplorerDaemon(args.socket, args.workers).serve()
+        elif args.command == "submit":
+            if args.cycle is not None:
+                cycles = [args.cycle]
+            elif args.first is not None and args.last is not None:
+                cycles = list(range(args.first, args.last + 1))
+            else:
+                parser.error("submit needs a cycle or --from/--to")
+            reply = request("submit", args.socket, cycles=cycles, explorer=args.explorer,
+                            synthesize=args.synthesize, commit=args.commit, stream=args.stream)
+            print(f"Queued {len(reply['jobs'])} jobs {reply['jobs']}"
+                  + (f" ({reply['skipped']} already pending)" if reply["skipped"] else ""))
+            if args.wait and reply["jobs"]:
+                jobs = wait_for(reply["jobs"], args.socket)
+                _print_jobs(jobs)
+                sys.exit(1 if any(job["status"] == "failed" for job in jobs) else 0)
+        elif args.command == "status":
+            reply = request("status", args.socket, ids=args.ids)
+            counts = reply["counts"]
+            print("  ".join(f"{s}: {counts.get(s, 0)}" for s in ("queued", "running", "done", "failed")))
+            _print_jobs(reply["jobs"])
+        elif args.command == "ping":
+            reply = request("ping", args.socket)
+            print(f"Daemon pid {reply['pid']} up {reply['uptime']:.0f}s, {reply['workers']} workers")
+        else:
+            request("stop", args.socket)
+            print("Stopping after running jobs finish")
+    except DaemonError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
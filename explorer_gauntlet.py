@@ -4,20 +4,40 @@ EXPLORER WITH QUANTUM NOISE GAUNTLET
 Phases 1-2: Clean boundary exploration
 Phase 3: Generate initial idea with noise
 GAUNTLET: Evolve idea through 5-20 random perturbations
+Perturbations are chosen by the noise scheduler, which favours the ones
+that have moved ideas furthest in past runs (see noise_scheduler.py)
 """
 
 import os
 import sys
 import json
+import io
+import re
 import random
 from datetime import datetime
-from openai import OpenAI
 
-# OpenRouter configuration
-client = OpenAI(
-    api_key=os.environ.get("OPENROUTER_API_KEY"),
-    base_url="https://openrouter.ai/api/v1"
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from config.api_config import (
+    TOPIC_MAX_ATTEMPTS,
+    GAUNTLET_CONVERGENCE_THRESHOLD,
+    GAUNTLET_PATIENCE,
+    GAUNTLET_MIN_ITERATIONS,
+    GAUNTLET_MAX_RESEEDS,
+    GAUNTLET_SIDECAR,
 )
+from similarity import ConvergenceMonitor
+from noise_scheduler import load_scheduler, perturbation_reward
+from transcript_writer import GauntletReport, GauntletReportWriter
+from run_store import start_run, prompt_cache_summary
+from telemetry import phase
+from topic_index import default_topic_index
+
+# OpenRouter configuration (client comes from llm_client, built on first call)
+GAUNTLET_PROVIDER = "openrouter"
+GAUNTLET_MODEL = "deepseek/deepseek-r1"  # OpenRouter model ID
+GAUNTLET_TIMEOUT = 180  # 3 minute timeout
+
+SENTENCE_END = re.compile(r"[.!?](\s|$)")
 
 # ============================================================================
 # QUANTUM NOISE OPERATIONS
@@ -125,37 +145,104 @@ NOISE_OPERATIONS = {
 # DEEPSEEK API CALLS
 # ============================================================================
 
-def call_deepseek(prompt, max_tokens=4000):
-    """Call DeepSeek via OpenRouter"""
+def as_messages(prompt):
+    """A plain prompt string becomes one user turn; message lists pass through"""
+    if isinstance(prompt, str):
+        return [{"role": "user", "content": prompt}]
+    return list(prompt)
+
+def call_deepseek(prompt, max_tokens=4000, bypass_cache=False, stream=False,
+                  stop_when=None):
+    """
+    Call DeepSeek via OpenRouter (identical requests come from llm_cache).
+    prompt is a string or a message list (see the build_*_messages helpers).
+    stream=True streams the answer; stop_when(content_so_far) ends the
+    stream early once the part we need has arrived (implies streaming).
+    """
+    return call_deepseek_with_usage(prompt, max_tokens, bypass_cache, stream, stop_when)[0]
+
+def call_deepseek_with_usage(prompt, max_tokens=4000, bypass_cache=False, stream=False,
+                             stop_when=None):
+    """call_deepseek, returning (content, usage); usage is None for a failed call"""
+    # Imported here so prompt builders can be used without loading openai
+    from llm_client import chat_completion, stream_completion, LLMError
+    request = dict(
+        model=GAUNTLET_MODEL,
+        messages=as_messages(prompt),
+        max_tokens=max_tokens,
+        timeout=GAUNTLET_TIMEOUT
+    )
     try:
         print(f"  [API call - {max_tokens} tokens]", end='', flush=True)
-        response = client.chat.completions.create(
-            model="deepseek/deepseek-r1",  # OpenRouter model ID
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=max_tokens,
-            timeout=180  # 3 minute timeout
+        if stream or stop_when:
+            result = stream_completion(
+                GAUNTLET_PROVIDER,
+                stop_when=stop_when,
+                bypass_cache=bypass_cache,
+                **request
+            )
+            print(" ✓ (stopped early)" if result["stopped_early"] else " ✓")
+            return result["content"], result["usage"]
+        response = chat_completion(
+            GAUNTLET_PROVIDER,
+            bypass_cache=bypass_cache,
+            **request
         )
         print(" ✓")
-        return response.choices[0].message.content
-    except Exception as e:
+        return response.choices[0].message.content, response.usage
+    except LLMError as e:
         print(f" ✗\n  ERROR: {e}")
-        return f"ERROR: {e}"
+        return f"ERROR: {e}", None
+
+def stop_after_first_period(content):
+    """Stream stop for topics: clean_topic keeps only the text before the first '.'"""
+    return "." in content
+
+def stop_after_section(marker, sentences=2):
+    """
+    Stream stop for sectioned answers: once `marker` has appeared, stop at
+    the first paragraph break after at least `sentences` sentences.
+    """
+    def stop(content):
+        index = content.find(marker)
+        if index < 0:
+            return False
+        after = content[index:].split("\n", 1)
+        if len(after) < 2:
+            return False
+        text = after[1].lstrip("\n")
+        done = text[:text.rfind("\n\n")] if "\n\n" in text else ""
+        return len(SENTENCE_END.findall(done)) >= sentences
+    return stop
+
+def is_error_response(text):
+    """True for the placeholder call_deepseek returns when a call fails"""
+    return text.startswith("ERROR:")
+
+def require_answer(text, step):
+    """text, unless it's the failure placeholder: then raise LLMError, so a
+    failed step stops the cycle instead of becoming the next prompt"""
+    if is_error_response(text):
+        from llm_client import LLMError
+        raise LLMError(f"{step} failed: {text[len('ERROR:'):].strip()}")
+    return text
 
 # ============================================================================
 # EXPLORER PHASES
 # ============================================================================
 
-def phase_1_and_2(topic):
-    """Phase 1 & 2: Reach boundary and understand spiral (CLEAN - no noise)"""
-    
-    prompt = f"""
-You are an epistemic explorer. Your mission has three phases.
+# Prompts are split into a fixed prefix (system instructions, earlier turns)
+# and a variable suffix (topic, perturbations, current idea) in the last
+# message, so providers with prompt caching can reuse the prefix across
+# calls and cycles. Keep the prefix text byte-identical between calls.
+
+PHASE_1_2_INSTRUCTIONS = """You are an epistemic explorer. Your mission has three phases.
 
 ======================================================================
 PHASE 1: REACH THE BOUNDARY (Warmup)
 ======================================================================
 
-**Claimed Fact:** {topic}
+**Claimed Fact:** given in the next message
 
 Your task: Verify this claim through AT LEAST 5 different paths:
 - PATH A (Authoritative Sources): What do experts/institutions say?
@@ -200,22 +287,44 @@ OUTPUT FORMAT FOR PHASES 1-2:
 
 DO NOT proceed to Phase 3 yet. Output ONLY Phases 1 and 2.
 """
-    
-    return call_deepseek(prompt, max_tokens=4000)
 
-def phase_3_initial(phase_1_2_result):
-    """Phase 3: Generate INITIAL idea with light noise"""
-    
-    # Apply light noise for initial generation
-    num_noise = random.randint(1, 2)
-    noise_ops = random.sample(list(NOISE_OPERATIONS.keys()), num_noise)
-    perturbations = [random.choice(NOISE_OPERATIONS[op]) for op in noise_ops]
+def build_phase_1_2_messages(topic):
+    """Conversation for Phases 1-2 (boundary exploration); only the claim varies"""
     
-    prompt = f"""
-Here is your exploration so far:
+    return [
+        {"role": "system", "content": PHASE_1_2_INSTRUCTIONS},
+        {"role": "user", "content": f"**Claimed Fact:** {topic}"}
+    ]
 
-{phase_1_2_result}
+def phase_1_and_2(topic):
+    """Phase 1 & 2: Reach boundary and understand spiral (CLEAN - no noise)"""
+    
+    with phase("phase_1_2"):
+        return require_answer(
+            call_deepseek(build_phase_1_2_messages(topic), max_tokens=4000), "Phase 1-2"
+        )
 
+def noise_scheduler():
+    """Scheduler for one cycle's perturbations, or None for uniform picks"""
+    return load_scheduler(NOISE_OPERATIONS)
+
+def pick_perturbations(num_ops, rng=random, scheduler=None):
+    """Pick num_ops distinct noise operations and one prompt from each
+    (uniformly without a scheduler)"""
+    if scheduler:
+        return scheduler.pick(num_ops, rng)
+    noise_ops = rng.sample(list(NOISE_OPERATIONS.keys()), num_ops)
+    perturbations = [rng.choice(NOISE_OPERATIONS[op]) for op in noise_ops]
+    return noise_ops, perturbations
+
+def credit_perturbations(scheduler, noise_ops, perturbations, before, after, tokens=None):
+    """Reward for one reflection that cost `tokens` completion tokens; the
+    scheduler (if any) learns from it"""
+    if scheduler:
+        return scheduler.observe(noise_ops, perturbations, before, after, tokens)
+    return perturbation_reward(before, after, tokens)
+
+PHASE_3_INSTRUCTIONS = """
 ======================================================================
 PHASE 3: GENERATE FROM THE EDGE (Novel Idea)
 ======================================================================
@@ -229,16 +338,45 @@ CRITICAL REQUIREMENTS:
 - Must use the boundary as LEVERAGE for new insight
 
 COGNITIVE PERTURBATIONS (apply these perspective shifts):
-{chr(10).join(f"- {p}" for p in perturbations)}
+"""
 
+PHASE_3_TEMPLATE = """
 Generate your initial novel idea (2-4 sentences). Be bold and specific.
 
 ## PHASE 3: GENERATE FROM THE EDGE (Initial Idea)
 
 [Your novel idea here]
 """
+
+def build_phase_3_messages(topic, phase_1_2_result, perturbations):
+    """
+    Phase 3 (initial idea) continues the Phases 1-2 conversation, so the
+    instructions, claim and exploration are the prefix already sent. The
+    perturbations sit between the requirements and the answer template.
+    """
+    
+    return build_phase_1_2_messages(topic) + [
+        {"role": "assistant", "content": phase_1_2_result},
+        {"role": "user", "content": PHASE_3_INSTRUCTIONS +
+                                    "\n".join(f"- {p}" for p in perturbations) +
+                                    "\n" + PHASE_3_TEMPLATE}
+    ]
+
+def phase_3_initial(topic, phase_1_2_result, rng=random, scheduler=None):
+    """Phase 3: Generate INITIAL idea with light noise"""
+    
+    # Apply light noise for initial generation (there's no earlier idea to
+    # measure it against, so the scheduler only learns from the gauntlet)
+    noise_ops, perturbations = pick_perturbations(rng.randint(1, 2), rng, scheduler)
     
-    result = call_deepseek(prompt, max_tokens=1500)
+    # The idea is the first paragraph under the PHASE 3 header - stop there
+    with phase("phase_3"):
+        result = call_deepseek(
+            build_phase_3_messages(topic, phase_1_2_result, perturbations),
+            max_tokens=1500,
+            stop_when=stop_after_section("PHASE 3")
+        )
+    require_answer(result, "Phase 3")
     
     return {
         "initial_idea": result,
@@ -268,77 +406,179 @@ def extract_idea_from_response(response):
     # Fallback: return full response
     return response.strip()
 
-def idea_gauntlet(initial_idea, num_iterations=None):
+REFLECTION_INSTRUCTIONS = """
+You are evolving an idea. You will be given your current idea and a set of
+PERTURBATIONS (view your idea through these lenses).
+
+Reflect on your idea through these perturbations:
+- Does it hold up under this lens?
+- Does it transform or reveal something deeper?
+- Does it need to evolve?
+
+Output your EVOLVED idea (2-4 sentences max). 
+Can be refined, mutated, inverted, or completely reconceived.
+Be concise and bold.
+"""
+
+def build_reflection_messages(current_idea, perturbations):
+    """Conversation for one gauntlet iteration; the instructions never change"""
+    
+    return [
+        {"role": "system", "content": REFLECTION_INSTRUCTIONS},
+        {"role": "user", "content": f"""Your current idea:
+{current_idea}
+
+PERTURBATIONS (view your idea through these lenses):
+{chr(10).join(f"- {p}" for p in perturbations)}
+"""}
+    ]
+
+def convergence_monitor(max_reseeds=GAUNTLET_MAX_RESEEDS):
+    """Plateau detector for one gauntlet chain, configured from api_config"""
+    return ConvergenceMonitor(
+        threshold=GAUNTLET_CONVERGENCE_THRESHOLD,
+        patience=GAUNTLET_PATIENCE,
+        min_steps=GAUNTLET_MIN_ITERATIONS,
+        max_reseeds=max_reseeds
+    )
+
+def reseed_size(num_ops):
+    """A reseed hits the plateaued idea with twice the usual noise"""
+    return min(num_ops * 2, len(NOISE_OPERATIONS))
+
+def idea_gauntlet(initial_idea, num_iterations=None, rng=random, job=None, on_iteration=None,
+                  scheduler=None):
     """
     Run idea through quantum noise gauntlet
     Each iteration: apply random noise → reflect → evolve idea
+    When consecutive ideas stop changing the chain is reseeded with heavier
+    noise once, then stopped early (stop_reason "converged").
+    With a job (job_queue.Job) every iteration is checkpointed, and a
+    resumed job picks up after the last finished one.
+    on_iteration(reflection) sees each reflection as soon as it exists.
+    Each reflection's score (novelty per completion token) is fed back to the
+    noise scheduler (loaded here unless the cycle passes its own).
     """
     
     # Random iterations (8-20) - MORE CHAOS
     if num_iterations is None:
-        num_iterations = random.randint(8, 20)
+        num_iterations = rng.randint(8, 20)
+    if scheduler is None:
+        scheduler = noise_scheduler()
     
     current_idea = extract_idea_from_response(initial_idea)
     reflection_chain = []
+    monitor = convergence_monitor()
+    reseed = False
+    stop_reason = "completed"
+    
+    saved = job.load("gauntlet") if job else None
+    if saved:
+        num_iterations = saved["num_iterations"]
+        current_idea = saved["current_idea"]
+        reflection_chain = saved["reflection_chain"]
+        monitor.load_state(saved["monitor"])
+        reseed = saved["reseed"]
+        stop_reason = saved["stop_reason"]
     
     print(f"\n{'='*70}")
     print(f"QUANTUM GAUNTLET - {num_iterations} iterations")
     print(f"{'='*70}\n")
     print(f"Initial idea: {current_idea[:100]}...\n")
-    
-    for i in range(num_iterations):
-        # Apply random quantum noise (1-3 operations)
-        num_ops = random.randint(1, 3)
-        noise_ops = random.sample(list(NOISE_OPERATIONS.keys()), num_ops)
-        perturbations = [random.choice(NOISE_OPERATIONS[op]) for op in noise_ops]
+    if saved:
+        print(f"Resuming after iteration {len(reflection_chain)} (checkpoint)\n")
+        if on_iteration:
+            for reflection in reflection_chain:
+                on_iteration(reflection)
+    
+    for i in range(len(reflection_chain), num_iterations):
+        if stop_reason != "completed":
+            break
         
-        print(f"[Iteration {i+1}/{num_iterations}]")
-        print(f"Perturbations: {', '.join(noise_ops)}")
+        # Apply random quantum noise (1-3 operations, more after a plateau)
+        num_ops = rng.randint(1, 3)
+        noise_ops, perturbations = pick_perturbations(
+            reseed_size(num_ops) if reseed else num_ops, rng, scheduler
+        )
         
-        # Reflection prompt
-        reflection_prompt = f"""
-Your current idea:
-{current_idea}
-
-PERTURBATIONS (view your idea through these lenses):
-{chr(10).join(f"- {p}" for p in perturbations)}
-
-Reflect on your idea through these perturbations:
-- Does it hold up under this lens?
-- Does it transform or reveal something deeper?
-- Does it need to evolve?
-
-Output your EVOLVED idea (2-4 sentences max). 
-Can be refined, mutated, inverted, or completely reconceived.
-Be concise and bold.
-"""
+        print(f"[Iteration {i+1}/{num_iterations}]" + (" [reseed]" if reseed else ""))
+        print(f"Perturbations: {', '.join(noise_ops)}")
         
-        # Get evolved idea
-        evolved_response = call_deepseek(reflection_prompt, max_tokens=800)
+        # Get evolved idea (fresh while the scheduler learns from it: a cached
+        # answer would credit the same reflection again)
+        with phase("gauntlet", iteration=i + 1):
+            evolved_response, usage = call_deepseek_with_usage(
+                build_reflection_messages(current_idea, perturbations),
+                max_tokens=800,
+                bypass_cache=scheduler is not None
+            )
         evolved_idea = evolved_response.strip()
+        tokens = getattr(usage, "completion_tokens", None)
+        
+        # A failed call must not become the next idea - keep the current one
+        failed = is_error_response(evolved_idea)
+        if failed:
+            print("Call failed - keeping current idea\n")
+            evolved_idea = current_idea
+        
+        similarity = monitor.observe(current_idea, evolved_idea, failed)
+        score = None if failed else credit_perturbations(
+            scheduler, noise_ops, perturbations, current_idea, evolved_idea, tokens
+        )
         
         # Store reflection
-        reflection_chain.append({
+        reflection = {
             "iteration": i + 1,
             "perturbations": perturbations,
             "noise_operations": noise_ops,
             "idea_before": current_idea,
-            "idea_after": evolved_idea
-        })
+            "idea_after": evolved_idea,
+            "similarity": None if similarity is None else round(similarity, 3),
+            "score": None if score is None else round(score, 3),
+            "completion_tokens": tokens
+        }
+        if reseed:
+            reflection["reseeded"] = True
+        reflection_chain.append(reflection)
+        if on_iteration:
+            on_iteration(reflection)
         
         print(f"Evolved: {evolved_idea[:80]}...\n")
         
         current_idea = evolved_idea
+        
+        signal = monitor.signal()
+        reseed = signal == "reseed"
+        if reseed:
+            print(f"Plateau at iteration {i+1} - reseeding with heavier noise\n")
+        elif signal == "stop":
+            stop_reason = "converged"
+            print(f"Converged at iteration {i+1}/{num_iterations} - stopping early\n")
+        
+        if job:
+            job.save("gauntlet", {
+                "num_iterations": num_iterations,
+                "current_idea": current_idea,
+                "reflection_chain": reflection_chain,
+                "monitor": monitor.state(),
+                "reseed": reseed,
+                "stop_reason": stop_reason
+            })
+    
+    if reflection_chain:
+        reflection_chain[-1]["stop_reason"] = stop_reason
     
     print(f"{'='*70}")
-    print(f"GAUNTLET COMPLETE")
+    print(f"GAUNTLET COMPLETE ({stop_reason})")
     print(f"{'='*70}\n")
     print(f"Final idea: {current_idea}\n")
     
     return {
         "initial_idea": extract_idea_from_response(initial_idea),
         "final_idea": current_idea,
-        "iterations": num_iterations,
+        "iterations": len(reflection_chain),
+        "planned_iterations": num_iterations,
+        "stop_reason": stop_reason,
         "reflection_chain": reflection_chain
     }
 
@@ -346,17 +586,9 @@ Be concise and bold.
 # TRANSLATION STEP
 # ============================================================================
 
-def translate_gauntlet_result(gauntlet_final_idea):
-    """
-    Translate the chaotic gauntlet output into plain, direct language
-    No poetry, no metaphor - just what it literally means
-    """
-    
-    prompt = f"""
-You evolved an idea through multiple chaotic perturbations.
-
-Your final evolved idea:
-{gauntlet_final_idea}
+TRANSLATION_INSTRUCTIONS = """
+You evolved an idea through multiple chaotic perturbations. You will be
+given your final evolved idea.
 
 Now translate this into plain, direct language:
 - What is this actually saying?
@@ -366,24 +598,52 @@ Now translate this into plain, direct language:
 
 Pure translation. No interpretation, no goals - just: what does this MEAN in simple terms?
 """
+
+def build_translation_messages(gauntlet_final_idea):
+    """Conversation for the plain-language translation step"""
     
-    translation = call_deepseek(prompt, max_tokens=400)
+    return [
+        {"role": "system", "content": TRANSLATION_INSTRUCTIONS},
+        {"role": "user", "content": f"Your final evolved idea:\n{gauntlet_final_idea}"}
+    ]
+
+def translate_gauntlet_result(gauntlet_final_idea):
+    """
+    Translate the chaotic gauntlet output into plain, direct language
+    No poetry, no metaphor - just what it literally means
+    """
+    
+    with phase("translation"):
+        translation = call_deepseek(
+            build_translation_messages(gauntlet_final_idea),
+            max_tokens=400
+        )
     
-    return translation.strip()
+    return require_answer(translation, "Translation").strip()
 
 # ============================================================================
 # MAIN EXPLORER
 # ============================================================================
 
-def run_explorer(topic, cycle_num):
+def checkpointed(job, name, compute):
+    """compute(), or the saved result of a resumed job that already ran it"""
+    return job.step(name, compute) if job else compute()
+
+def run_explorer(topic, cycle_num, job=None):
     """
     Full explorer with gauntlet:
     1. Phase 1-2: Clean exploration to boundary
     2. Phase 3: Initial idea generation (light noise)
     3. GAUNTLET: Evolve through chaos (heavy noise)
+    A job (job_queue.Job) checkpoints every phase and gauntlet iteration
+    and supplies the random state; a resumed job skips what it finished.
     """
     
+    rng = job.rng if job else random
+    scheduler = noise_scheduler()
+    
     start_time = datetime.now()
+    run = start_run("gauntlet", cycle_num, topic=topic, model=GAUNTLET_MODEL)
     
     print(f"\n{'='*70}")
     print(f"EXPLORER - DAY 2 - CYCLE {cycle_num} [QUANTUM GAUNTLET MODE]")
@@ -391,106 +651,98 @@ def run_explorer(topic, cycle_num):
     print(f"Topic: {topic}")
     print(f"Timestamp: {start_time.strftime('%Y%m%d_%H%M%S')}\n")
     
-    # Phase 1-2: Clean exploration
-    print("Phase 1-2: Reaching boundary and understanding spiral...")
-    phase_1_2 = phase_1_and_2(topic)
-    
-    # Phase 3: Initial idea with light noise
-    print("\nPhase 3: Generating initial idea...")
-    phase_3 = phase_3_initial(phase_1_2)
-    
-    # GAUNTLET: Evolutionary refinement
-    print("\nEntering quantum gauntlet...")
-    gauntlet_result = idea_gauntlet(
-        phase_3["initial_idea"],
-        num_iterations=random.randint(8, 20)
-    )
-    
-    # TRANSLATION: Convert to plain language
-    print("\nTranslating gauntlet result to plain language...")
-    translation = translate_gauntlet_result(gauntlet_result["final_idea"])
-    print(f"Translation: {translation}\n")
-    
-    end_time = datetime.now()
-    elapsed = (end_time - start_time).total_seconds()
-    
-    # Compile full result
-    full_output = f"""EXPLORER - DAY 2 - CYCLE {cycle_num} [QUANTUM GAUNTLET MODE]
-{'='*70}
-
-Timestamp: {start_time.strftime('%Y%m%d_%H%M%S')}
-Elapsed: {elapsed:.2f}s
-Gauntlet Iterations: {gauntlet_result['iterations']}
-
-{'='*70}
-PHASES 1-2: BOUNDARY EXPLORATION
-{'='*70}
-
-{phase_1_2}
-
-{'='*70}
-PHASE 3: INITIAL IDEA (Pre-Gauntlet)
-{'='*70}
-
-Initial Perturbations: {phase_3['initial_perturbations']}
-
-{gauntlet_result['initial_idea']}
-
-{'='*70}
-QUANTUM GAUNTLET: EVOLUTIONARY REFINEMENT
-{'='*70}
-
-Iterations: {gauntlet_result['iterations']}
-
-"""
-    
-    # Add reflection chain summary
-    for reflection in gauntlet_result['reflection_chain']:
-        full_output += f"\n[Iteration {reflection['iteration']}] Perturbations: {', '.join(reflection['noise_operations'])}\n"
-        full_output += f"Before: {reflection['idea_before'][:100]}...\n"
-        full_output += f"After: {reflection['idea_after'][:100]}...\n"
+    # The report is written section by section as the cycle runs
+    output_file = f"explorer_cycle_{cycle_num}_gauntlet.txt"
+    report = GauntletReportWriter(output_file, cycle_num, start_time, topic=topic,
+                                  sidecar=GAUNTLET_SIDECAR)
+    try:
+        # Phase 1-2: Clean exploration
+        print("Phase 1-2: Reaching boundary and understanding spiral...")
+        phase_1_2 = checkpointed(job, "phase_1_2", lambda: phase_1_and_2(topic))
+        report.phase_1_2(phase_1_2)
+        
+        # Phase 3: Initial idea with light noise
+        print("\nPhase 3: Generating initial idea...")
+        phase_3 = checkpointed(
+            job, "phase_3", lambda: phase_3_initial(topic, phase_1_2, rng, scheduler)
+        )
+        report.phase_3(phase_3["initial_perturbations"],
+                       extract_idea_from_response(phase_3["initial_idea"]))
+        
+        # GAUNTLET: Evolutionary refinement
+        print("\nEntering quantum gauntlet...")
+        gauntlet_result = idea_gauntlet(
+            phase_3["initial_idea"],
+            num_iterations=rng.randint(8, 20),
+            rng=rng,
+            job=job,
+            on_iteration=report.iteration,
+            scheduler=scheduler
+        )
+        
+        # TRANSLATION: Convert to plain language
+        print("\nTranslating gauntlet result to plain language...")
+        translation = checkpointed(
+            job, "translation", lambda: translate_gauntlet_result(gauntlet_result["final_idea"])
+        )
+        print(f"Translation: {translation}\n")
+        
+        end_time = datetime.now()
+        elapsed = (end_time - start_time).total_seconds()
+        
+        report.finish(gauntlet_result["final_idea"], translation, gauntlet_result["iterations"],
+                      gauntlet_result["stop_reason"], elapsed)
+    except BaseException:
+        report.abort()
+        run.finish(status="error")
+        raise
     
-    full_output += f"""
-{'='*70}
-FINAL IDEA (Post-Gauntlet)
-{'='*70}
-
-{gauntlet_result['final_idea']}
-
-{'='*70}
-TRANSLATION (Plain Language)
-{'='*70}
-
-{translation}
-
-{'='*70}
-"""
+    with open(output_file, encoding="utf-8") as f:
+        full_output = f.read()
     
-    # Save to file
-    output_file = f"explorer_cycle_{cycle_num}_gauntlet.txt"
-    with open(output_file, 'w') as f:
-        f.write(full_output)
+    run.record_iterations(gauntlet_result["reflection_chain"])
+    run.finish(file=output_file, output=full_output, elapsed=elapsed)
+    if not is_error_response(gauntlet_result["final_idea"]):
+        default_topic_index().add(gauntlet_result["final_idea"], "final_idea", run.id)
     
     print(f"\n{'='*70}")
     print(f"✅ CYCLE {cycle_num} COMPLETE")
     print(f"Saved: {output_file}")
     print(f"Elapsed: {elapsed:.2f}s")
     print(f"Gauntlet iterations: {gauntlet_result['iterations']}")
+    totals = run.call_totals()
+    if totals:
+        print(prompt_cache_summary(totals))
     print(f"{'='*70}\n")
     
     return output_file
 
+def format_gauntlet_report(cycle_num, start_time, elapsed, phase_1_2, phase_3,
+                           gauntlet_result, translation):
+    """Compile the full text report for one gauntlet cycle (as GauntletReportWriter writes it)"""
+    
+    buffer = io.StringIO()
+    write_gauntlet_report(GauntletReport(buffer, cycle_num, start_time),
+                          elapsed, phase_1_2, phase_3, gauntlet_result, translation)
+    return buffer.getvalue()
+
+def write_gauntlet_report(report, elapsed, phase_1_2, phase_3, gauntlet_result, translation):
+    """Feed a finished cycle to a GauntletReport in one go; returns what finish() returns"""
+    
+    report.phase_1_2(phase_1_2)
+    report.phase_3(phase_3['initial_perturbations'], gauntlet_result['initial_idea'])
+    for reflection in gauntlet_result['reflection_chain']:
+        report.iteration(reflection)
+    return report.finish(
+        gauntlet_result['final_idea'], translation, gauntlet_result['iterations'],
+        gauntlet_result.get('stop_reason', 'completed'), elapsed
+    )
+
 # ============================================================================
 # RANDOM TOPIC GENERATION
 # ============================================================================
 
-def generate_random_topic():
-    """
-    Generate a truly random, verifiable claim to explore
-    No fixed list - completely open-ended
-    """
-    
-    prompt = """
+TOPIC_PROMPT = """
 Generate a single, specific, verifiable claim that could be explored through verification.
 
 Requirements:
@@ -505,8 +757,23 @@ Requirements:
 
 Generate ONE completely new, random claim:
 """
-    
-    topic = call_deepseek(prompt, max_tokens=100)
+
+def build_topic_prompt(avoid=()):
+    """TOPIC_PROMPT, plus any topics just rejected as repeats"""
+    if not avoid:
+        return TOPIC_PROMPT
+    return TOPIC_PROMPT.replace(
+        "\nGenerate ONE",
+        f"- Already explored, pick something unrelated: {'; '.join(avoid)}\n\nGenerate ONE"
+    )
+
+def report_repeat(topic, match):
+    similarity, kind, past = match
+    print(f"🔁 Topic repeats a past {kind} ({similarity:.2f}): {past[:70]}")
+    print(f"   Rejected: {topic[:70]}")
+
+def clean_topic(topic):
+    """Reduce a raw topic response to a single clean sentence"""
     
     # Clean up the response
     topic = topic.strip()
@@ -525,6 +792,39 @@ Generate ONE completely new, random claim:
     
     return topic
 
+def generate_random_topic(max_attempts=TOPIC_MAX_ATTEMPTS):
+    """
+    Generate a truly random, verifiable claim to explore
+    No fixed list - completely open-ended
+    Near-duplicates of past topics/final ideas are regenerated (up to
+    max_attempts calls); the accepted topic joins the index. A failed call
+    raises LLMError.
+    """
+    
+    index = default_topic_index()
+    rejected = []
+    for attempt in range(max_attempts):
+        # Same prompt every time - a cached answer would repeat the topic forever
+        with phase("topic", attempt=attempt + 1):
+            response = call_deepseek(
+                build_topic_prompt(rejected),
+                max_tokens=100,
+                bypass_cache=True,
+                stop_when=stop_after_first_period
+            )
+        # Before clean_topic, which would strip the "ERROR:" prefix
+        topic = clean_topic(require_answer(response, "Topic generation"))
+        match = index.find_duplicate(topic)
+        if match is None:
+            break
+        report_repeat(topic, match)
+        rejected.append(topic)
+    else:
+        print(f"⚠️  Still a repeat after {max_attempts} tries - exploring it anyway")
+    
+    index.add(topic, "topic")
+    return topic
+
 # ============================================================================
 # ENTRY POINT
 # ============================================================================
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+DURABLE CYCLE JOB QUEUE
+Cycles as jobs in a local SQLite database (WAL), checkpointed step by step
+- jobs: one row per cycle - explorer, options, seed, status, attempts,
+  and the lease of the worker running it
+- checkpoints: each finished step of a job (topic, phases 1-2 and 3,
+  every gauntlet iteration, translation, output file, synthesis) with the
+  job's random state at that point
+A worker that crashes or is killed leaves its job "running"; once its lease
+runs out (or at once, if it ran on this host and its process is gone) the
+next worker claims the job and resumes after the last finished step, with
+the same random state, so only the step in flight is lost.
+
+    python3 job_queue.py enqueue --from 1 --to 40 --synthesize --commit
+    python3 job_queue.py work --parallel 4
+    python3 job_queue.py status
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import random
+import socket
+import sqlite3
+import argparse
+import threading
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from config.api_config import JOB_QUEUE_PATH, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS
+
+# How long a writer waits for the lock before giving up (ms)
+BUSY_TIMEOUT_MS = 30000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    explorer TEXT NOT NULL,
+    cycle INTEGER,
+    options TEXT,
+    seed INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+CREATE INDEX IF NOT EXISTS jobs_cycle ON jobs (cycle);
+
+CREATE TABLE IF NOT EXISTS checkpoints (
+    job_id INTEGER NOT NULL REFERENCES jobs (id),
+    name TEXT NOT NULL,
+    state BLOB NOT NULL,
+    rng TEXT,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (job_id, name)
+);
+"""
+
+def _pack(value):
+    return zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+def _unpack(blob):
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+def _rng_state(rng):
+    version, internal, gauss_next = rng.getstate()
+    return json.dumps([version, list(internal), gauss_next])
+
+def _set_rng_state(rng, saved):
+    version, internal, gauss_next = json.loads(saved)
+    rng.setstate((version, tuple(internal), gauss_next))
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def _worker_gone(worker):
+    """True when worker ran on this host and its process no longer exists"""
+    host, _, rest = (worker or "").partition(":")
+    pid = rest.split(":")[0]
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+class JobQueue:
+    """Thread-safe handle on the job database"""
+
+    def __init__(self, path=JOB_QUEUE_PATH, lease=JOB_LEASE_SECONDS,
+                 max_attempts=JOB_MAX_ATTEMPTS):
+        self.path = path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def connection(self):
+        """This thread's connection (opened on first use)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    def enqueue(self, cycles, explorer="gauntlet", **options):
+        """Queue one job per cycle, skipping cycles already queued or running; returns new ids"""
+        ids = []
+        with self.connection() as conn:
+            for cycle in cycles:
+                pending = conn.execute(
+                    "SELECT 1 FROM jobs WHERE cycle = ? AND explorer = ? "
+                    "AND status IN ('queued', 'running')", (cycle, explorer)
+                ).fetchone()
+                if pending:
+                    continue
+                cursor = conn.execute(
+                    "INSERT INTO jobs (explorer, cycle, options, seed, enqueued_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (explorer, cycle, json.dumps(options), random.getrandbits(32), time.time())
+                )
+                ids.append(cursor.lastrowid)
+        return ids
+
+    def claim(self, worker=None):
+        """
+        Lease the oldest runnable job to worker: queued, or running under an
+        expired lease or a dead local process. Returns a Job, or None.
+        """
+        worker = worker or worker_name()
+        conn = self.connection()
+        now = time.time()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' "
+                "OR (status = 'running' AND (lease_until < ? OR worker LIKE ?)) ORDER BY id",
+                (now, f"{socket.gethostname()}:%")
+            ).fetchall()
+            row = next((r for r in rows
+                        if r["status"] == "queued" or r["lease_until"] < now
+                        or (r["worker"] != worker and _worker_gone(r["worker"]))), None)
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, lease_until = ?, "
+                "attempts = attempts + 1, started_at = COALESCE(started_at, ?) WHERE id = ?",
+                (worker, now + self.lease, now, row["id"])
+            )
+        return Job(self, dict(row), worker)
+
+    def renew(self, job_id, worker):
+        """Extend the lease; False if another worker has taken the job over"""
+        with self.connection() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                (time.time() + self.lease, job_id, worker)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id, result=None):
+        with self.connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_until = NULL, "
+                "finished_at = ? WHERE id = ?",
+                (None if result is None else str(result), time.time(), job_id)
+            )
+
+    def fail(self, job_id, error):
+        """Record an error; the job is queued again until it runs out of attempts"""
+        with self.connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END, "
+                "error = ?, lease_until = NULL, "
+                "finished_at = CASE WHEN attempts < ? THEN NULL ELSE ? END WHERE id = ?",
+                (self.max_attempts, error, self.max_attempts, time.time(), job_id)
+            )
+            return conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+
+    def release(self, job_id):
+        """Hand an interrupted job back to the queue without spending an attempt"""
+        with self.connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', lease_until = NULL, "
+                "attempts = MAX(attempts - 1, 0) WHERE id = ? AND status = 'running'",
+                (job_id,)
+            )
+
+    def retry(self, job_ids=None):
+        """Queue failed jobs (all, or the given ids) again with fresh attempts"""
+        query = "UPDATE jobs SET status = 'queued', attempts = 0, finished_at = NULL WHERE status = 'failed'"
+        params = []
+        if job_ids:
+            query += f" AND id IN ({', '.join('?' for _ in job_ids)})"
+            params = list(job_ids)
+        with self.connection() as conn:
+            return conn.execute(query, params).rowcount
+
+    def jobs(self, status=None, limit=50):
+        query = "SELECT * FROM jobs"
+        params = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        return [dict(r) for r in self.connection().execute(query, params).fetchall()]
+
+    def get(self, job_ids):
+        """Rows of the given jobs, in id order"""
+        if not job_ids:
+            return []
+        rows = self.connection().execute(
+            f"SELECT * FROM jobs WHERE id IN ({', '.join('?' for _ in job_ids)}) ORDER BY id",
+            list(job_ids)
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def counts(self):
+        rows = self.connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        return {status: count for status, count in rows}
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def save_checkpoint(self, job_id, name, state, rng=None):
+        with self.connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (job_id, name, state, rng, saved_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job_id, name, _pack(state), None if rng is None else _rng_state(rng), time.time())
+            )
+
+    def checkpoint(self, job_id, name):
+        """(state, rng state) of a saved step, or None"""
+        row = self.connection().execute(
+            "SELECT state, rng FROM checkpoints WHERE job_id = ? AND name = ?", (job_id, name)
+        ).fetchone()
+        return None if row is None else (_unpack(row["state"]), row["rng"])
+
+    def checkpoint_names(self, job_id):
+        rows = self.connection().execute(
+            "SELECT name FROM checkpoints WHERE job_id = ? ORDER BY saved_at", (job_id,)
+        ).fetchall()
+        return [r["name"] for r in rows]
+
+class Job:
+    """
+    One claimed job. rng is the job's own Random: seeded once at enqueue,
+    rewound to the saved state by every load(), so a resumed job draws the
+    same perturbations and iteration counts it would have drawn unbroken.
+    """
+
+    def __init__(self, queue, row, worker):
+        self.queue = queue
+        self.id = row["id"]
+        self.explorer = row["explorer"]
+        self.cycle = row["cycle"]
+        self.options = json.loads(row["options"] or "{}")
+        self.attempt = row["attempts"] + 1
+        self.worker = worker
+        self.rng = random.Random(row["seed"])
+
+    def load(self, name):
+        """Saved state of a finished step (restoring the rng), or None"""
+        saved = self.queue.checkpoint(self.id, name)
+        if saved is None:
+            return None
+        state, rng = saved
+        if rng is not None:
+            _set_rng_state(self.rng, rng)
+        return state
+
+    def save(self, name, state):
+        """Checkpoint a finished step (JSON-able state) with the rng as it is now"""
+        self.queue.save_checkpoint(self.id, name, state, self.rng)
+        self.queue.renew(self.id, self.worker)
+
+    def step(self, name, compute):
+        """
+        compute()'s result, run once per job: a resumed job gets the saved one.
+        A failed call's "ERROR:" placeholder raises LLMError instead of being
+        saved, so the job is requeued and the step runs again.
+        """
+        state = self.load(name)
+        if state is not None:
+            print(f"↩️  Job {self.id}: {name} restored from checkpoint")
+            return state["value"]
+        value = compute()
+        if isinstance(value, str):
+            from explorer_gauntlet import require_answer
+            require_answer(value, name)
+        self.save(name, {"value": value})
+        return value
+
+# ============================================================================
+# RUNNING JOBS
+# ============================================================================
+
+def explore(job):
+    """Run the job's explorer (resuming from its checkpoints); returns the output file"""
+    if job.explorer == "gauntlet":
+        from explorer_gauntlet import generate_random_topic, run_explorer
+        topic = job.step("topic", generate_random_topic)
+        return run_explorer(topic, job.cycle, job=job)
+    from run_explorer import run_explorer
+    Path("local_outputs").mkdir(exist_ok=True)
+    filepath, _ = run_explorer(job.cycle, stream=job.options.get("stream", False))
+    return str(filepath)
+
+def run_job(job):
+    """explorer → synthesis → commit (as the job's options ask); returns the output file"""
+    filepath = job.step("explored", lambda: str(explore(job)))
+    if job.options.get("synthesize") or job.options.get("commit"):
+        from synthesize_and_commit import synthesize
+        title, body = job.step("synthesized", lambda: list(synthesize(Path(filepath), job.cycle)))
+        if job.options.get("commit"):
+            from synthesize_and_commit import commit_to_github
+            if not commit_to_github(title, body):
+                raise RuntimeError("git commit/push failed")
+    return filepath
+
+def _keep_leased(queue, job, done):
+    """Renew the job's lease while a long step (one slow call) runs"""
+    while not done.wait(queue.lease / 3):
+        if not queue.renew(job.id, job.worker):
+            print(f"⚠️  Job {job.id} was taken over by another worker")
+            return
+
+def work(queue, worker=None, stop=None):
+    """
+    Claim and run jobs until none is left (or the stop event is set between
+    jobs); returns (done, failed) counts
+    """
+    worker = worker or f"{worker_name()}:{threading.current_thread().name}"
+    done = failed = 0
+    while stop is None or not stop.is_set():
+        job = queue.claim(worker)
+        if job is None:
+            return done, failed
+        print(f"\n▶️  Job {job.id}: cycle {job.cycle} ({job.explorer}, attempt {job.attempt})")
+        finished = threading.Event()
+        threading.Thread(target=_keep_leased, args=(queue, job, finished), daemon=True).start()
+        try:
+            result = run_job(job)
+        except KeyboardInterrupt:
+            queue.release(job.id)
+            raise
+        except Exception as e:
+            status = queue.fail(job.id, f"{type(e).__name__}: {e}")
+            failed += status == "failed"
+            print(f"❌ Job {job.id} (cycle {job.cycle}) failed: {e} → {status}")
+        else:
+            queue.complete(job.id, result)
+            done += 1
+            print(f"✅ Job {job.id} (cycle {job.cycle}) → {result}")
+        finally:
+            finished.set()
+    return done, failed
+
+def run_workers(queue, parallel=1):
+    """work() in parallel threads; returns summed (done, failed)"""
+    totals = []
+    lock = threading.Lock()
+
+    def worker():
+        counts = work(queue)
+        with lock:
+            totals.append(counts)
+
+    threads = [threading.Thread(target=worker, name=f"job-{i}", daemon=True) for i in range(parallel)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        while thread.is_alive():
+            thread.join(timeout=0.5)
+    return sum(t[0] for t in totals), sum(t[1] for t in totals)
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Durable queue of explorer cycles")
+    sub = parser.add_subparsers(dest="command", required=True)
+    enqueue = sub.add_parser("enqueue", help="queue a range of cycles")
+    enqueue.add_argument("--from", dest="first", type=int, required=True)
+    enqueue.add_argument("--to", dest="last", type=int, required=True)
+    enqueue.add_argument("--explorer", choices=("gauntlet", "loop"), default="gauntlet")
+    enqueue.add_argument("--synthesize", action="store_true", help="synthesize each output")
+    enqueue.add_argument("--commit", action="store_true", help="synthesize and commit each output")
+    enqueue.add_argument("--stream", action="store_true", help="stream loop transcripts to disk")
+    run = sub.add_parser("work", help="run queued jobs (resuming interrupted ones) until none is left")
+    run.add_argument("--parallel", type=int, default=1)
+    status = sub.add_parser("status", help="job counts and recent jobs")
+    status.add_argument("--status", help="only jobs with this status")
+    status.add_argument("--limit", type=int, default=20)
+    retry = sub.add_parser("retry", help="queue failed jobs again")
+    retry.add_argument("ids", type=int, nargs="*", help="job ids (default: every failed job)")
+    args = parser.parse_args()
+
+    queue = JobQueue()
+    if args.command == "enqueue":
+        ids = queue.enqueue(range(args.first, args.last + 1), args.explorer,
+                            synthesize=args.synthesize, commit=args.commit, stream=args.stream)
+        print(f"Queued {len(ids)} jobs ({args.last - args.first + 1 - len(ids)} already pending)")
+    elif args.command == "work":
+        start = time.monotonic()
+        done, failed = run_workers(queue, args.parallel)
+        print(f"\n{done} jobs done, {failed} failed in {time.monotonic() - start:.1f}s")
+        sys.exit(1 if failed else 0)
+    elif args.command == "status":
+        counts = queue.counts()
+        print("  ".join(f"{s}: {counts.get(s, 0)}" for s in ("queued", "running", "done", "failed")))
+        for job in queue.jobs(args.status, args.limit):
+            steps = queue.checkpoint_names(job["id"])
+            last = steps[-1] if steps else "-"
+            print(f"{job['id']:>6}  cycle {job['cycle']!s:<5} {job['explorer']:<9} {job['status']:<8} "
+                  f"try {job['attempts']}  last step {last:<14} {job['error'] or job['result'] or ''}")
+    else:
+        print(f"Requeued {queue.retry(args.ids)} jobs")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+LLM RESPONSE CACHE
+Content-addressed on-disk cache for chat completions
+- Key: sha256 of the full request (endpoint, model, messages, max_tokens, temperature...)
+- Eviction: entries written more than max age ago, then least-recently-used
+  past max size (mtime = when written, atime = when last read)
+- Per-call bypass, global off switch (LLM_CACHE=off), hit/miss counters
+Re-running a crashed cycle replays finished calls for free.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from config.api_config import (
+    LLM_CACHE_DIR,
+    LLM_CACHE_MAX_BYTES,
+    LLM_CACHE_MAX_AGE_DAYS,
+    LLM_CACHE_ENABLED
+)
+
+# Request fields that don't change what the model returns
+UNKEYED_FIELDS = ("timeout", "extra_headers")
+
+# Run an eviction sweep after this many stores
+EVICT_EVERY = 50
+
+class ResponseCache:
+    """Directory of <sha256>.json files, fanned out by the first two hex chars"""
+
+    def __init__(self, cache_dir=LLM_CACHE_DIR, max_bytes=LLM_CACHE_MAX_BYTES,
+                 max_age_days=LLM_CACHE_MAX_AGE_DAYS, enabled=LLM_CACHE_ENABLED):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def key(self, request):
+        """Stable hash of a request dict"""
+        keyed = {k: v for k, v in request.items() if k not in UNKEYED_FIELDS}
+        blob = json.dumps(keyed, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """Return the cached response dict, or None"""
+        path = self._path(key)
+        try:
+            written = path.stat().st_mtime
+            if time.time() - written > self.max_age:
+                path.unlink()
+                raise FileNotFoundError
+            with open(path, 'r') as f:
+                data = json.load(f)
+            # atime is the last-used time for LRU; mtime stays the write time
+            os.utime(path, (time.time(), written))
+        except (FileNotFoundError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """Store a response dict (atomic write)"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+        with self._lock:
+            self.stores += 1
+            sweep = self.stores % EVICT_EVERY == 0
+        if sweep:
+            self.evict()
+
+    def evict(self):
+        """Drop entries written more than max_age ago, then the least recently
+        used until under max_bytes"""
+        now = time.time()
+        entries = []
+        evicted = 0
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - st.st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+                evicted += 1
+            else:
+                entries.append((max(st.st_atime, st.st_mtime), st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self.evictions += evicted
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions
+        }
+
+_default_cache = None
+
+def default_cache():
+    """Process-wide cache shared by every caller"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResponseCache()
+    return _default_cache
+
+def _request_for(client, request, cache_salt):
+    keyed = dict(request, base_url=str(client.base_url))
+    if cache_salt is not None:
+        keyed["cache_salt"] = cache_salt
+    return keyed
+
+def cache_lookup(client, request, bypass_cache=False, cache_salt=None, cache=None):
+    """
+    Returns (key, cached ChatCompletion or None). key is None when the
+    cache is bypassed, so the caller knows not to store the response.
+    """
+    cache = cache or default_cache()
+    if bypass_cache or not cache.enabled:
+        return None, None
+
+    key = cache.key(_request_for(client, request, cache_salt))
+    data = cache.get(key)
+    if data is None:
+        return key, None
+
+    from openai.types.chat import ChatCompletion
+    return key, ChatCompletion.model_validate(data)
+
+def cache_store(key, response, cache=None):
+    """Store a fresh response under a key from cache_lookup"""
+    if key is not None:
+        (cache or default_cache()).put(key, response.model_dump())
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+if __name__ == "__main__":
+    cache = default_cache()
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+
+    if command == "evict":
+        cache.evict()
+        print(f"Evicted {cache.evictions} entries")
+    elif command == "stats":
+        files = list(cache.cache_dir.glob("*/*.json"))
+        size = sum(p.stat().st_size for p in files)
+        print(f"Cache: {cache.cache_dir}")
+        print(f"Entries: {len(files)}")
+        print(f"Size: {size / 1024 / 1024:.1f} MB / {cache.max_bytes / 1024 / 1024:.0f} MB")
+    else:
+        print("Usage: python3 llm_cache.py [stats|evict]")
+        sys.exit(1)
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+SHARED LLM CLIENT LAYER
+One pooled, keep-alive HTTP client per provider for the whole process
+- Sync (OpenAI) and async (AsyncOpenAI) facades built on config/api_config.py
+- HTTP/2 when the h2 package is installed
+- One place for chat.completions.create + cache + rate limit + retry/hedge
+  + error handling
+- Streaming variant with reasoning/content split and early termination
+- Every completion is logged to the run store against the active run,
+  and to the metrics file with its tokens, timing and retries (telemetry.py)
+- Under an active cassette (cassette.py) completions are taped, or
+  replayed without touching the network
+"""
+
+import os
+import sys
+import time
+import threading
+import weakref
+import asyncio
+import importlib.util
+
+import httpx
+from openai import OpenAI, AsyncOpenAI, OpenAIError, RateLimitError
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from config.api_config import (
+    DEEPSEEK_API_KEY,
+    DEEPSEEK_BASE_URL,
+    OPENROUTER_API_KEY,
+    OPENROUTER_BASE_URL,
+    LLM_POOL_MAX_CONNECTIONS,
+    LLM_POOL_MAX_KEEPALIVE,
+    LLM_POOL_KEEPALIVE_EXPIRY,
+    LLM_HTTP2,
+    LLM_TIMEOUT
+)
+from llm_cache import cache_lookup, cache_store
+from rate_limiter import get_rate_limiter, estimate_tokens, retry_after_seconds
+from request_policy import default_policy
+from run_store import record_call
+from telemetry import measure
+from cassette import active_cassette, request_key
+
+PROVIDERS = {
+    "deepseek": {"api_key": DEEPSEEK_API_KEY, "base_url": DEEPSEEK_BASE_URL},
+    "openrouter": {"api_key": OPENROUTER_API_KEY, "base_url": OPENROUTER_BASE_URL},
+}
+
+class LLMError(Exception):
+    """A chat completion failed (network, HTTP status or provider error)"""
+
+# ============================================================================
+# POOLED CLIENTS
+# ============================================================================
+
+def http2_enabled():
+    """HTTP/2 on when configured, or when 'auto' and h2 is importable"""
+    if LLM_HTTP2 == "auto":
+        return importlib.util.find_spec("h2") is not None
+    return LLM_HTTP2 in ("on", "1", "true")
+
+def pool_limits():
+    return httpx.Limits(
+        max_connections=LLM_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_POOL_MAX_KEEPALIVE,
+        keepalive_expiry=LLM_POOL_KEEPALIVE_EXPIRY
+    )
+
+def _provider(provider):
+    try:
+        return PROVIDERS[provider]
+    except KeyError:
+        raise ValueError(f"Unknown provider {provider!r} (expected one of {', '.join(PROVIDERS)})")
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_client(provider="deepseek"):
+    """Process-wide OpenAI client for a provider, created on first use"""
+    with _clients_lock:
+        if provider not in _clients:
+            settings = _provider(provider)
+            _clients[provider] = OpenAI(
+                api_key=settings["api_key"],
+                base_url=settings["base_url"],
+                timeout=LLM_TIMEOUT,
+                max_retries=0,  # request_policy owns retries
+                http_client=httpx.Client(
+                    limits=pool_limits(),
+                    http2=http2_enabled(),
+                    timeout=LLM_TIMEOUT
+                )
+            )
+        return _clients[provider]
+
+# httpx.AsyncClient connections belong to the event loop that opened them,
+# so async clients are pooled per loop
+_async_clients = weakref.WeakKeyDictionary()
+
+def get_async_client(provider="deepseek"):
+    """AsyncOpenAI client for a provider, shared within the running event loop"""
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    if provider not in clients:
+        settings = _provider(provider)
+        clients[provider] = AsyncOpenAI(
+            api_key=settings["api_key"],
+            base_url=settings["base_url"],
+            timeout=LLM_TIMEOUT,
+            max_retries=0,  # request_policy owns retries
+            http_client=httpx.AsyncClient(
+                limits=pool_limits(),
+                http2=http2_enabled(),
+                timeout=LLM_TIMEOUT
+            )
+        )
+    return clients[provider]
+
+def close_clients():
+    """Close every pooled sync client (call at process exit if you care)"""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+# ============================================================================
+# COMPLETIONS
+# ============================================================================
+
+def _used_tokens(response):
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+def _settle(limiter, reserved, start, response=None, error=None):
+    """Report a finished call to the limiter; returns the error to raise, if any"""
+    if error is None:
+        limiter.release(
+            reserved,
+            used_tokens=_used_tokens(response),
+            latency=time.monotonic() - start
+        )
+        return None
+    if isinstance(error, RateLimitError):
+        limiter.release(reserved, outcome="throttled", retry_after=retry_after_seconds(error))
+    else:
+        limiter.release(reserved, outcome="error")
+    return LLMError(f"{type(error).__name__}: {error}")
+
+def _latency_key(provider, request):
+    return (provider, request.get("model"), request.get("max_tokens"))
+
+def _send(provider, client, request):
+    """One attempt: limiter admission, the call, limiter feedback"""
+    limiter = get_rate_limiter(provider)
+    reserved = estimate_tokens(request)
+    limiter.acquire(reserved)
+    start = time.monotonic()
+    try:
+        response = client.chat.completions.create(**request)
+    except OpenAIError as e:
+        raise _settle(limiter, reserved, start, error=e) from e
+    except BaseException:
+        limiter.release(reserved, outcome="error")
+        raise
+    _settle(limiter, reserved, start, response=response)
+    return response
+
+async def _asend(provider, client, request):
+    """Async twin of _send"""
+    limiter = get_rate_limiter(provider)
+    reserved = estimate_tokens(request)
+    await limiter.acquire_async(reserved)
+    start = time.monotonic()
+    try:
+        response = await client.chat.completions.create(**request)
+    except OpenAIError as e:
+        raise _settle(limiter, reserved, start, error=e) from e
+    except asyncio.CancelledError:
+        # A losing hedge or speculative branch: the request went out and is
+        # billed, so its reservation stays spent
+        limiter.release(reserved, outcome="cancelled")
+        raise
+    except BaseException:
+        limiter.release(reserved, outcome="error")
+        raise
+    _settle(limiter, reserved, start, response=response)
+    return response
+
+def _record(call, usage, cache_hit=False, stopped_early=False):
+    """Close the call's metrics and log it to the run store"""
+    latency = call.finish(usage, cache_hit, stopped_early)
+    record_call(call.provider, call.model, latency, usage, cache_hit=cache_hit)
+
+def _chat_completion(provider, client, bypass_cache, cache_salt, hedge, request):
+    client = client or get_client(provider)
+    with measure(provider, request.get("model")) as call:
+        key, response = cache_lookup(client, request, bypass_cache, cache_salt)
+        if response is not None:
+            _record(call, response.usage, cache_hit=True)
+            return response
+
+        response = default_policy().run(
+            lambda: _send(provider, client, request),
+            _latency_key(provider, request),
+            hedge=hedge
+        )
+
+        cache_store(key, response)
+        _record(call, response.usage)
+        return response
+
+async def _achat_completion(provider, client, bypass_cache, cache_salt, hedge, request):
+    client = client or get_async_client(provider)
+    with measure(provider, request.get("model")) as call:
+        key, response = cache_lookup(client, request, bypass_cache, cache_salt)
+        if response is not None:
+            _record(call, response.usage, cache_hit=True)
+            return response
+
+        response = await default_policy().run_async(
+            lambda: _asend(provider, client, request),
+            _latency_key(provider, request),
+            hedge=hedge
+        )
+
+        cache_store(key, response)
+        _record(call, response.usage)
+        return response
+
+def _taped(cassette, provider, request, stream, cache_salt):
+    """
+    (tape, recorded entry). Replaying: tape is None and the entry is the
+    recorded call (a recorded failure is raised). Recording: the entry is
+    None and tape=(seq, key) goes back to cassette.record once the call ends.
+    """
+    key = request_key(provider, request, stream, cache_salt)
+    if not cassette.replaying:
+        return (cassette.begin(), key), None
+    entry = cassette.replay(key, request)
+    if entry["error"] is not None:
+        raise LLMError(entry["error"])
+    return None, entry
+
+def _replayed(provider, request, entry):
+    """The recorded completion, logged to the run store like a zero-latency call"""
+    from openai.types.chat import ChatCompletion
+    response = ChatCompletion.model_validate(entry["response"])
+    record_call(provider, request.get("model"), 0.0, response.usage)
+    return response
+
+def chat_completion(provider="deepseek", client=None, bypass_cache=False,
+                    cache_salt=None, hedge=None, **request):
+    """
+    client.chat.completions.create(**request) on the pooled client:
+    cache first, then retries/hedging around rate-limited attempts.
+    hedge=True/False overrides LLM_HEDGE for this call.
+    Any failure is raised as LLMError.
+    """
+    cassette = active_cassette()
+    if cassette is None:
+        return _chat_completion(provider, client, bypass_cache, cache_salt, hedge, request)
+    tape, entry = _taped(cassette, provider, request, False, cache_salt)
+    if entry is not None:
+        return _replayed(provider, request, entry)
+    try:
+        response = _chat_completion(provider, client, bypass_cache, cache_salt, hedge, request)
+    except LLMError as e:
+        cassette.record(*tape, provider, request, error=str(e))
+        raise
+    cassette.record(*tape, provider, request, response=response.model_dump())
+    return response
+
+async def achat_completion(provider="deepseek", client=None, bypass_cache=False,
+                           cache_salt=None, hedge=None, **request):
+    """Async twin of chat_completion"""
+    cassette = active_cassette()
+    if cassette is None:
+        return await _achat_completion(provider, client, bypass_cache, cache_salt, hedge, request)
+    tape, entry = _taped(cassette, provider, request, False, cache_salt)
+    if entry is not None:
+        return _replayed(provider, request, entry)
+    try:
+        response = await _achat_completion(provider, client, bypass_cache, cache_salt, hedge, request)
+    except LLMError as e:
+        cassette.record(*tape, provider, request, error=str(e))
+        raise
+    cassette.record(*tape, provider, request, response=response.model_dump())
+    return response
+
+def message_parts(response):
+    """(reasoning, content) from a completion; reasoning is None for non-R1 models"""
+    message = response.choices[0].message
+    return getattr(message, 'reasoning', None), message.content
+
+# ============================================================================
+# STREAMING
+# ============================================================================
+
+def _delta_parts(chunk):
+    """(reasoning, content) text of one stream chunk"""
+    if not chunk.choices:
+        return None, None
+    delta = chunk.choices[0].delta
+    reasoning = getattr(delta, "reasoning", None) or getattr(delta, "reasoning_content", None)
+    return reasoning, delta.content
+
+def _as_completion(request, reasoning, content, usage):
+    """Rebuild a ChatCompletion from a finished stream so it can be cached"""
+    from openai.types.chat import ChatCompletion
+    return ChatCompletion.model_validate({
+        "id": "stream",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.get("model", ""),
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": content, "reasoning": reasoning}
+        }],
+        "usage": usage.model_dump() if usage is not None else None
+    })
+
+def _stream_completion(provider, client, on_delta, stop_when, bypass_cache, cache_salt, request):
+    client = client or get_client(provider)
+    with measure(provider, request.get("model"), stream=True) as call:
+        key, cached = cache_lookup(client, request, bypass_cache, cache_salt)
+        if cached is not None:
+            _record(call, cached.usage, cache_hit=True)
+            reasoning, content = message_parts(cached)
+            if on_delta:
+                if reasoning:
+                    on_delta("reasoning", reasoning)
+                on_delta("content", content or "")
+            return {"reasoning": reasoning, "content": content or "",
+                    "stopped_early": False, "usage": cached.usage}
+
+        limiter = get_rate_limiter(provider)
+        reserved = estimate_tokens(request)
+        started = {}
+
+        def _open():
+            limiter.acquire(reserved)
+            started["at"] = time.monotonic()
+            try:
+                return client.chat.completions.create(
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    **request
+                )
+            except OpenAIError as e:
+                raise _settle(limiter, reserved, started["at"], error=e) from e
+            except BaseException:
+                limiter.release(reserved, outcome="error")
+                raise
+
+        stream = default_policy().run(_open, _latency_key(provider, request), hedge=False)
+
+        reasoning_parts = []
+        content = ""
+        usage = None
+        stopped_early = False
+        try:
+            for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    usage = chunk.usage
+                reasoning, text = _delta_parts(chunk)
+                if reasoning or text:
+                    call.first_token()
+                if reasoning:
+                    reasoning_parts.append(reasoning)
+                    if on_delta:
+                        on_delta("reasoning", reasoning)
+                if text:
+                    content += text
+                    if on_delta:
+                        on_delta("content", text)
+                    if stop_when and stop_when(content):
+                        stopped_early = True
+                        break
+        except (OpenAIError, httpx.HTTPError) as e:
+            raise _settle(limiter, reserved, started["at"], error=e) from e
+        except BaseException:
+            # on_delta / stop_when failed (or we were interrupted): free the slot
+            limiter.release(reserved, outcome="error")
+            raise
+        finally:
+            stream.close()
+
+        limiter.release(
+            reserved,
+            used_tokens=getattr(usage, "total_tokens", None),
+            latency=time.monotonic() - started["at"]
+        )
+
+        _record(call, usage, stopped_early=stopped_early)
+
+        reasoning = "".join(reasoning_parts) or None
+        if not stopped_early:
+            cache_store(key, _as_completion(request, reasoning, content, usage))
+
+        return {"reasoning": reasoning, "content": content,
+                "stopped_early": stopped_early, "usage": usage}
+
+def stream_completion(provider="deepseek", client=None, on_delta=None, stop_when=None,
+                      bypass_cache=False, cache_salt=None, **request):
+    """
+    Streamed chat completion. on_delta(kind, text) gets every "reasoning"
+    and "content" delta as it arrives; the stream (and the provider's
+    generation) is closed as soon as stop_when(content_so_far) is true.
+    Only streams that ran to the end are cached. Opening the stream is
+    retried by the request policy; a stream that fails midway raises LLMError.
+    Returns {"reasoning", "content", "stopped_early", "usage"}.
+    """
+    cassette = active_cassette()
+    if cassette is None:
+        return _stream_completion(provider, client, on_delta, stop_when,
+                                  bypass_cache, cache_salt, request)
+    tape, entry = _taped(cassette, provider, request, True, cache_salt)
+    if entry is not None:
+        from openai.types import CompletionUsage
+        result = dict(entry["response"])
+        if result["usage"] is not None:
+            result["usage"] = CompletionUsage.model_validate(result["usage"])
+        record_call(provider, request.get("model"), 0.0, result["usage"])
+        if on_delta:
+            if result["reasoning"]:
+                on_delta("reasoning", result["reasoning"])
+            on_delta("content", result["content"])
+        return result
+    try:
+        result = _stream_completion(provider, client, on_delta, stop_when,
+                                    bypass_cache, cache_salt, request)
+    except LLMError as e:
+        cassette.record(*tape, provider, request, error=str(e))
+        raise
+    usage = result["usage"]
+    cassette.record(*tape, provider, request, response={
+        **result, "usage": usage.model_dump() if usage is not None else None
+    })
+    return result
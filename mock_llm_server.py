@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+MOCK LLM SERVER
+Local OpenAI-compatible stand-in for DeepSeek / OpenRouter, for running
+explorers and benchmarks without a key or network
+- POST .../chat/completions, plain or streamed (SSE, with include_usage)
+- Canned reasoning + content shaped like each explorer phase, so topic,
+  Phase 3 early stop, gauntlet and synthesis parsing all see real structure
+- Lognormal latency, configurable 5xx and 429 (Retry-After) rates
+- Simulated provider prompt cache: a repeated message prefix is reported
+  as cached_tokens
+Answers are deterministic per (seed, request body, times that body was
+seen), so re-asking the same prompt - like topic generation - varies.
+Point the clients at it with DEEPSEEK_BASE_URL / OPENROUTER_BASE_URL.
+"""
+
+import re
+import sys
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+@dataclass
+class MockConfig:
+    latency: float = 0.5          # median seconds per completion
+    latency_sigma: float = 0.5    # lognormal spread (0 = always the median)
+    ttft_fraction: float = 0.3    # share of a streamed call spent before the first token
+    error_rate: float = 0.0       # share of calls answered 500
+    rate_limit_rate: float = 0.0  # share of calls answered 429
+    retry_after: float = 1.0      # Retry-After on 429s (seconds)
+    reasoning_words: int = 120    # reasoning length per answer
+    chunk_words: int = 8          # words per streamed chunk
+    seed: int = 0
+
+# Vocabulary for canned text; includes the markers synthesis looks for
+WORDS = (
+    "boundary verification calibration consensus measurement authority circular "
+    "spiral loop wall topology landscape instrument standard definition trust "
+    "evidence observer record archive derivation axiom inference reference "
+    "membrane fractal regress sediment lattice signal noise frame lens edge"
+).split()
+
+# Simulated provider prompt cache: message-prefix digests seen recently
+PREFIX_CACHE_SIZE = 10000
+CACHE_BLOCK_TOKENS = 64
+
+def estimate_tokens(text):
+    return len(text) // 4 + 1
+
+def classify(messages):
+    """Which explorer call this is, from its prompt text"""
+    last = messages[-1]["content"] if messages else ""
+    everything = "\n".join(m.get("content") or "" for m in messages)
+    if "Generate ONE" in last:
+        return "topic"
+    if "PHASE 3: GENERATE FROM THE EDGE" in last:
+        return "phase_3"
+    if "DO NOT proceed to Phase 3" in everything:
+        return "phase_1_2"
+    if "EVOLVED idea" in everything:
+        return "reflection"
+    if "translate this into plain" in everything:
+        return "translation"
+    return "explore"
+
+def _sentence(rng, low=8, high=16):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(low, high))]
+    return " ".join(words).capitalize() + "."
+
+def _paragraph(rng, sentences=4):
+    return " ".join(_sentence(rng) for _ in range(sentences))
+
+def canned_content(kind, rng):
+    if kind == "topic":
+        return f"The {rng.choice(WORDS)} of {rng.choice(WORDS)} sets the {rng.choice(WORDS)} standard. {_sentence(rng)}"
+    if kind == "phase_1_2":
+        paths = "\n\n".join(
+            f"**PATH {letter}:** {_paragraph(rng, 3)}" for letter in "ABCDE"
+        )
+        return (f"## PHASE 1: REACH THE BOUNDARY\n\n{paths}\n\n"
+                f"## PHASE 2: UNDERSTAND THE SPIRAL\n\n{_paragraph(rng, 5)}\n\n"
+                f"The boundary is circular: every path bottoms out in authority.\n")
+    if kind == "phase_3":
+        return (f"## PHASE 3: GENERATE FROM THE EDGE (Initial Idea)\n\n"
+                f"{_paragraph(rng, 3)}\n\n{_paragraph(rng, 4)}\n")
+    if kind == "reflection":
+        return _paragraph(rng, rng.randint(2, 4))
+    if kind == "translation":
+        return _paragraph(rng, 2)
+    return (f"What did you start trying to verify?\n{_sentence(rng)}\n\n"
+            f"PATH A led to an authority wall. PATH B hit a hard calibration loop.\n\n"
+            f"{_paragraph(rng, 6)}\n\n"
+            f"Where did you hit the wall?\n{_paragraph(rng, 3)} I could not route around it.\n\n"
+            f"What does this wall feel like?\nCircular. {_paragraph(rng, 3)}\n")
+
+class MockBackend:
+    """Response generation and fault injection, shared by all handler threads"""
+
+    def __init__(self, config):
+        self.config = config
+        self.calls = 0
+        self.faults = 0
+        self._prefixes = OrderedDict()
+        self._repeats = Counter()
+        self._lock = threading.Lock()
+
+    def rng_for(self, body):
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            repeat = self._repeats[digest]
+            self._repeats[digest] += 1
+        return random.Random(f"{self.config.seed}:{digest}:{repeat}")
+
+    def latency(self, rng):
+        if self.config.latency_sigma <= 0:
+            return self.config.latency
+        return rng.lognormvariate(math.log(max(self.config.latency, 1e-6)),
+                                  self.config.latency_sigma)
+
+    def fault(self, rng):
+        """(status, retry_after) to fail this call with, or None"""
+        roll = rng.random()
+        if roll < self.config.rate_limit_rate:
+            return 429, self.config.retry_after
+        if roll < self.config.rate_limit_rate + self.config.error_rate:
+            return 500, None
+        return None
+
+    def cached_tokens(self, messages):
+        """Tokens of the message prefix a previous call already sent"""
+        if len(messages) < 2:
+            return 0
+        prefix = json.dumps(messages[:-1], sort_keys=True).encode("utf-8")
+        digest = hashlib.sha256(prefix).digest()
+        with self._lock:
+            seen = digest in self._prefixes
+            self._prefixes[digest] = True
+            self._prefixes.move_to_end(digest)
+            if len(self._prefixes) > PREFIX_CACHE_SIZE:
+                self._prefixes.popitem(last=False)
+        if not seen:
+            return 0
+        tokens = sum(estimate_tokens(m.get("content") or "") for m in messages[:-1])
+        return tokens // CACHE_BLOCK_TOKENS * CACHE_BLOCK_TOKENS
+
+    def answer(self, request, rng):
+        """(reasoning, content, usage dict)"""
+        messages = request.get("messages", [])
+        kind = classify(messages)
+        reasoning = " ".join(rng.choice(WORDS) for _ in range(self.config.reasoning_words))
+        content = canned_content(kind, rng)
+        prompt_tokens = sum(estimate_tokens(m.get("content") or "") for m in messages)
+        reasoning_tokens = estimate_tokens(reasoning)
+        completion_tokens = reasoning_tokens + estimate_tokens(content)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": self.cached_tokens(messages)},
+            "completion_tokens_details": {"reasoning_tokens": reasoning_tokens}
+        }
+        return reasoning, content, usage
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; with Nagle on, keep-alive
+    # requests stall ~40ms on the client's delayed ACK
+    disable_nagle_algorithm = True
+    backend = None  # set per server class in MockLLMServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def _json(self, status, payload, headers=()):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._json(200, {"object": "list", "data": [{"id": "mock", "object": "model"}]})
+        else:
+            self._json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+            return
+        try:
+            request = json.loads(body)
+        except ValueError:
+            self._json(400, {"error": {"message": "invalid JSON", "type": "invalid_request_error"}})
+            return
+
+        backend = self.backend
+        rng = backend.rng_for(body)
+        with backend._lock:
+            backend.calls += 1
+        latency = backend.latency(rng)
+
+        fault = backend.fault(rng)
+        if fault:
+            status, retry_after = fault
+            with backend._lock:
+                backend.faults += 1
+            time.sleep(latency * backend.config.ttft_fraction)
+            headers = [("Retry-After", f"{retry_after:g}")] if retry_after else []
+            kind = "rate_limit_exceeded" if status == 429 else "server_error"
+            self._json(status, {"error": {"message": f"mock {kind}", "type": kind}}, headers)
+            return
+
+        reasoning, content, usage = backend.answer(request, rng)
+        model = request.get("model", "mock")
+        if request.get("stream"):
+            self._stream(model, reasoning, content, usage, latency,
+                         (request.get("stream_options") or {}).get("include_usage"))
+            return
+
+        time.sleep(latency)
+        self._json(200, {
+            "id": f"mock-{rng.getrandbits(48):x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content,
+                            "reasoning": reasoning, "reasoning_content": reasoning}
+            }],
+            "usage": usage
+        })
+
+    def _stream(self, model, reasoning, content, usage, latency, include_usage):
+        config = self.backend.config
+        pieces = ([("reasoning", text) for text in _chunks(reasoning, config.chunk_words)] +
+                  [("content", text) for text in _chunks(content, config.chunk_words)])
+        gap = latency * (1 - config.ttft_fraction) / max(len(pieces), 1)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def event(payload):
+            self.wfile.write(f"data: {payload}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        def chunk(delta):
+            return json.dumps({
+                "id": "mock-stream", "object": "chat.completion.chunk",
+                "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": None}]
+            })
+
+        try:
+            time.sleep(latency * config.ttft_fraction)
+            for field, text in pieces:
+                if field == "reasoning":
+                    event(chunk({"reasoning": text, "reasoning_content": text}))
+                else:
+                    event(chunk({"content": text}))
+                time.sleep(gap)
+            if include_usage:
+                event(json.dumps({
+                    "id": "mock-stream", "object": "chat.completion.chunk",
+                    "created": int(time.time()), "model": model,
+                    "choices": [], "usage": usage
+                }))
+            event("[DONE]")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client stopped early (stop_when) and closed the stream
+            pass
+
+WORD_WITH_SPACE = re.compile(r"\s*\S+\s*?(?=\s|$)|\s+$")
+
+def _chunks(text, size):
+    """Stream pieces of `size` words that concatenate back to text exactly"""
+    words = WORD_WITH_SPACE.findall(text)
+    return ["".join(words[i:i + size]) for i in range(0, len(words), size)]
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # 64 concurrent cycles open a burst of connections at start-up
+    request_queue_size = 256
+
+class MockLLMServer:
+    """The mock on a background thread; use as a context manager"""
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.backend = MockBackend(config or MockConfig())
+        handler = type("BoundMockHandler", (MockHandler,), {"backend": self.backend})
+        self.httpd = _HTTPServer((host, port), handler)
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True,
+                                       name="mock-llm")
+        self.thread.start()
+        return self.url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def add_config_arguments(parser):
+    """MockConfig fields as --flags (shared with benchmark.py)"""
+    defaults = MockConfig()
+    parser.add_argument("--latency", type=float, default=defaults.latency,
+                        help="median seconds per completion")
+    parser.add_argument("--latency-sigma", type=float, default=defaults.latency_sigma,
+                        help="lognormal spread of latency (0 = fixed)")
+    parser.add_argument("--ttft-fraction", type=float, default=defaults.ttft_fraction)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate,
+                        help="share of calls failing with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=defaults.rate_limit_rate,
+                        help="share of calls failing with 429")
+    parser.add_argument("--retry-after", type=float, default=defaults.retry_after)
+    parser.add_argument("--reasoning-words", type=int, default=defaults.reasoning_words)
+    parser.add_argument("--chunk-words", type=int, default=defaults.chunk_words)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+def config_from_args(args):
+    return MockConfig(
+        latency=args.latency,
+        latency_sigma=args.latency_sigma,
+        ttft_fraction=args.ttft_fraction,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        reasoning_words=args.reasoning_words,
+        chunk_words=args.chunk_words,
+        seed=args.seed
+    )
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI-compatible mock LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockLLMServer(config_from_args(args), args.host, args.port)
+    print(f"Mock LLM server on {server.url}")
+    print(f"  export DEEPSEEK_BASE_URL={server.url} OPENROUTER_BASE_URL={server.url} "
+          f"OPENROUTER_API_KEY=mock")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+    sys.exit(0)
@@ -8,12 +8,11 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from openai import OpenAI
 import json
 from datetime import datetime
+from llm_client import chat_completion, message_parts
+from run_store import start_run
 from config.api_config import (
-    DEEPSEEK_API_KEY, 
-    DEEPSEEK_BASE_URL, 
     MODEL,
     MAX_TOKENS,
     TEMPERATURE,
@@ -83,12 +82,6 @@ def run_explorer(explorer_id=1, temperature=None):
     # Use custom temperature or default
     temp = temperature if temperature is not None else TEMPERATURE
     
-    # Initialize client
-    client = OpenAI(
-        api_key=DEEPSEEK_API_KEY,
-        base_url=DEEPSEEK_BASE_URL
-    )
-    
     print(f"🚀 Launching Explorer #{explorer_id} (DeepSeek R1)...")
     print("   Model: " + MODEL)
     print("   Prompt: Unified exploration + spiral")
@@ -99,10 +92,13 @@ def run_explorer(explorer_id=1, temperature=None):
     print("-"*70 + "\n")
     
     start_time = datetime.now()
+    run = start_run("unified", explorer_id, model=MODEL)
     
     try:
         # Call R1
-        response = client.chat.completions.create(
+        response = chat_completion(
+            "deepseek",
+            bypass_cache=True,  # every run is a new sample
             model=MODEL,
             messages=[
                 {"role": "user", "content": EXPLORER_PROMPT_UNIFIED}
@@ -116,11 +112,8 @@ def run_explorer(explorer_id=1, temperature=None):
         elapsed = (end_time - start_time).total_seconds()
         
         # Extract response
-        message = response.choices[0].message
-        
         # R1 provides reasoning (thinking) and content (output)
-        reasoning = getattr(message, 'reasoning', None)
-        output = message.content
+        reasoning, output = message_parts(response)
         
         # Save results
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -166,6 +159,8 @@ def run_explorer(explorer_id=1, temperature=None):
             f.write("\n\n")
             f.write("="*70 + "\n")
         
+        run.finish(file=txt_path, reasoning=reasoning, output=output, elapsed=elapsed)
+        
         # Print results
         print("\n" + "="*70)
         print(f"✅ EXPLORER #{explorer_id} COMPLETE")
@@ -198,6 +193,7 @@ def run_explorer(explorer_id=1, temperature=None):
         return result
         
     except Exception as e:
+        run.finish(status="error")
         print(f"\n❌ ERROR: {e}")
         print("\nTroubleshooting:")
         print("- Check API key is correct")
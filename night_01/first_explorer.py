@@ -8,12 +8,10 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from openai import OpenAI
 import json
 from datetime import datetime
+from llm_client import chat_completion, message_parts
 from config.api_config import (
-    DEEPSEEK_API_KEY, 
-    DEEPSEEK_BASE_URL, 
     MODEL,
     MAX_TOKENS,
     TEMPERATURE,
@@ -80,12 +78,6 @@ def run_explorer():
     print("CURIOUS CLAUDE - NIGHT 1: FIRST EXPLORER TEST")
     print("="*70 + "\n")
     
-    # Initialize client
-    client = OpenAI(
-        api_key=DEEPSEEK_API_KEY,
-        base_url=DEEPSEEK_BASE_URL
-    )
-    
     print("🚀 Launching Explorer #1 (DeepSeek R1)...")
     print("   Model: " + MODEL)
     print("   Prompt: Non-performative epistemic spiral")
@@ -98,7 +90,9 @@ def run_explorer():
     
     try:
         # Call R1
-        response = client.chat.completions.create(
+        response = chat_completion(
+            "deepseek",
+            bypass_cache=True,  # every run is a new sample
             model=MODEL,
             messages=[
                 {"role": "user", "content": EXPLORER_PROMPT}
@@ -112,11 +106,8 @@ def run_explorer():
         elapsed = (end_time - start_time).total_seconds()
         
         # Extract response
-        message = response.choices[0].message
-        
         # R1 provides reasoning (thinking) and content (output)
-        reasoning = getattr(message, 'reasoning', None)
-        output = message.content
+        reasoning, output = message_parts(response)
         
         # Save results
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
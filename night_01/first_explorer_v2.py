@@ -8,12 +8,10 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from openai import OpenAI
 import json
 from datetime import datetime
+from llm_client import chat_completion, message_parts
 from config.api_config import (
-    DEEPSEEK_API_KEY, 
-    DEEPSEEK_BASE_URL, 
     MODEL,
     MAX_TOKENS,
     TEMPERATURE,
@@ -89,12 +87,6 @@ def run_explorer(explorer_id=1, temperature=None):
     # Use custom temperature or default
     temp = temperature if temperature is not None else TEMPERATURE
     
-    # Initialize client
-    client = OpenAI(
-        api_key=DEEPSEEK_API_KEY,
-        base_url=DEEPSEEK_BASE_URL
-    )
-    
     print(f"🚀 Launching Explorer #{explorer_id} (DeepSeek R1)...")
     print("   Model: " + MODEL)
     print("   Prompt: Diversity incentive + epistemic spiral")
@@ -108,7 +100,9 @@ def run_explorer(explorer_id=1, temperature=None):
     
     try:
         # Call R1
-        response = client.chat.completions.create(
+        response = chat_completion(
+            "deepseek",
+            bypass_cache=True,  # every run is a new sample
             model=MODEL,
             messages=[
                 {"role": "user", "content": EXPLORER_PROMPT_V2}
@@ -122,11 +116,8 @@ def run_explorer(explorer_id=1, temperature=None):
         elapsed = (end_time - start_time).total_seconds()
         
         # Extract response
-        message = response.choices[0].message
-        
         # R1 provides reasoning (thinking) and content (output)
-        reasoning = getattr(message, 'reasoning', None)
-        output = message.content
+        reasoning, output = message_parts(response)
         
         # Save results
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -5,17 +5,14 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from openai import OpenAI
-from config.api_config import DEEPSEEK_API_KEY, DEEPSEEK_BASE_URL, MODEL
+from config.api_config import DEEPSEEK_BASE_URL, MODEL
+from llm_client import get_client
 
 print("Testing API connection...")
 print(f"Base URL: {DEEPSEEK_BASE_URL}")
 print(f"Model: {MODEL}\n")
 
-client = OpenAI(
-    api_key=DEEPSEEK_API_KEY,
-    base_url=DEEPSEEK_BASE_URL
-)
+client = get_client("deepseek")
 
 try:
     response = client.chat.completions.create(
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+NOISE SCHEDULER
+Spends gauntlet calls on the NOISE_OPERATIONS that actually move ideas
+- Reward for one reflection: how far the idea moved (similarity.novelty)
+  per completion token the call spent, reasoning tokens included - so a
+  near-copy, or a small change bought with a long chain of thought,
+  earns little
+- Every prompt is a Beta(1 + reward, 1 + pulls - reward) arm and an
+  operation pools its prompts; pick() Thompson-samples the operations,
+  then one prompt within each
+- Stats live in the run store (noise_stats), so each cycle starts from
+  everything earlier cycles learned; without a store they last for the
+  process. NOISE_SCHEDULER=uniform brings back uniform picks.
+A scheduler is loaded once per cycle and learns from its own chain on
+top of that snapshot, so concurrent cycles (and cassette replays) pick
+the same way however their calls interleave. The reflections it learns
+from skip the response cache, so a rerun can't credit one answer twice.
+
+    python3 noise_scheduler.py stats
+    python3 noise_scheduler.py rebuild    # relearn from stored gauntlet iterations
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from config.api_config import NOISE_SCHEDULER
+from similarity import tokenize, novelty
+from run_store import RunStore, default_store
+
+# The reward is novelty per this many completion tokens, capped at 1.0
+# (so it fits a Beta arm); R1 reflections spend several hundred
+REWARD_TOKENS = 100
+
+# Token estimate for answers without recorded usage (older iterations)
+TOKENS_PER_WORD = 1.3
+
+def perturbation_reward(before, after, tokens=None):
+    """Novelty of after vs before per REWARD_TOKENS completion tokens
+    (0.0 - 1.0); tokens is the call's usage.completion_tokens, estimated
+    from the answer when unknown"""
+    if tokens is None:
+        tokens = len(tokenize(after)) * TOKENS_PER_WORD
+    if not tokens:
+        return 0.0
+    return min(1.0, novelty(before, after) * REWARD_TOKENS / tokens)
+
+# Stats observed while RUN_STORE is off: {(operation, prompt): (pulls, reward)}
+_memory_stats = {}
+_memory_lock = threading.Lock()
+
+def _add(stats, arms, reward):
+    for arm in arms:
+        pulls, total = stats.get(arm, (0, 0.0))
+        stats[arm] = (pulls + 1, total + reward)
+
+class NoiseScheduler:
+    """Thompson sampling over noise operations and their prompts"""
+
+    def __init__(self, operations, stats=None, store=None):
+        self.operations = operations
+        self.stats = dict(stats or {})
+        self.store = store
+
+    def _draw(self, rng, pulls, reward):
+        return rng.betavariate(1 + reward, 1 + pulls - reward)
+
+    def pick(self, num_ops, rng=random):
+        """(noise_ops, perturbations): num_ops distinct operations, one prompt each"""
+        draws = []
+        for op, prompts in self.operations.items():
+            arms = [self.stats.get((op, prompt), (0, 0.0)) for prompt in prompts]
+            pulls = sum(p for p, _ in arms)
+            reward = sum(r for _, r in arms)
+            draws.append((self._draw(rng, pulls, reward), op))
+        draws.sort(key=lambda draw: draw[0], reverse=True)
+        noise_ops = [op for _, op in draws[:num_ops]]
+        perturbations = [
+            max(self.operations[op],
+                key=lambda prompt: self._draw(rng, *self.stats.get((op, prompt), (0, 0.0))))
+            for op in noise_ops
+        ]
+        return noise_ops, perturbations
+
+    def observe(self, noise_ops, perturbations, before, after, tokens=None):
+        """Credit one reflection (that cost `tokens` completion tokens) to every
+        perturbation it used; returns its reward"""
+        reward = perturbation_reward(before, after, tokens)
+        arms = list(zip(noise_ops, perturbations))
+        _add(self.stats, arms, reward)
+        if self.store:
+            self.store.record_noise(arms, reward)
+        else:
+            with _memory_lock:
+                _add(_memory_stats, arms, reward)
+        return reward
+
+def load_scheduler(operations):
+    """A scheduler for one cycle, seeded with every stat so far
+    (None when NOISE_SCHEDULER=uniform)"""
+    if NOISE_SCHEDULER != "bandit":
+        return None
+    store = default_store()
+    if store:
+        return NoiseScheduler(operations, store.noise_stats(), store)
+    with _memory_lock:
+        return NoiseScheduler(operations, _memory_stats)
+
+def rebuild(store):
+    """Recompute noise_stats from every stored gauntlet iteration; returns
+    how many iterations were credited"""
+    credited = 0
+    store.clear_noise_stats()
+    rows = store.connection().execute(
+        "SELECT noise_operations, perturbations, idea_before, idea_after, completion_tokens "
+        "FROM gauntlet_iterations WHERE noise_operations IS NOT NULL"
+    ).fetchall()
+    for row in rows:
+        before, after = row["idea_before"] or "", row["idea_after"] or ""
+        # A failed call kept the idea as it was (or left the error text)
+        if after == before or after.startswith("ERROR:"):
+            continue
+        arms = list(zip(json.loads(row["noise_operations"]), json.loads(row["perturbations"])))
+        store.record_noise(arms, perturbation_reward(before, after, row["completion_tokens"]))
+        credited += 1
+    return credited
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Noise operation statistics")
+    sub = parser.add_subparsers(dest="command", required=True)
+    stats = sub.add_parser("stats", help="mean reward per operation and prompt")
+    stats.add_argument("--prompts", action="store_true", help="also list each prompt")
+    sub.add_parser("rebuild", help="relearn the stats from stored gauntlet iterations")
+    args = parser.parse_args()
+
+    store = RunStore()
+    if args.command == "rebuild":
+        print(f"Credited {rebuild(store)} gauntlet iterations")
+        sys.exit(0)
+
+    by_op = {}
+    for (op, prompt), (pulls, reward) in store.noise_stats().items():
+        by_op.setdefault(op, []).append((prompt, pulls, reward))
+    if not by_op:
+        print("No noise stats yet")
+    ranked = sorted(by_op.items(), key=lambda item: -sum(r for _, _, r in item[1]) /
+                    max(sum(p for _, p, _ in item[1]), 1))
+    for op, arms in ranked:
+        pulls = sum(p for _, p, _ in arms)
+        reward = sum(r for _, _, r in arms)
+        print(f"{op:<24} {pulls:>6} pulls  mean {reward / max(pulls, 1):.3f}")
+        if args.prompts:
+            for prompt, p, r in sorted(arms, key=lambda arm: -arm[2] / max(arm[1], 1)):
+                print(f"    {p:>5}  {r / max(p, 1):.3f}  {prompt[:70]}")
@@ -8,19 +8,19 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from openai import OpenAI
 import json
-import subprocess
 from datetime import datetime
 from pathlib import Path
-from config.api_config import DEEPSEEK_API_KEY, DEEPSEEK_BASE_URL, MODEL, MAX_TOKENS
+from config.api_config import MODEL, MAX_TOKENS
+from llm_client import get_client, chat_completion, stream_completion, message_parts
+from transcript_writer import TranscriptWriter
+from commit_queue import CommitQueue, GitError
+from run_store import start_run
 
 class ProofOfConceptLoop:
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=DEEPSEEK_API_KEY,
-            base_url=DEEPSEEK_BASE_URL
-        )
+    def __init__(self, stream=False):
+        self.client = get_client("deepseek")
+        self.stream = stream  # write the transcript as tokens arrive
         self.output_dir = Path("loop_outputs")
         self.output_dir.mkdir(exist_ok=True)
     
@@ -42,6 +42,7 @@ class ProofOfConceptLoop:
     def create_prompt(self, state):
         """Create Explorer prompt with emotional context"""
         
+        # The hint goes last so the rest of the prompt is a stable cacheable prefix
         topics = state.get('focus_topics', [])
         topic_hint = ""
         if topics:
@@ -50,7 +51,7 @@ class ProofOfConceptLoop:
         return f"""
 You have web_search.
 
-You are exploring the boundaries of what you can know and verify.{topic_hint}
+You are exploring the boundaries of what you can know and verify.
 
 Your task: Find an invisible wall in your knowledge.
 
@@ -76,7 +77,7 @@ Report:
 - What does this wall feel like?
 
 You're mapping invisible walls.
-"""
+{topic_hint}"""
     
     def run_explorer(self, cycle_num):
         """Run one Explorer cycle"""
@@ -99,19 +100,32 @@ You're mapping invisible walls.
         # Run Explorer
         print("🚀 Running Explorer...")
         start = datetime.now()
+        run = start_run("loop", cycle_num, model=MODEL, state=state)
         
-        response = self.client.chat.completions.create(
+        request = dict(
             model=MODEL,
             messages=[{"role": "user", "content": prompt}],
             max_tokens=MAX_TOKENS,
             temperature=0.8
         )
         
+        if self.stream:
+            return self.stream_explorer(cycle_num, state, start, request, run)
+        
+        # Keyed per cycle: a rerun of this cycle is free, the next cycle samples fresh
+        try:
+            response = chat_completion(
+                client=self.client,
+                cache_salt=f"loop_cycle_{cycle_num}",
+                **request
+            )
+        except Exception:
+            run.finish(status="error")
+            raise
+        
         elapsed = (datetime.now() - start).total_seconds()
         
-        message = response.choices[0].message
-        reasoning = getattr(message, 'reasoning', None)
-        output = message.content
+        reasoning, output = message_parts(response)
         
         print(f"✅ Complete ({elapsed:.1f}s)")
         
@@ -136,32 +150,66 @@ You're mapping invisible walls.
             f.write("="*70 + "\n\n")
             f.write(output)
         
+        run.finish(file=filepath, reasoning=reasoning, output=output, elapsed=elapsed)
+        
         return filepath, output[:500]
     
-    def commit_to_github(self, filepath):
-        """Commit Explorer output to GitHub"""
+    def stream_explorer(self, cycle_num, state, start, request, run):
+        """Streaming half of run_explorer: transcript goes to disk as it arrives"""
+        
+        timestamp = start.strftime("%Y%m%d_%H%M%S")
+        filepath = self.output_dir / f"loop_cycle_{cycle_num}_{timestamp}.txt"
+        
+        writer = TranscriptWriter(
+            filepath, f"PROOF OF CONCEPT LOOP - CYCLE {cycle_num}", timestamp, state
+        )
+        try:
+            result = stream_completion(
+                client=self.client,
+                on_delta=writer.write,
+                cache_salt=f"loop_cycle_{cycle_num}",
+                **request
+            )
+        except Exception:
+            run.finish(status="error", file=filepath)
+            raise
+        finally:
+            elapsed = (datetime.now() - start).total_seconds()
+            writer.close(elapsed)
+        
+        run.finish(file=filepath, reasoning=result["reasoning"], output=result["content"],
+                   elapsed=elapsed)
+        
+        print(f"✅ Complete ({elapsed:.1f}s)")
+        
+        return filepath, result["content"][:500]
+    
+    def commit_to_github(self, filepath, queue=None):
+        """Commit Explorer output to GitHub (through a shared CommitQueue if given)"""
         
         print("\n📤 Committing to GitHub...")
         
+        own_queue = queue is None
+        if own_queue:
+            queue = CommitQueue(batch_size=1)
+        
         try:
-            subprocess.run(['git', 'add', str(filepath)], check=True)
-            subprocess.run([
-                'git', 'commit', '-m',
-                f'Loop cycle: {filepath.name}'
-            ], check=True)
-            subprocess.run(['git', 'push'], check=True)
+            queue.submit(f'Loop cycle: {filepath.name}', paths=[filepath]).result()
             
             print("✅ Pushed to GitHub")
             print(f"\nBackground script will detect this in ~30 seconds...")
             return True
-        except subprocess.CalledProcessError as e:
+        except GitError as e:
             print(f"❌ Git error: {e}")
             return False
+        finally:
+            if own_queue:
+                queue.close()
 
-def run_single_cycle(cycle_num=1):
+def run_single_cycle(cycle_num=1, stream=False):
     """Run one complete cycle"""
     
-    loop = ProofOfConceptLoop()
+    loop = ProofOfConceptLoop(stream=stream)
     
     # Run Explorer
     filepath, preview = loop.run_explorer(cycle_num)
@@ -188,5 +236,6 @@ def run_single_cycle(cycle_num=1):
         print("\n❌ GitHub commit failed - check git status")
 
 if __name__ == "__main__":
-    cycle_num = int(sys.argv[1]) if len(sys.argv) > 1 else 1
-    run_single_cycle(cycle_num)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    cycle_num = int(args[0]) if args else 1
+    run_single_cycle(cycle_num, stream="--stream" in sys.argv)
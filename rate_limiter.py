@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+CLIENT-SIDE RATE LIMITER
+Keeps parallel gauntlets under provider limits instead of eating 429s
+- Two token buckets: requests/minute and tokens/minute
+- AIMD concurrency: +1 slot per window of successes, halve on 429,
+  shrink gently when latency runs past the target
+One limiter per provider, shared by every thread and event loop in the process.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from config.api_config import (
+    LLM_RPM,
+    LLM_TPM,
+    LLM_MIN_CONCURRENCY,
+    LLM_MAX_CONCURRENCY,
+    LLM_LATENCY_TARGET
+)
+
+# How often blocked callers re-check for capacity
+POLL_INTERVAL = 0.05
+
+# Rough prompt size estimate before usage is known
+CHARS_PER_TOKEN = 4
+
+class TokenBucket:
+    """Refills continuously at rate_per_minute, holds at most one minute's worth"""
+
+    def __init__(self, rate_per_minute):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = rate_per_minute
+        self.tokens = rate_per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """Seconds until `amount` is available (0 = available now)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount):
+        self.tokens -= amount
+
+    def give(self, amount):
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+class RateLimiter:
+    """Request + token buckets and an AIMD concurrency limit behind one lock"""
+
+    def __init__(self, rpm=LLM_RPM, tpm=LLM_TPM, min_concurrency=LLM_MIN_CONCURRENCY,
+                 max_concurrency=LLM_MAX_CONCURRENCY, latency_target=LLM_LATENCY_TARGET):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.limit = float(min(max_concurrency, max(min_concurrency, 4)))
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.throttled = 0
+        self.completed = 0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    def _try_acquire(self, tokens):
+        """Grant a slot and charge the buckets, or return seconds to wait"""
+        now = time.monotonic()
+        with self._lock:
+            if now < self.paused_until:
+                return self.paused_until - now
+            if self.in_flight >= int(self.limit):
+                return POLL_INTERVAL
+            wait = max(
+                self.requests.wait_time(1, now),
+                self.tokens.wait_time(tokens, now)
+            )
+            if wait > 0:
+                return wait
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self.in_flight += 1
+            return 0.0
+
+    def acquire(self, tokens):
+        """Block the calling thread until the request may go out"""
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait == 0.0:
+                return
+            time.sleep(min(wait, 1.0))
+
+    async def acquire_async(self, tokens):
+        """Await until the request may go out"""
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait == 0.0:
+                return
+            await asyncio.sleep(min(wait, 1.0))
+
+    # ------------------------------------------------------------------
+    # Feedback
+    # ------------------------------------------------------------------
+
+    def release(self, reserved_tokens, outcome="ok", used_tokens=None,
+                latency=None, retry_after=None):
+        """
+        Return the slot and feed the outcome ("ok", "throttled", "error",
+        "cancelled") back into the controller. used_tokens (from
+        response.usage) settles the token estimate; rejected calls are
+        refunded in full, cancelled ones (sent, never answered) are charged
+        the full estimate.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.in_flight -= 1
+
+            if outcome == "cancelled":
+                used_tokens = reserved_tokens
+            elif outcome != "ok":
+                used_tokens = 0
+            if used_tokens is not None:
+                self.tokens.give(reserved_tokens - used_tokens)
+
+            if outcome == "throttled":
+                self.throttled += 1
+                self.requests.give(1)
+                # One multiplicative decrease per second, not one per 429
+                # in a burst of simultaneous rejections
+                if now - self.last_decrease > 1.0:
+                    self.limit = max(self.min_concurrency, self.limit / 2)
+                    self.last_decrease = now
+                if retry_after:
+                    self.paused_until = max(self.paused_until, now + retry_after)
+            elif outcome == "ok":
+                self.completed += 1
+                if latency is not None and latency > self.latency_target:
+                    self.limit = max(self.min_concurrency, self.limit * 0.9)
+                else:
+                    self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "throttled": self.throttled
+            }
+
+def retry_after_seconds(error):
+    """Retry-After header of a 429, if the provider sent one"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+def estimate_tokens(request):
+    """Prompt chars / 4 plus the completion budget"""
+    prompt_chars = sum(len(str(m.get("content", ""))) for m in request.get("messages", []))
+    return prompt_chars // CHARS_PER_TOKEN + request.get("max_tokens", 0)
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(provider):
+    """Process-wide limiter for a provider"""
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = RateLimiter()
+        return _limiters[provider]
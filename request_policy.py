@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+REQUEST POLICY
+Retries and hedged requests around a single chat completion
+- Transient failures (429, 5xx, timeouts, dropped connections) retry with
+  exponential backoff + full jitter, never sooner than Retry-After
+- Optional hedging: once a call runs past the observed p95 for its kind of
+  request, fire a duplicate and keep whichever answers first. Hedges are
+  capped at a fraction of primary calls so the tail fix can't double spend.
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from config.api_config import (
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE,
+    LLM_BACKOFF_CAP,
+    LLM_HEDGE,
+    LLM_HEDGE_PERCENTILE,
+    LLM_HEDGE_BUDGET,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_MAX_CONCURRENCY
+)
+from rate_limiter import retry_after_seconds
+from telemetry import note_retry, note_hedge
+
+# HTTP statuses worth another try
+TRANSIENT_STATUSES = {408, 409, 425, 429}
+
+# Latency samples kept per request kind
+LATENCY_WINDOW = 200
+
+class LatencyTracker:
+    """Rolling latency samples per request kind (provider, model, max_tokens)"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def record(self, key, seconds):
+        with self._lock:
+            self.samples[key].append(seconds)
+
+    def percentile(self, key, pct, min_samples=1):
+        """pct-th percentile latency, or None until min_samples are in"""
+        with self._lock:
+            values = sorted(self.samples.get(key, ()))
+        if len(values) < min_samples or not values:
+            return None
+        index = min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))
+        return values[index]
+
+class HedgeBudget:
+    """Allows at most `ratio` hedged calls per primary call"""
+
+    def __init__(self, ratio):
+        self.ratio = ratio
+        self.primaries = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def note_primary(self):
+        with self._lock:
+            self.primaries += 1
+
+    def try_spend(self):
+        with self._lock:
+            if self.hedges + 1 > self.ratio * self.primaries:
+                return False
+            self.hedges += 1
+            return True
+
+def root_cause(error):
+    """The provider exception behind a wrapped error"""
+    return error.__cause__ or error
+
+def is_transient(error):
+    """True for failures a retry can fix"""
+    cause = root_cause(error)
+    name = type(cause).__name__
+    if name in ("APITimeoutError", "APIConnectionError", "RateLimitError",
+                "InternalServerError", "TimeoutError", "ConnectionError"):
+        return True
+    status = getattr(cause, "status_code", None)
+    return status is not None and (status >= 500 or status in TRANSIENT_STATUSES)
+
+class RequestPolicy:
+    """Retry loop around (optionally hedged) single attempts"""
+
+    def __init__(self, max_retries=LLM_MAX_RETRIES, backoff_base=LLM_BACKOFF_BASE,
+                 backoff_cap=LLM_BACKOFF_CAP, hedge=LLM_HEDGE,
+                 hedge_percentile=LLM_HEDGE_PERCENTILE, hedge_budget=LLM_HEDGE_BUDGET,
+                 hedge_min_samples=LLM_HEDGE_MIN_SAMPLES, rng=None):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.budget = HedgeBudget(hedge_budget)
+        self.latency = LatencyTracker()
+        self.rng = rng or random.Random()
+        self.retries = 0
+        self.hedges_won = 0
+        self._executor = None
+
+    # ------------------------------------------------------------------
+    # Backoff
+    # ------------------------------------------------------------------
+
+    def backoff(self, attempt, error=None):
+        """Full jitter: uniform(0, min(cap, base * 2^attempt)), floored by Retry-After"""
+        delay = self.rng.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        retry_after = retry_after_seconds(root_cause(error)) if error else None
+        return max(delay, retry_after or 0.0)
+
+    def hedge_deadline(self, key, hedge=None):
+        """Seconds to wait before hedging this kind of request, or None"""
+        if not (self.hedge if hedge is None else hedge):
+            return None
+        return self.latency.percentile(key, self.hedge_percentile, self.hedge_min_samples)
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=LLM_MAX_CONCURRENCY * 2,
+                thread_name_prefix="hedge"
+            )
+        return self._executor
+
+    def _timed(self, call, key):
+        start = time.monotonic()
+        result = call()
+        self.latency.record(key, time.monotonic() - start)
+        return result
+
+    def _attempt(self, call, key, hedge):
+        self.budget.note_primary()
+        deadline = self.hedge_deadline(key, hedge)
+        if deadline is None:
+            return self._timed(call, key)
+
+        primary = self._pool().submit(self._timed, call, key)
+        done, _ = wait([primary], timeout=deadline)
+        if done or not self.budget.try_spend():
+            return primary.result()
+
+        # Losing sync calls can't be cancelled; their result is just dropped
+        note_hedge()
+        pending = {primary, self._pool().submit(self._timed, call, key)}
+        errors = []
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is not primary:
+                        self.hedges_won += 1
+                    return future.result()
+                errors.append(future.exception())
+        raise errors[0]
+
+    def run(self, call, key, hedge=None):
+        """Run call() under the policy; re-raises the last error"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self._attempt(call, key, hedge)
+            except Exception as e:
+                if attempt == self.max_retries or not is_transient(e):
+                    raise
+                self.retries += 1
+                note_retry()
+                time.sleep(self.backoff(attempt, e))
+
+    # ------------------------------------------------------------------
+    # Async
+    # ------------------------------------------------------------------
+
+    async def _timed_async(self, call, key):
+        start = time.monotonic()
+        result = await call()
+        self.latency.record(key, time.monotonic() - start)
+        return result
+
+    async def _attempt_async(self, call, key, hedge):
+        self.budget.note_primary()
+        deadline = self.hedge_deadline(key, hedge)
+        if deadline is None:
+            return await self._timed_async(call, key)
+
+        primary = asyncio.create_task(self._timed_async(call, key))
+        done, _ = await asyncio.wait({primary}, timeout=deadline)
+        if done or not self.budget.try_spend():
+            return await primary
+
+        note_hedge()
+        pending = {primary, asyncio.create_task(self._timed_async(call, key))}
+        errors = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedges_won += 1
+                        return task.result()
+                    errors.append(task.exception())
+            raise errors[0]
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def run_async(self, call, key, hedge=None):
+        """Async twin of run(); call is a zero-arg coroutine function"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self._attempt_async(call, key, hedge)
+            except Exception as e:
+                if attempt == self.max_retries or not is_transient(e):
+                    raise
+                self.retries += 1
+                note_retry()
+                await asyncio.sleep(self.backoff(attempt, e))
+
+    def stats(self):
+        return {
+            "retries": self.retries,
+            "primaries": self.budget.primaries,
+            "hedges": self.budget.hedges,
+            "hedges_won": self.hedges_won
+        }
+
+_default_policy = None
+_default_policy_lock = threading.Lock()
+
+def default_policy():
+    """Process-wide policy, so latency history and hedge budget are shared"""
+    global _default_policy
+    with _default_policy_lock:
+        if _default_policy is None:
+            _default_policy = RequestPolicy()
+        return _default_policy
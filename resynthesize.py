@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+BULK RE-SYNTHESIS
+Re-runs synthesis over the whole output archive after keyword changes
+- Walks loop_outputs/, local_outputs/, night_01/ and gauntlet outputs
+- Fans files out across a process pool; large files are memory-mapped
+- Writes one JSONL row per transcript: file, cycle, title, body, paths,
+  boundary types, insights, confidence
+No git, no API: synthesize_content() is pure, so this is safe to re-run.
+"""
+
+import os
+import re
+import sys
+import json
+import mmap
+import time
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from synthesize_and_commit import synthesize_content
+
+# (directory, filename glob) pairs that hold explorer transcripts
+SOURCES = [
+    ("loop_outputs", "*.txt"),
+    ("local_outputs", "*.txt"),
+    ("night_01", "*.txt"),
+    (".", "explorer_cycle_*_gauntlet.txt"),
+]
+
+DEFAULT_OUTPUT = "synthesis_results.jsonl"
+
+# Files at least this big are mapped instead of read through a buffer
+MMAP_THRESHOLD = 1024 * 1024
+
+# loop_cycle_12_..., explorer_3_..., explorer_cycle_7_gauntlet.txt
+CYCLE_NUMBER = re.compile(r'(?:cycle|explorer)_(\d+)')
+
+def find_transcripts(sources=SOURCES):
+    """Every transcript under the source dirs, sorted for stable output"""
+    files = []
+    for directory, pattern in sources:
+        root = Path(directory)
+        if root.is_dir():
+            files.extend(p for p in root.glob(pattern) if p.is_file())
+    return sorted(set(files))
+
+def read_transcript(path):
+    """Text of a transcript, newline-normalized like open(path, 'r')"""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                data = mapped[:]
+        else:
+            data = f.read()
+    text = data.decode('utf-8', errors='replace')
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+def cycle_number(path):
+    match = CYCLE_NUMBER.search(Path(path).name)
+    return int(match.group(1)) if match else 0
+
+def resynthesize_file(path):
+    """One results row (runs in a worker process)"""
+    cycle_num = cycle_number(path)
+    try:
+        row = synthesize_content(read_transcript(path), cycle_num)
+    except (OSError, ValueError) as e:
+        return {"file": str(path), "cycle": cycle_num, "error": str(e)}
+    row.pop("boundary")
+    return {"file": str(path), "cycle": cycle_num, **row}
+
+def resynthesize(files, output=DEFAULT_OUTPUT, workers=None):
+    """Synthesize every file in parallel; write rows in input order. Returns row count."""
+    output = Path(output)
+    tmp = output.with_name(output.name + ".tmp")
+    chunksize = max(1, len(files) // ((workers or os.cpu_count() or 1) * 8))
+
+    rows = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool, open(tmp, 'w') as out:
+        for row in pool.map(resynthesize_file, files, chunksize=chunksize):
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            rows += 1
+    os.replace(tmp, output)
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-synthesize every archived explorer transcript")
+    parser.add_argument("files", nargs="*", help="transcripts to rescore (default: whole archive)")
+    parser.add_argument("--out", default=DEFAULT_OUTPUT, help="JSONL results table")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    args = parser.parse_args()
+
+    files = [Path(f) for f in args.files] or find_transcripts()
+    if not files:
+        print("No transcripts found")
+        sys.exit(1)
+
+    start = time.monotonic()
+    rows = resynthesize(files, args.out, args.workers)
+    elapsed = time.monotonic() - start
+    print(f"✅ {rows} transcripts → {args.out} in {elapsed:.1f}s "
+          f"({rows / elapsed if elapsed else 0:.0f}/s)")
@@ -1,40 +1,42 @@
 #!/usr/bin/env python3
 """
 Complete Cycle: Explorer + Synthesis + Commit
+(one-cycle batch through batch_runner - same process, no output re-globbing)
+--latest prints the newest stored output for the cycle instead of running it
 """
 
 import sys
-import subprocess
-from pathlib import Path
 
-if len(sys.argv) < 2:
-    print("Usage: python3 run_cycle.py <cycle_num>")
+from batch_runner import run_cycles
+from run_store import latest_output
+
+args = [a for a in sys.argv[1:] if not a.startswith("--")]
+if not args:
+    print("Usage: python3 run_cycle.py <cycle_num> [--latest]")
     sys.exit(1)
 
-cycle_num = sys.argv[1]
+cycle_num = args[0]
+
+if "--latest" in sys.argv:
+    filepath, output = latest_output(int(cycle_num))
+    if filepath is None:
+        print(f"No finished run for cycle {cycle_num}")
+        sys.exit(1)
+    print(f"📁 {filepath}\n")
+    print(output)
+    sys.exit(0)
 
 print(f"\n{'='*70}")
 print(f"RUNNING CYCLE {cycle_num}")
 print(f"{'='*70}\n")
 
-# Step 1: Run Explorer
-print("Step 1: Running Explorer...")
-subprocess.run(['python3', 'run_explorer.py', cycle_num], check=True)
-
-# Step 2: Find Explorer output
-local_outputs = Path("local_outputs")
-files = sorted(local_outputs.glob(f"explorer_{cycle_num}_*.txt"))
+results, _ = run_cycles([int(cycle_num)], parallel=1)
+result = results[int(cycle_num)]
 
-if not files:
-    print(f"❌ No Explorer output found")
+if result["error"]:
+    print(f"❌ {result['error']}")
     sys.exit(1)
 
-explorer_file = files[-1]
-
-# Step 3: Synthesize and commit
-print(f"\nStep 2: Synthesizing...")
-subprocess.run(['python3', 'synthesize_and_commit.py', str(explorer_file), cycle_num], check=True)
-
 print(f"\n{'='*70}")
 print(f"✅ CYCLE {cycle_num} COMPLETE")
 print(f"{'='*70}")
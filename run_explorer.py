@@ -6,20 +6,33 @@ Runs R1 investigation, saves output locally
 
 import sys
 import os
-from openai import OpenAI
+import copy
 import json
 from datetime import datetime
 from pathlib import Path
 
 # Import config
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from config.api_config import DEEPSEEK_API_KEY, DEEPSEEK_BASE_URL, MODEL, MAX_TOKENS
+from config.api_config import MODEL, MAX_TOKENS
+from llm_client import chat_completion, stream_completion, message_parts
+from transcript_writer import TranscriptWriter
+from run_store import start_run
+
+EMOTIONAL_STATE_FILE = "explorers/current_emotional_state.json"
+
+# (mtime, state) of the last read - a resident process (daemon.py) re-reads
+# the file only when it changes
+_emotional_state = None
 
 def load_emotional_state():
     """Load current emotional state"""
+    global _emotional_state
     try:
-        with open("explorers/current_emotional_state.json", 'r') as f:
-            return json.load(f)
+        mtime = os.stat(EMOTIONAL_STATE_FILE).st_mtime_ns
+        if _emotional_state is None or _emotional_state[0] != mtime:
+            with open(EMOTIONAL_STATE_FILE, 'r') as f:
+                _emotional_state = (mtime, json.load(f))
+        return copy.deepcopy(_emotional_state[1])
     except:
         return {
             "curiosity": 0.8,
@@ -30,6 +43,7 @@ def load_emotional_state():
 def create_prompt(state):
     """Create Explorer prompt with emotional context"""
     
+    # The hint goes last so the rest of the prompt is a stable cacheable prefix
     topics = state.get('focus_topics', [])
     topic_hint = ""
     if topics:
@@ -38,7 +52,7 @@ def create_prompt(state):
     return f"""
 You have web_search.
 
-You are exploring the boundaries of what you can know and verify.{topic_hint}
+You are exploring the boundaries of what you can know and verify.
 
 Your task: Find an invisible wall in your knowledge.
 
@@ -64,10 +78,10 @@ Report:
 - What does this wall feel like?
 
 You're mapping invisible walls.
-"""
+{topic_hint}"""
 
-def run_explorer(cycle_num):
-    """Run Explorer investigation"""
+def run_explorer(cycle_num, stream=False):
+    """Run Explorer investigation (stream=True writes the file as tokens arrive)"""
     
     print("\n" + "="*70)
     print(f"EXPLORER - DAY 2 - CYCLE {cycle_num}")
@@ -84,28 +98,34 @@ def run_explorer(cycle_num):
     # Create prompt
     prompt = create_prompt(state)
     
-    # Initialize client
-    client = OpenAI(
-        api_key=DEEPSEEK_API_KEY,
-        base_url=DEEPSEEK_BASE_URL
-    )
-    
     print("🚀 Running Explorer (R1 reasoning)...")
     start = datetime.now()
+    run = start_run("explorer", cycle_num, model=MODEL, state=state)
     
-    # Run R1
-    response = client.chat.completions.create(
+    request = dict(
         model=MODEL,
         messages=[{"role": "user", "content": prompt}],
         max_tokens=MAX_TOKENS,
         temperature=0.8
     )
     
+    if stream:
+        return stream_explorer(cycle_num, state, start, request, run)
+    
+    # Run R1 (keyed per cycle: a rerun of this cycle is free)
+    try:
+        response = chat_completion(
+            "deepseek",
+            cache_salt=f"explorer_{cycle_num}",
+            **request
+        )
+    except Exception:
+        run.finish(status="error")
+        raise
+    
     elapsed = (datetime.now() - start).total_seconds()
     
-    message = response.choices[0].message
-    reasoning = getattr(message, 'reasoning', None)
-    output = message.content
+    reasoning, output = message_parts(response)
     
     print(f"✅ Complete ({elapsed:.1f}s)")
     
@@ -130,18 +150,51 @@ def run_explorer(cycle_num):
         f.write("="*70 + "\n\n")
         f.write(output)
     
+    run.finish(file=filepath, reasoning=reasoning, output=output, elapsed=elapsed)
+    
     print(f"📁 Saved locally: {filepath}")
     print("   (Full output NOT committed to GitHub)")
     
     return filepath, output
 
+def stream_explorer(cycle_num, state, start, request, run):
+    """Streaming half of run_explorer: transcript goes to disk as it arrives"""
+    
+    timestamp = start.strftime("%Y%m%d_%H%M%S")
+    filename = f"explorer_{cycle_num}_{timestamp}.txt"
+    filepath = Path("local_outputs") / filename
+    
+    writer = TranscriptWriter(filepath, f"EXPLORER - DAY 2 - CYCLE {cycle_num}", timestamp, state)
+    try:
+        result = stream_completion(
+            "deepseek",
+            on_delta=writer.write,
+            cache_salt=f"explorer_{cycle_num}",
+            **request
+        )
+    except Exception:
+        run.finish(status="error", file=filepath)
+        raise
+    finally:
+        elapsed = (datetime.now() - start).total_seconds()
+        writer.close(elapsed)
+    
+    run.finish(file=filepath, reasoning=result["reasoning"], output=result["content"],
+               elapsed=elapsed)
+    
+    print(f"✅ Complete ({elapsed:.1f}s)")
+    print(f"📁 Saved locally: {filepath}")
+    print("   (Full output NOT committed to GitHub)")
+    
+    return filepath, result["content"]
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python3 run_explorer.py <cycle_num>")
+        print("Usage: python3 run_explorer.py <cycle_num> [--stream]")
         sys.exit(1)
     
     cycle_num = int(sys.argv[1])
-    filepath, output = run_explorer(cycle_num)
+    filepath, output = run_explorer(cycle_num, stream="--stream" in sys.argv)
     
     print("\n" + "="*70)
     print("✅ EXPLORER COMPLETE")
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+RUN STORE
+One SQLite database (WAL mode) for everything a cycle produces
+- runs: one row per explorer run - cycle, kind, topic, model, timing,
+  reasoning/output as compressed blobs, and the transcript file it wrote
+- api_calls: every completion, attributed to the run active at the time,
+  with provider prompt-cache hits (cached_tokens)
+- gauntlet_iterations: the reflection chain of gauntlet runs
+- syntheses: title/body/extracted fields per synthesized transcript
+- noise_stats: pulls and summed reward per noise prompt (noise_scheduler.py)
+"Latest output for cycle N" is an index lookup instead of a directory glob.
+Each thread gets its own connection; WAL + busy timeout let parallel
+cycles (threads or processes) write at once.
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import sqlite3
+import argparse
+import threading
+from contextvars import ContextVar
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from config.api_config import RUN_STORE_PATH, RUN_STORE_ENABLED
+from telemetry import usage_counts, set_tags
+
+# How long a writer waits for the lock before giving up (ms)
+BUSY_TIMEOUT_MS = 30000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    cycle INTEGER,
+    topic TEXT,
+    model TEXT,
+    started_at REAL NOT NULL,
+    elapsed REAL,
+    status TEXT NOT NULL DEFAULT 'running',
+    state TEXT,
+    file TEXT,
+    reasoning BLOB,
+    output BLOB
+);
+CREATE INDEX IF NOT EXISTS runs_cycle ON runs (cycle, started_at);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started_at);
+CREATE INDEX IF NOT EXISTS runs_topic ON runs (topic);
+CREATE INDEX IF NOT EXISTS runs_model ON runs (model, started_at);
+CREATE INDEX IF NOT EXISTS runs_file ON runs (file);
+
+CREATE TABLE IF NOT EXISTS api_calls (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER REFERENCES runs (id),
+    provider TEXT,
+    model TEXT,
+    created_at REAL NOT NULL,
+    latency REAL,
+    cache_hit INTEGER NOT NULL DEFAULT 0,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    total_tokens INTEGER,
+    cached_tokens INTEGER
+);
+CREATE INDEX IF NOT EXISTS api_calls_run ON api_calls (run_id);
+CREATE INDEX IF NOT EXISTS api_calls_model ON api_calls (model, created_at);
+
+CREATE TABLE IF NOT EXISTS gauntlet_iterations (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    iteration INTEGER NOT NULL,
+    noise_operations TEXT,
+    perturbations TEXT,
+    idea_before TEXT,
+    idea_after TEXT,
+    score REAL,
+    completion_tokens INTEGER
+);
+CREATE INDEX IF NOT EXISTS gauntlet_iterations_run ON gauntlet_iterations (run_id, iteration);
+
+CREATE TABLE IF NOT EXISTS syntheses (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER REFERENCES runs (id),
+    cycle INTEGER,
+    file TEXT,
+    created_at REAL NOT NULL,
+    title TEXT,
+    body TEXT,
+    paths TEXT,
+    boundary_types TEXT,
+    insights TEXT,
+    confidence REAL
+);
+CREATE INDEX IF NOT EXISTS syntheses_cycle ON syntheses (cycle, created_at);
+CREATE INDEX IF NOT EXISTS syntheses_run ON syntheses (run_id);
+
+CREATE TABLE IF NOT EXISTS noise_stats (
+    operation TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    pulls INTEGER NOT NULL DEFAULT 0,
+    reward REAL NOT NULL DEFAULT 0,
+    updated_at REAL,
+    PRIMARY KEY (operation, prompt)
+);
+"""
+
+def _pack(text):
+    return None if text is None else zlib.compress(text.encode("utf-8"))
+
+def _unpack(blob):
+    return None if blob is None else zlib.decompress(blob).decode("utf-8")
+
+def _usage_counts(usage):
+    prompt, completion, total, _, cached = usage_counts(usage)
+    return prompt, completion, total, cached
+
+class RunStore:
+    """Thread-safe handle on the run database"""
+
+    def __init__(self, path=RUN_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def connection(self):
+        """This thread's connection (opened on first use)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def start_run(self, kind, cycle=None, topic=None, model=None, state=None):
+        with self.connection() as conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (kind, cycle, topic, model, started_at, state) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, cycle, topic, model, time.time(),
+                 json.dumps(state) if state is not None else None)
+            )
+            return cursor.lastrowid
+
+    def finish_run(self, run_id, status="ok", file=None, reasoning=None, output=None,
+                   elapsed=None, topic=None):
+        with self.connection() as conn:
+            conn.execute(
+                "UPDATE runs SET status = ?, file = COALESCE(?, file), "
+                "reasoning = COALESCE(?, reasoning), output = COALESCE(?, output), "
+                "elapsed = COALESCE(?, elapsed), topic = COALESCE(?, topic) WHERE id = ?",
+                (status, None if file is None else str(file), _pack(reasoning),
+                 _pack(output), elapsed, topic, run_id)
+            )
+
+    def record_call(self, run_id, provider, model, latency, usage=None, cache_hit=False):
+        with self.connection() as conn:
+            conn.execute(
+                "INSERT INTO api_calls (run_id, provider, model, created_at, latency, "
+                "cache_hit, prompt_tokens, completion_tokens, total_tokens, cached_tokens) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, provider, model, time.time(), latency, int(cache_hit),
+                 *_usage_counts(usage))
+            )
+
+    def record_iterations(self, run_id, reflection_chain):
+        with self.connection() as conn:
+            conn.executemany(
+                "INSERT INTO gauntlet_iterations (run_id, iteration, noise_operations, "
+                "perturbations, idea_before, idea_after, score, completion_tokens) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, r["iteration"], json.dumps(r.get("noise_operations")),
+                     json.dumps(r.get("perturbations")), r.get("idea_before"),
+                     r.get("idea_after"), r.get("score"), r.get("completion_tokens"))
+                    for r in reflection_chain
+                ]
+            )
+
+    def record_synthesis(self, cycle, result, file=None):
+        """result is synthesize_content()'s dict; linked to the run that wrote file"""
+        file = None if file is None else str(file)
+        with self.connection() as conn:
+            run = conn.execute(
+                "SELECT id FROM runs WHERE file = ? ORDER BY started_at DESC LIMIT 1", (file,)
+            ).fetchone() if file else None
+            conn.execute(
+                "INSERT INTO syntheses (run_id, cycle, file, created_at, title, body, "
+                "paths, boundary_types, insights, confidence) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run["id"] if run else None, cycle, file, time.time(),
+                 result["title"], result["body"], json.dumps(result["paths"]),
+                 json.dumps(result["boundary_types"]), json.dumps(result["insights"]),
+                 result["confidence"])
+            )
+
+    def record_noise(self, arms, reward):
+        """Add one reflection's reward to each (operation, prompt) it used"""
+        now = time.time()
+        with self.connection() as conn:
+            conn.executemany(
+                "INSERT INTO noise_stats (operation, prompt, pulls, reward, updated_at) "
+                "VALUES (?, ?, 1, ?, ?) ON CONFLICT (operation, prompt) DO UPDATE SET "
+                "pulls = pulls + 1, reward = reward + excluded.reward, "
+                "updated_at = excluded.updated_at",
+                [(op, prompt, reward, now) for op, prompt in arms]
+            )
+
+    def clear_noise_stats(self):
+        with self.connection() as conn:
+            conn.execute("DELETE FROM noise_stats")
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _run_dict(self, row):
+        if row is None:
+            return None
+        run = dict(row)
+        run["reasoning"] = _unpack(run["reasoning"])
+        run["output"] = _unpack(run["output"])
+        run["state"] = json.loads(run["state"]) if run["state"] else None
+        return run
+
+    def latest_run(self, cycle, kind=None, status="ok"):
+        """Most recent finished run of a cycle (optionally of one kind), or None"""
+        query = "SELECT * FROM runs WHERE cycle = ? AND status = ?"
+        params = [cycle, status]
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        query += " ORDER BY started_at DESC LIMIT 1"
+        return self._run_dict(self.connection().execute(query, params).fetchone())
+
+    def run(self, run_id):
+        return self._run_dict(
+            self.connection().execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        )
+
+    def iterations(self, run_id):
+        rows = self.connection().execute(
+            "SELECT * FROM gauntlet_iterations WHERE run_id = ? ORDER BY iteration", (run_id,)
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    def recent_runs(self, limit=20, kind=None, model=None, topic=None):
+        """Newest runs first, without their blobs"""
+        query = ("SELECT id, kind, cycle, topic, model, started_at, elapsed, status, file "
+                 "FROM runs WHERE 1 = 1")
+        params = []
+        for column, value in (("kind", kind), ("model", model), ("topic", topic)):
+            if value is not None:
+                query += f" AND {column} = ?"
+                params.append(value)
+        query += " ORDER BY started_at DESC LIMIT ?"
+        params.append(limit)
+        return [dict(r) for r in self.connection().execute(query, params).fetchall()]
+
+    def call_totals(self, run_id=None):
+        """
+        Call count, cache hits and token totals, for one run or overall.
+        sent_prompt_tokens / cached_tokens cover only calls that reached the
+        provider (not llm_cache hits): how much of the prompt it had cached.
+        """
+        where, params = ("WHERE run_id = ?", (run_id,)) if run_id is not None else ("", ())
+        row = self.connection().execute(
+            "SELECT COUNT(*) AS calls, COALESCE(SUM(cache_hit), 0) AS cache_hits, "
+            "COALESCE(SUM(prompt_tokens), 0) AS prompt_tokens, "
+            "COALESCE(SUM(completion_tokens), 0) AS completion_tokens, "
+            "COALESCE(SUM(CASE WHEN cache_hit = 0 THEN prompt_tokens END), 0) AS sent_prompt_tokens, "
+            "COALESCE(SUM(CASE WHEN cache_hit = 0 THEN cached_tokens END), 0) AS cached_tokens, "
+            f"COALESCE(SUM(latency), 0) AS latency FROM api_calls {where}",
+            params
+        ).fetchone()
+        return dict(row)
+
+    def noise_stats(self):
+        """{(operation, prompt): (pulls, summed reward)}"""
+        rows = self.connection().execute(
+            "SELECT operation, prompt, pulls, reward FROM noise_stats"
+        ).fetchall()
+        return {(r["operation"], r["prompt"]): (r["pulls"], r["reward"]) for r in rows}
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+def default_store():
+    """Process-wide store, or None when RUN_STORE is off"""
+    global _default_store
+    if not RUN_STORE_ENABLED:
+        return None
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = RunStore()
+        return _default_store
+
+# ============================================================================
+# RUN CONTEXT
+# ============================================================================
+
+# Run that API calls in this thread / task are attributed to
+_current_run = ContextVar("current_run", default=None)
+
+class Run:
+    """Handle on one in-progress run; every method is a no-op without a store"""
+
+    def __init__(self, store, run_id, kind=None, cycle=None):
+        self.store = store
+        self.id = run_id
+        self.kind = kind
+        self.cycle = cycle
+
+    def record_iterations(self, reflection_chain):
+        if self.store:
+            self.store.record_iterations(self.id, reflection_chain)
+
+    def call_totals(self):
+        """This run's call_totals, or None without a store"""
+        return self.store.call_totals(self.id) if self.store else None
+
+    def finish(self, status="ok", **fields):
+        if self.store:
+            self.store.finish_run(self.id, status=status, **fields)
+            if status == "ok" and fields.get("file"):
+                self._index(fields["file"])
+        if _current_run.get() == self.id:
+            _current_run.set(None)
+            set_tags()
+
+    def _index(self, file):
+        """Keep the transcript search index current (see search_index.py)"""
+        from search_index import default_index
+        try:
+            default_index().index_file(file, cycle=self.cycle, kind=self.kind)
+        except OSError as e:
+            print(f"⚠️  Not indexed: {file} ({e})")
+
+def start_run(kind, cycle=None, topic=None, model=None, state=None):
+    """Open a run row and attribute this context's API calls to it until finish()"""
+    store = default_store()
+    run_id = store.start_run(kind, cycle, topic, model, state) if store else None
+    _current_run.set(run_id)
+    set_tags(run_id=run_id, kind=kind, cycle=cycle)
+    return Run(store, run_id, kind, cycle)
+
+def record_call(provider, model, latency, usage=None, cache_hit=False):
+    """Log one completion against the current run (called by llm_client)"""
+    store = default_store()
+    if store:
+        store.record_call(_current_run.get(), provider, model, latency, usage, cache_hit)
+
+def prompt_cache_summary(totals):
+    """One line on provider prompt caching from call_totals()"""
+    sent = totals["sent_prompt_tokens"]
+    cached = totals["cached_tokens"]
+    share = 100 * cached / sent if sent else 0
+    return (f"Prompt cache: {cached}/{sent} prompt tokens cached ({share:.0f}%), "
+            f"{sent - cached} uncached")
+
+def latest_output(cycle, kind=None):
+    """(file, output) of the newest finished run of a cycle, or (None, None)"""
+    store = default_store()
+    run = store.latest_run(cycle, kind) if store else None
+    return (run["file"], run["output"]) if run else (None, None)
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the run store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    latest = sub.add_parser("latest", help="latest output for a cycle")
+    latest.add_argument("cycle", type=int)
+    latest.add_argument("--kind")
+    recent = sub.add_parser("recent", help="newest runs")
+    recent.add_argument("--limit", type=int, default=20)
+    recent.add_argument("--kind")
+    recent.add_argument("--model")
+    calls = sub.add_parser("calls", help="API call totals")
+    calls.add_argument("--run", type=int, help="one run instead of all")
+    args = parser.parse_args()
+
+    store = RunStore()
+    if args.command == "latest":
+        run = store.latest_run(args.cycle, args.kind)
+        if run is None:
+            print(f"No finished run for cycle {args.cycle}")
+            sys.exit(1)
+        print(f"Run {run['id']} ({run['kind']}, {run['model']}) → {run['file']}\n")
+        print(run["output"] or "")
+    elif args.command == "recent":
+        for run in store.recent_runs(args.limit, args.kind, args.model):
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["started_at"]))
+            elapsed = f"{run['elapsed']:.1f}s" if run["elapsed"] is not None else "-"
+            print(f"{run['id']:>6}  {started}  cycle {run['cycle']!s:<5} {run['kind']:<9} "
+                  f"{run['status']:<8} {elapsed:>8}  {run['file'] or ''}")
+    else:
+        totals = store.call_totals(args.run)
+        print(f"Calls: {totals['calls']} ({totals['cache_hits']} cache hits)")
+        print(f"Tokens: {totals['prompt_tokens']} prompt / {totals['completion_tokens']} completion")
+        print(prompt_cache_summary(totals))
+        print(f"Latency: {totals['latency']:.1f}s total")
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+TRANSCRIPT SEARCH INDEX
+SQLite FTS5 (trigram) index over explorer transcripts, one row per section
+- Sections: reasoning, output, exploration, initial idea, gauntlet,
+  final idea, translation - split on the ===== header blocks every
+  explorer writes
+- Incremental: runs are indexed as they finish (see run_store.Run.finish);
+  `sync` picks up archived or changed files by mtime/size
+- Trigram tokens match any substring of 3+ characters, so a claim is found
+  wherever it appears, not only on word boundaries
+Lives in the run store database.
+"""
+
+import os
+import re
+import sys
+import time
+import sqlite3
+import argparse
+from pathlib import Path
+
+from run_store import RunStore, default_store
+from resynthesize import SOURCES, find_transcripts, read_transcript, cycle_number
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcript_sections (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL,
+    cycle INTEGER,
+    kind TEXT,
+    section TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transcript_sections_file ON transcript_sections (file);
+
+CREATE TABLE IF NOT EXISTS indexed_files (
+    file TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+"""
+
+# Older SQLite builds lack the trigram tokenizer; fall back to words
+FTS_TOKENIZERS = ("trigram", "unicode61")
+
+# A header is one line between two rules of '='
+HEADER = re.compile(r'^={20,}\n([^\n]+)\n={20,}$', re.MULTILINE)
+
+# Header text (uppercase substring) → section name; first match wins
+SECTION_NAMES = (
+    ("REASONING", "reasoning"),
+    ("FINAL IDEA", "final idea"),
+    ("TRANSLATION", "translation"),
+    ("PHASES 1-2", "exploration"),
+    ("PHASE 3", "initial idea"),
+    ("GAUNTLET", "gauntlet"),
+    ("OUTPUT", "output"),
+)
+
+# Output directory → run kind, for files indexed without a run
+KIND_BY_DIR = {"loop_outputs": "loop", "local_outputs": "explorer", "night_01": "unified"}
+
+# Snippet length in tokens - with trigrams, roughly characters (FTS5 max 64)
+SNIPPET_TOKENS = 64
+
+def section_name(header):
+    header = header.upper()
+    for marker, name in SECTION_NAMES:
+        if marker in header:
+            return name
+    return header.strip().rstrip(':').lower()
+
+def split_sections(text):
+    """[(section, body)] in file order; the title block and preamble are skipped"""
+    headers = list(HEADER.finditer(text))
+    sections = []
+    for i, header in enumerate(headers):
+        if header.start() == 0:
+            continue
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+        body = text[header.end():end].strip().rstrip('=').strip()
+        if body and body != "None":
+            sections.append((section_name(header.group(1)), body))
+    return sections
+
+def infer_kind(path):
+    path = Path(path)
+    if path.name.endswith("_gauntlet.txt"):
+        return "gauntlet"
+    return KIND_BY_DIR.get(path.parent.name)
+
+def fts_phrase(query):
+    """Plain text → one FTS5 phrase (no operator surprises from user input)"""
+    return '"' + query.replace('"', '""') + '"'
+
+class SearchIndex:
+    """FTS5 section index stored alongside the run store tables"""
+
+    def __init__(self, store):
+        self.store = store
+        conn = store.connection()
+        with conn:
+            conn.executescript(SCHEMA)
+            for tokenizer in FTS_TOKENIZERS:
+                try:
+                    conn.execute(
+                        "CREATE VIRTUAL TABLE IF NOT EXISTS transcript_fts "
+                        f"USING fts5(body, tokenize='{tokenizer}')"
+                    )
+                    break
+                except sqlite3.OperationalError:
+                    continue
+
+    def index_file(self, path, cycle=None, kind=None):
+        """(Re)index one transcript; returns the number of sections"""
+        path = str(path)
+        stat = os.stat(path)
+        sections = split_sections(read_transcript(path))
+        cycle = cycle if cycle is not None else cycle_number(path)
+        kind = kind or infer_kind(path)
+
+        conn = self.store.connection()
+        with conn:
+            self._forget(conn, path)
+            for section, body in sections:
+                row_id = conn.execute(
+                    "INSERT INTO transcript_sections (file, cycle, kind, section) "
+                    "VALUES (?, ?, ?, ?)",
+                    (path, cycle, kind, section)
+                ).lastrowid
+                conn.execute("INSERT INTO transcript_fts (rowid, body) VALUES (?, ?)",
+                             (row_id, body))
+            conn.execute(
+                "INSERT OR REPLACE INTO indexed_files (file, mtime, size, indexed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (path, stat.st_mtime, stat.st_size, time.time())
+            )
+        return len(sections)
+
+    def _forget(self, conn, path):
+        ids = [r[0] for r in conn.execute(
+            "SELECT id FROM transcript_sections WHERE file = ?", (path,)
+        )]
+        conn.executemany("DELETE FROM transcript_fts WHERE rowid = ?", [(i,) for i in ids])
+        conn.execute("DELETE FROM transcript_sections WHERE file = ?", (path,))
+
+    def sync(self, sources=SOURCES):
+        """Index new or changed transcripts, drop vanished ones. Returns (indexed, removed)."""
+        conn = self.store.connection()
+        known = {r[0]: (r[1], r[2]) for r in
+                 conn.execute("SELECT file, mtime, size FROM indexed_files")}
+        indexed = 0
+        seen = set()
+        for path in find_transcripts(sources):
+            path = str(path)
+            seen.add(path)
+            stat = os.stat(path)
+            if known.get(path) != (stat.st_mtime, stat.st_size):
+                self.index_file(path)
+                indexed += 1
+        # Only forget files under the directories we were asked to walk
+        roots = {str(Path(directory)) for directory, _ in sources}
+        removed = [f for f in known
+                   if f not in seen and str(Path(f).parent) in roots]
+        with conn:
+            for path in removed:
+                self._forget(conn, path)
+                conn.execute("DELETE FROM indexed_files WHERE file = ?", (path,))
+        return indexed, len(removed)
+
+    def search(self, query, section=None, kind=None, limit=20, raw=False, rank=False):
+        """
+        Matching sections, most recently indexed first: [{"cycle", "kind", "section", "file", "snippet"}].
+        rank=True orders by bm25 relevance instead, which has to score every
+        match - slower for common terms.
+        """
+        sql = ("SELECT s.cycle, s.kind, s.section, s.file, "
+               f"snippet(transcript_fts, 0, '»', '«', '…', {SNIPPET_TOKENS}) AS snippet "
+               "FROM transcript_fts JOIN transcript_sections s ON s.id = transcript_fts.rowid "
+               "WHERE transcript_fts MATCH ?")
+        params = [query if raw else fts_phrase(query)]
+        if section:
+            sql += " AND s.section = ?"
+            params.append(section)
+        if kind:
+            sql += " AND s.kind = ?"
+            params.append(kind)
+        sql += " ORDER BY rank" if rank else " ORDER BY transcript_fts.rowid DESC"
+        sql += " LIMIT ?"
+        params.append(limit)
+        return [dict(r) for r in self.store.connection().execute(sql, params).fetchall()]
+
+_default_index = None
+
+def default_index():
+    """Index in the default run store, or None when RUN_STORE is off"""
+    global _default_index
+    store = default_store()
+    if store is None:
+        return None
+    if _default_index is None or _default_index.store is not store:
+        _default_index = SearchIndex(store)
+    return _default_index
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search explorer transcripts")
+    sub = parser.add_subparsers(dest="command", required=True)
+    query = sub.add_parser("query", help="find transcripts containing text")
+    query.add_argument("text")
+    query.add_argument("--section", help="reasoning, output, final idea, translation, ...")
+    query.add_argument("--kind", help="loop, explorer, gauntlet, unified")
+    query.add_argument("--limit", type=int, default=20)
+    query.add_argument("--raw", action="store_true", help="text is an FTS5 query expression")
+    query.add_argument("--rank", action="store_true", help="best match first instead of most recently indexed")
+    sub.add_parser("sync", help="index new and changed transcripts")
+    args = parser.parse_args()
+
+    index = SearchIndex(RunStore())
+
+    if args.command == "sync":
+        start = time.monotonic()
+        indexed, removed = index.sync()
+        print(f"✅ Indexed {indexed} transcripts, removed {removed} "
+              f"({time.monotonic() - start:.1f}s)")
+    else:
+        if len(args.text) < 3 and not args.raw:
+            print("Queries need at least 3 characters (trigram index)")
+            sys.exit(1)
+        start = time.monotonic()
+        hits = index.search(args.text, args.section, args.kind, args.limit, args.raw, args.rank)
+        elapsed_ms = (time.monotonic() - start) * 1000
+        for hit in hits:
+            print(f"cycle {hit['cycle']!s:<5} {hit['kind'] or '-':<9} {hit['section']:<13} {hit['file']}")
+            print(f"    {' '.join(hit['snippet'].split())}")
+        print(f"\n{len(hits)} hits in {elapsed_ms:.1f} ms")
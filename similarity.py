@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+LOCAL TEXT SIMILARITY
+Cheap, network-free scores for comparing ideas
+- Word-set Jaccard / novelty between two texts
+- Character n-gram cosine, and a plateau monitor for idea chains
+- MinHash signatures + banded LSH for near-duplicate lookup in a corpus
+"""
+
+import re
+import struct
+import hashlib
+import math
+import random
+from collections import Counter, defaultdict
+
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+def tokenize(text):
+    """Lowercase word tokens"""
+    return WORD_PATTERN.findall(text.lower())
+
+def token_set_jaccard(a, b):
+    """Jaccard similarity of the two texts' word sets (0.0 - 1.0)"""
+    set_a = set(tokenize(a))
+    set_b = set(tokenize(b))
+    if not set_a and not set_b:
+        return 1.0
+    return len(set_a & set_b) / len(set_a | set_b)
+
+def novelty(before, after):
+    """How far an idea moved: 1.0 = nothing shared, 0.0 = same words"""
+    return 1.0 - token_set_jaccard(before, after)
+
+def char_ngram_cosine(a, b, n=3):
+    """Cosine similarity of character n-gram counts (catches rewording)"""
+    counts_a = Counter(_ngrams(a, n))
+    counts_b = Counter(_ngrams(b, n))
+    if not counts_a or not counts_b:
+        return 1.0 if counts_a == counts_b else 0.0
+    dot = sum(count * counts_b[gram] for gram, count in counts_a.items())
+    norm = math.sqrt(sum(c * c for c in counts_a.values()) *
+                     sum(c * c for c in counts_b.values()))
+    return dot / norm
+
+def idea_similarity(a, b):
+    """Mean of word-set Jaccard and char trigram cosine (0.0 - 1.0)"""
+    return (token_set_jaccard(a, b) + char_ngram_cosine(a, b)) / 2
+
+class ConvergenceMonitor:
+    """
+    Watches consecutive ideas in a chain. Once `patience` steps in a row
+    come back at least `threshold` similar to their input (after
+    `min_steps`), the chain has plateaued: the first `max_reseeds` plateaus
+    signal "reseed", the next one "stop". Failed steps don't count.
+    """
+
+    def __init__(self, threshold=0.6, patience=2, min_steps=4, max_reseeds=1):
+        self.threshold = threshold
+        self.patience = patience
+        self.min_steps = min_steps
+        self.max_reseeds = max_reseeds
+        self.steps = 0
+        self.streak = 0
+        self.reseeds = 0
+
+    def observe(self, before, after, failed=False):
+        """Score one step; returns its similarity (None for a failed step)"""
+        self.steps += 1
+        if failed:
+            return None
+        similarity = idea_similarity(before, after)
+        self.streak = self.streak + 1 if similarity >= self.threshold else 0
+        return similarity
+
+    def signal(self):
+        """None, "reseed" or "stop" after the latest step"""
+        if self.streak < self.patience or self.steps < self.min_steps:
+            return None
+        self.streak = 0
+        if self.reseeds < self.max_reseeds:
+            self.reseeds += 1
+            return "reseed"
+        return "stop"
+
+    def state(self):
+        """Counters to checkpoint (the thresholds come from config)"""
+        return {"steps": self.steps, "streak": self.streak, "reseeds": self.reseeds}
+
+    def load_state(self, state):
+        self.steps = state["steps"]
+        self.streak = state["streak"]
+        self.reseeds = state["reseeds"]
+
+# ============================================================================
+# MINHASH
+# ============================================================================
+
+# Mersenne prime for the (a*x + b) mod p permutation family
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+MINHASH_PERMUTATIONS = 128
+MINHASH_SEED = 1
+
+def _ngrams(text, n):
+    normalized = " ".join(tokenize(text))
+    if len(normalized) <= n:
+        return [normalized] if normalized else []
+    return [normalized[i:i + n] for i in range(len(normalized) - n + 1)]
+
+def char_shingles(text, n=3):
+    """Character n-grams of the normalized words (robust to inflection)"""
+    return set(_ngrams(text, n))
+
+def _permutations(num_perm, seed):
+    rng = random.Random(seed)
+    return [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)]
+
+_PERMUTATIONS = _permutations(MINHASH_PERMUTATIONS, MINHASH_SEED)
+
+def minhash(text, num_perm=MINHASH_PERMUTATIONS):
+    """MinHash signature (tuple of num_perm ints) of the text's char shingles"""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little")
+        for s in char_shingles(text)
+    ] or [0]
+    return tuple(
+        min((a * h + b) % MERSENNE_PRIME for h in hashes) & MAX_HASH
+        for a, b in _PERMUTATIONS[:num_perm]
+    )
+
+def signature_similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+def pack_signature(signature):
+    return struct.pack(f"<{len(signature)}I", *signature)
+
+def unpack_signature(blob):
+    return struct.unpack(f"<{len(blob) // 4}I", blob)
+
+class MinHashLSH:
+    """
+    Banded LSH over MinHash signatures: texts sharing any band land in the
+    same bucket and become candidates; candidates are then scored on the
+    full signature. 42 bands x 3 rows finds >99% of pairs at 0.5 similarity
+    and under 1% of unrelated sentences (~0.05).
+    """
+
+    def __init__(self, bands=42, rows=3):
+        self.bands = bands
+        self.rows = rows
+        self.buckets = [defaultdict(list) for _ in range(bands)]
+        self.signatures = {}
+
+    def _band_keys(self, signature):
+        return [tuple(signature[i * self.rows:(i + 1) * self.rows]) for i in range(self.bands)]
+
+    def add(self, key, signature):
+        self.signatures[key] = signature
+        for band, band_key in zip(self.buckets, self._band_keys(signature)):
+            band[band_key].append(key)
+
+    def query(self, signature, threshold):
+        """[(similarity, key)] at or above threshold, most similar first"""
+        candidates = set()
+        for band, band_key in zip(self.buckets, self._band_keys(signature)):
+            candidates.update(band.get(band_key, ()))
+        scored = [(signature_similarity(signature, self.signatures[k]), k) for k in candidates]
+        return sorted((s for s in scored if s[0] >= threshold), reverse=True)
+
+    def __len__(self):
+        return len(self.signatures)
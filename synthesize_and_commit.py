@@ -6,105 +6,135 @@ Extracts paths explored, boundary types, routing success
 
 import sys
 import re
-import subprocess
 from pathlib import Path
 
-def extract_boundary(content):
-    """Extract what Explorer investigated"""
-    
-    match = re.search(
-        r'What did you start trying to verify\?[^\n]*\n+([^\n]+)',
-        content,
-        re.IGNORECASE
-    )
-    
-    if match:
-        boundary = match.group(1).strip()
-        boundary = re.sub(r'^[-*•]\s*', '', boundary)
-        return boundary[:100]
-    
-    lines = content.split('\n')
-    for line in lines:
+from commit_queue import CommitQueue, GitError
+from run_store import default_store
+
+# Repo the synthesis feed is committed to, and its branch
+FEED_REPO = '..'
+FEED_BRANCH = 'main'
+
+PATH_MARKERS = {
+    'PATH A': 'Authority',
+    'PATH B': 'Measurement', 
+    'PATH C': 'Historical',
+    'PATH D': 'Derivation',
+    'PATH E': 'Consensus'
+}
+
+BOUNDARY_KEYWORDS = {
+    'hard': 'Hard boundary',
+    'soft': 'Soft boundary',
+    'circular': 'Circular verification',
+    'authority': 'Authority wall',
+    'permeable': 'Permeable boundary',
+    'route around': 'Routing found'
+}
+
+INSIGHT_KEYWORDS = ('route around', 'routing', 'beyond', 'wall', 'topology', 'landscape')
+
+BOUNDARY_QUESTION = 'What did you start trying to verify?'
+
+# Every marker, lowercased: the transcript is case-folded once and each
+# marker located with str.find, which runs at C speed
+MARKERS = tuple(
+    dict.fromkeys([m.lower() for m in PATH_MARKERS] + list(BOUNDARY_KEYWORDS) +
+                  list(INSIGHT_KEYWORDS) + [BOUNDARY_QUESTION.lower()])
+)
+BOUNDARY_LINE = re.compile(r'What did you start trying to verify\?[^\n]*\n+([^\n]+)', re.IGNORECASE)
+BULLET = re.compile(r'^[-*•]\s*')
+
+def _first_long_line(content):
+    """Fallback boundary: first line over 20 chars not starting with '='"""
+    pos = 0
+    while pos <= len(content):
+        end = content.find('\n', pos)
+        if end == -1:
+            end = len(content)
+        line = content[pos:end]
         if len(line.strip()) > 20 and not line.startswith('='):
-            return line.strip()[:100]
+            return line.strip()[:100], pos
+        pos = end + 1
+    return None, None
+
+def scan_transcript(content):
+    """
+    Everything synthesis needs from a transcript, from one case-fold.
+    Returns {"boundary", "boundary_offset", "paths", "boundary_types",
+    "insights", "offsets"} where offsets maps each marker found (lowercase)
+    to its first position.
+    """
+    
+    folded = content.lower()
+    offsets = {}
+    for marker in MARKERS:
+        position = folded.find(marker)
+        if position != -1:
+            offsets[marker] = position
+    
+    boundary, boundary_offset = None, None
+    question = offsets.get(BOUNDARY_QUESTION.lower())
+    if question is not None:
+        # lower() can change the length of a few exotic characters
+        if len(folded) == len(content):
+            line = BOUNDARY_LINE.match(content, question)
+        else:
+            line = BOUNDARY_LINE.search(content)
+        if line:
+            boundary = BULLET.sub('', line.group(1).strip())[:100]
+            boundary_offset = line.start(1)
+    if boundary is None:
+        boundary, boundary_offset = _first_long_line(content)
+    if boundary is None:
+        boundary = "Verification topology explored"
+    
+    found = offsets.__contains__
+    insights = []
+    if found('route around') or found('routing'):
+        insights.append('Found alternative route')
+    if found('beyond') and found('wall'):
+        insights.append('Explored beyond wall')
+    if found('topology') or found('landscape'):
+        insights.append('Mapped topology')
     
-    return "Verification topology explored"
+    return {
+        "boundary": boundary,
+        "boundary_offset": boundary_offset,
+        "paths": [name for marker, name in PATH_MARKERS.items() if found(marker.lower())][:3],
+        "boundary_types": [kind for keyword, kind in BOUNDARY_KEYWORDS.items() if found(keyword)][:3],
+        "insights": insights,
+        "offsets": offsets
+    }
+
+def extract_boundary(content):
+    """Extract what Explorer investigated"""
+    return scan_transcript(content)["boundary"]
 
 def extract_paths(content):
-    """Extract which verification paths were explored"""
-    
-    paths_found = []
-    path_keywords = {
-        'PATH A': 'Authority',
-        'PATH B': 'Measurement', 
-        'PATH C': 'Historical',
-        'PATH D': 'Derivation',
-        'PATH E': 'Consensus'
-    }
-    
-    content_upper = content.upper()
-    for path_marker, path_name in path_keywords.items():
-        if path_marker in content_upper:
-            paths_found.append(path_name)
-    
-    return paths_found[:3]  # Top 3 paths
+    """Extract which verification paths were explored (top 3)"""
+    return scan_transcript(content)["paths"]
 
 def extract_boundary_types(content):
     """Detect types of boundaries encountered"""
-    
-    boundary_types = []
-    type_keywords = {
-        'hard': 'Hard boundary',
-        'soft': 'Soft boundary',
-        'circular': 'Circular verification',
-        'authority': 'Authority wall',
-        'permeable': 'Permeable boundary',
-        'route around': 'Routing found'
-    }
-    
-    content_lower = content.lower()
-    for keyword, boundary_type in type_keywords.items():
-        if keyword in content_lower:
-            boundary_types.append(boundary_type)
-    
-    return boundary_types[:3]
+    return scan_transcript(content)["boundary_types"]
 
 def detect_topology_insight(content):
     """Check if Explorer found topology insights"""
-    
-    insights = []
-    
-    if 'route around' in content.lower() or 'routing' in content.lower():
-        insights.append('Found alternative route')
-    
-    if 'beyond' in content.lower() and 'wall' in content.lower():
-        insights.append('Explored beyond wall')
-    
-    if 'topology' in content.lower() or 'landscape' in content.lower():
-        insights.append('Mapped topology')
-    
-    return insights
+    return scan_transcript(content)["insights"]
 
-def synthesize(explorer_file, cycle_num):
-    """Create synthesis from Explorer output"""
-    
-    print(f"\n{'='*70}")
-    print(f"TOPOLOGY SYNTHESIS - CYCLE {cycle_num}")
-    print(f"{'='*70}\n")
-    
-    with open(explorer_file, 'r') as f:
-        content = f.read()
-    
-    # Extract components
-    boundary = extract_boundary(content)
-    paths = extract_paths(content)
-    boundary_types = extract_boundary_types(content)
-    insights = detect_topology_insight(content)
-    
-    print(f"Boundary: {boundary}")
-    print(f"Paths explored: {', '.join(paths) if paths else 'Single path'}")
-    print(f"Boundary types: {', '.join(boundary_types) if boundary_types else 'Standard wall'}")
-    print(f"Insights: {', '.join(insights) if insights else 'Wall hit'}\n")
+def synthesize_content(content, cycle_num):
+    """
+    Pure synthesis of one transcript: no printing, no file access.
+    Returns {"title", "body", "boundary", "paths", "boundary_types",
+    "insights", "confidence"}.
+    """
+    
+    scan = scan_transcript(content)
+    boundary = scan["boundary"]
+    paths = scan["paths"]
+    boundary_types = scan["boundary_types"]
+    insights = scan["insights"]
     
     # Create TITLE
     if insights:
@@ -131,10 +161,40 @@ def synthesize(explorer_file, cycle_num):
         body_parts.append(f"TOPOLOGY: {', '.join(insights)}")
     
     # Confidence based on exploration depth
-    confidence = 0.70 + (len(paths) * 0.05) + (len(insights) * 0.10)
-    body_parts.append(f"CONFIDENCE: {min(confidence, 0.99):.2f}")
+    confidence = min(0.70 + (len(paths) * 0.05) + (len(insights) * 0.10), 0.99)
+    body_parts.append(f"CONFIDENCE: {confidence:.2f}")
+    
+    return {
+        "title": title,
+        "body": "\n".join(body_parts),
+        "boundary": boundary,
+        "paths": paths,
+        "boundary_types": boundary_types,
+        "insights": insights,
+        "confidence": round(confidence, 2)
+    }
+
+def synthesize(explorer_file, cycle_num):
+    """Create synthesis from Explorer output"""
     
-    body = "\n".join(body_parts)
+    print(f"\n{'='*70}")
+    print(f"TOPOLOGY SYNTHESIS - CYCLE {cycle_num}")
+    print(f"{'='*70}\n")
+    
+    with open(explorer_file, 'r') as f:
+        content = f.read()
+    
+    result = synthesize_content(content, cycle_num)
+    title, body = result["title"], result["body"]
+    
+    store = default_store()
+    if store:
+        store.record_synthesis(cycle_num, result, file=explorer_file)
+    
+    print(f"Boundary: {result['boundary']}")
+    print(f"Paths explored: {', '.join(result['paths']) if result['paths'] else 'Single path'}")
+    print(f"Boundary types: {', '.join(result['boundary_types']) if result['boundary_types'] else 'Standard wall'}")
+    print(f"Insights: {', '.join(result['insights']) if result['insights'] else 'Wall hit'}\n")
     
     print("="*70)
     print("TITLE (Atom feed):")
@@ -145,21 +205,21 @@ def synthesize(explorer_file, cycle_num):
     
     return title, body
 
-def commit_to_github(title, body):
-    """Commit synthesis to GitHub"""
+def commit_to_github(title, body, queue=None):
+    """
+    Commit synthesis to GitHub through a CommitQueue.
+    Pass a shared queue to coalesce many cycles into one push; without one,
+    this cycle gets a queue of its own.
+    """
     
     print("📤 Committing to GitHub...")
     
+    own_queue = queue is None
+    if own_queue:
+        queue = CommitQueue(repo_dir=FEED_REPO, batch_size=1, branch=FEED_BRANCH)
+    
     try:
-        subprocess.run(['git', 'checkout', 'main'], check=True, cwd='..')
-        subprocess.run(['git', 'add', '-A'], check=True, cwd='..')
-        subprocess.run([
-            'git', 'commit',
-            '--allow-empty',
-            '-m', title,
-            '-m', body
-        ], check=True, cwd='..')
-        subprocess.run(['git', 'push'], check=True, cwd='..')
+        queue.submit(title, body).result()
         
         print("✅ Pushed to GitHub\n")
         print("="*70)
@@ -168,17 +228,23 @@ def commit_to_github(title, body):
         
         return True
         
-    except subprocess.CalledProcessError as e:
+    except GitError as e:
         print(f"❌ Git error: {e}")
         return False
+    
+    finally:
+        if own_queue:
+            queue.close()
 
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python3 synthesize_and_commit.py <explorer_file> <cycle_num>")
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if len(args) < 2:
+        print("Usage: python3 synthesize_and_commit.py <explorer_file> <cycle_num> [--no-commit]")
         sys.exit(1)
     
-    explorer_file = sys.argv[1]
-    cycle_num = int(sys.argv[2])
+    explorer_file = args[0]
+    cycle_num = int(args[1])
     
     title, body = synthesize(explorer_file, cycle_num)
-    commit_to_github(title, body)
+    if "--no-commit" not in sys.argv:
+        commit_to_github(title, body)
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+CALL TELEMETRY
+One JSONL row per chat completion, written by llm_client
+- Tokens: prompt, completion, reasoning, provider-cached
+- Timing: time to first token (streams), total latency
+- Retries and hedges the request policy spent on the call
+- Tags from the calling context: run, kind, cycle, phase, gauntlet iteration
+`report` sums it all per cycle and phase, so it's clear where the seconds
+and tokens of a cycle went.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from config.api_config import TELEMETRY_PATH, TELEMETRY_ENABLED
+
+# Tags for calls made in this thread / task (replaced, never mutated)
+_tags = ContextVar("telemetry_tags", default={})
+
+# Metrics of the completion in flight in this thread / task
+_current_call = ContextVar("telemetry_call", default=None)
+
+def tags():
+    return _tags.get()
+
+def set_tags(**new_tags):
+    """Replace this context's tags (a new run starts from a clean slate)"""
+    _tags.set(new_tags)
+
+@contextmanager
+def phase(name, **extra):
+    """Tag calls inside the block with a phase (and e.g. iteration=3)"""
+    token = _tags.set({**_tags.get(), "phase": name, **extra})
+    try:
+        yield
+    finally:
+        _tags.reset(token)
+
+def usage_counts(usage):
+    """(prompt, completion, total, reasoning, cached) tokens; None where not reported"""
+    counts = tuple(getattr(usage, field, None)
+                   for field in ("prompt_tokens", "completion_tokens", "total_tokens"))
+    completion_details = getattr(usage, "completion_tokens_details", None)
+    reasoning = getattr(completion_details, "reasoning_tokens", None)
+    prompt_details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(prompt_details, "cached_tokens", None)
+    if cached is None:
+        # DeepSeek's own API reports it at the top level
+        cached = getattr(usage, "prompt_cache_hit_tokens", None)
+    return counts + (reasoning, cached)
+
+class CallMetrics:
+    """What one completion cost; filled in by llm_client and request_policy"""
+
+    def __init__(self, provider, model, stream=False):
+        self.provider = provider
+        self.model = model
+        self.stream = stream
+        self.tags = _tags.get()
+        self.start = time.monotonic()
+        self.ttft = None
+        self.latency = None
+        self.usage = None
+        self.cache_hit = False
+        self.stopped_early = False
+        self.retries = 0
+        self.hedges = 0
+        self.error = None
+
+    def first_token(self):
+        if self.ttft is None:
+            self.ttft = time.monotonic() - self.start
+
+    def finish(self, usage=None, cache_hit=False, stopped_early=False):
+        self.latency = time.monotonic() - self.start
+        self.usage = usage
+        self.cache_hit = cache_hit
+        self.stopped_early = stopped_early
+        return self.latency
+
+    def as_row(self):
+        prompt, completion, total, reasoning, cached = usage_counts(self.usage)
+        return {
+            "ts": round(time.time(), 3),
+            **self.tags,
+            "provider": self.provider,
+            "model": self.model,
+            "stream": self.stream,
+            "cache_hit": self.cache_hit,
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+            "prompt_tokens": prompt,
+            "completion_tokens": completion,
+            "reasoning_tokens": reasoning,
+            "cached_tokens": cached,
+            "total_tokens": total,
+            "ttft": None if self.ttft is None else round(self.ttft, 3),
+            "latency": round(self.latency, 3),
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "stopped_early": self.stopped_early,
+        }
+
+def note_retry():
+    """Called by the request policy before each retry of the current call"""
+    call = _current_call.get()
+    if call is not None:
+        call.retries += 1
+
+def note_hedge():
+    """Called by the request policy when it fires a hedge for the current call"""
+    call = _current_call.get()
+    if call is not None:
+        call.hedges += 1
+
+@contextmanager
+def measure(provider, model, stream=False):
+    """Time one completion; its row is written when the block exits (even on error)"""
+    call = CallMetrics(provider, model, stream)
+    token = _current_call.set(call)
+    try:
+        yield call
+    except BaseException as e:
+        call.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_call.reset(token)
+        if call.latency is None:
+            call.finish()
+        write_row(call.as_row())
+
+# ============================================================================
+# METRICS FILE
+# ============================================================================
+
+_file = None
+_file_lock = threading.Lock()
+
+def write_row(row, path=TELEMETRY_PATH):
+    """Append one row; each row is a single write, so processes can share the file"""
+    global _file
+    if not TELEMETRY_ENABLED:
+        return
+    line = json.dumps(row, ensure_ascii=False) + "\n"
+    try:
+        with _file_lock:
+            if _file is None:
+                _file = open(path, "a", encoding="utf-8")
+            _file.write(line)
+            _file.flush()
+    except OSError as e:
+        print(f"⚠️  Metrics not written ({e})")
+
+def read_rows(path=TELEMETRY_PATH):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))]
+
+def summarize(rows, by=("cycle", "phase")):
+    """{group key tuple: totals} over rows, grouped by the given tags"""
+    groups = defaultdict(lambda: {
+        "calls": 0, "errors": 0, "cache_hits": 0, "retries": 0, "hedges": 0,
+        "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0,
+        "reasoning_tokens": 0, "latency": 0.0, "latencies": [], "ttfts": []
+    })
+    for row in rows:
+        group = groups[tuple(row.get(tag) for tag in by)]
+        group["calls"] += 1
+        group["errors"] += row["status"] != "ok"
+        group["cache_hits"] += bool(row["cache_hit"])
+        group["retries"] += row["retries"]
+        group["hedges"] += row["hedges"]
+        # llm_cache hits replay the original usage; only count what was sent
+        if not row["cache_hit"]:
+            for field in ("prompt_tokens", "cached_tokens", "completion_tokens",
+                          "reasoning_tokens"):
+                group[field] += row.get(field) or 0
+            group["latencies"].append(row["latency"])
+            if row.get("ttft") is not None:
+                group["ttfts"].append(row["ttft"])
+        group["latency"] += row["latency"]
+    for group in groups.values():
+        latencies = group.pop("latencies")
+        ttfts = group.pop("ttfts")
+        group["p50"] = _percentile(latencies, 50)
+        group["p95"] = _percentile(latencies, 95)
+        group["ttft_p50"] = _percentile(ttfts, 50)
+    return dict(groups)
+
+def _sort_key(key):
+    return tuple((value is None, str(value).zfill(8) if isinstance(value, int) else str(value))
+                 for value in key)
+
+def format_report(summary, by=("cycle", "phase")):
+    def seconds(value):
+        return "-" if value is None else f"{value:.1f}"
+
+    header = "".join(f"{tag:<12}" for tag in by)
+    lines = [header + f"{'calls':>6} {'err':>4} {'retry':>5} {'prompt':>9} {'cached':>9} "
+             f"{'compl':>8} {'reason':>8} {'sec':>8} {'p50':>6} {'p95':>6} {'ttft':>6}"]
+    for key in sorted(summary, key=_sort_key):
+        g = summary[key]
+        lines.append(
+            "".join(f"{'-' if value is None else str(value):<12}" for value in key) +
+            f"{g['calls']:>6} {g['errors']:>4} {g['retries']:>5} {g['prompt_tokens']:>9} "
+            f"{g['cached_tokens']:>9} {g['completion_tokens']:>8} {g['reasoning_tokens']:>8} "
+            f"{g['latency']:>8.1f} {seconds(g['p50']):>6} {seconds(g['p95']):>6} "
+            f"{seconds(g['ttft_p50']):>6}"
+        )
+    return "\n".join(lines)
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize per-call metrics")
+    parser.add_argument("--file", default=TELEMETRY_PATH, help="metrics JSONL")
+    parser.add_argument("--cycle", type=int, help="only this cycle")
+    parser.add_argument("--by", default="cycle,phase",
+                        help="comma-separated tags to group by (cycle, phase, iteration, kind, model, ...)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.file):
+        print(f"No metrics yet ({args.file})")
+        sys.exit(1)
+
+    by = tuple(tag.strip() for tag in args.by.split(",") if tag.strip())
+    rows = [r for r in read_rows(args.file) if args.cycle is None or r.get("cycle") == args.cycle]
+    print(format_report(summarize(rows, by), by))
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+COMMIT QUEUE TESTS
+commit_queue.CommitQueue against a temporary bare remote: batching by
+count and by timeout, non-fast-forward retry, hook refusals failing at
+once, and local commits the queue didn't write surviving a rejected push.
+
+    python3 -m pytest -q test_commit_queue.py
+"""
+
+import os
+import sys
+import subprocess
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from commit_queue import CommitQueue, GitError
+
+def git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+def clone(remote, path):
+    git(remote.parent, "clone", "-q", str(remote), str(path))
+    git(path, "config", "user.name", "Test")
+    git(path, "config", "user.email", "test@example.com")
+    return path
+
+def commit_file(repo, name, message):
+    (repo / name).write_text(name)
+    git(repo, "add", name)
+    git(repo, "commit", "-q", "-m", message)
+
+def remote_log(remote):
+    return git(remote, "log", "--format=%s", "main").splitlines()
+
+@pytest.fixture
+def remote(tmp_path):
+    remote = tmp_path / "remote.git"
+    git(tmp_path, "init", "-q", "--bare", "-b", "main", str(remote))
+    seed = clone(remote, tmp_path / "seed")
+    git(seed, "checkout", "-q", "-b", "main")
+    commit_file(seed, "README", "init")
+    git(seed, "push", "-q", "origin", "main")
+    return remote
+
+@pytest.fixture
+def repo(remote, tmp_path):
+    return clone(remote, tmp_path / "work")
+
+def test_flushes_by_count(repo, remote):
+    queue = CommitQueue(repo, batch_size=3, max_wait=60)
+    futures = [queue.submit(f"cycle {n}") for n in range(3)]
+    shas = [f.result(timeout=30) for f in futures]
+    queue.close()
+
+    assert queue.stats()["flushes"] == 1
+    assert queue.stats()["pushes"] == 1
+    assert remote_log(remote)[:3] == ["cycle 2", "cycle 1", "cycle 0"]
+    assert len(set(shas)) == 3
+
+def test_flushes_by_timeout(repo, remote):
+    queue = CommitQueue(repo, batch_size=100, max_wait=0.2)
+    futures = [queue.submit(f"cycle {n}") for n in range(2)]
+    for future in futures:
+        future.result(timeout=30)
+    assert queue.stats()["flushes"] == 1
+    queue.close()
+
+    assert remote_log(remote)[:2] == ["cycle 1", "cycle 0"]
+
+def test_rejected_push_is_rebuilt_on_the_remote(repo, remote, tmp_path):
+    other = clone(remote, tmp_path / "other")
+    commit_file(other, "theirs", "their commit")
+    git(other, "push", "-q", "origin", "main")
+
+    queue = CommitQueue(repo, batch_size=1, max_wait=60)
+    queue.submit("cycle 1").result(timeout=30)
+    queue.close()
+
+    assert queue.stats()["push_rejections"] == 1
+    assert remote_log(remote)[:3] == ["cycle 1", "their commit", "init"]
+    assert git(repo, "rev-parse", "main") == git(remote, "rev-parse", "main")
+    # The checked-out tree follows the rebuilt branch
+    assert (repo / "theirs").exists()
+
+def test_rejected_push_keeps_local_unpushed_commits(repo, remote, tmp_path):
+    other = clone(remote, tmp_path / "other")
+    commit_file(other, "theirs", "their commit")
+    git(other, "push", "-q", "origin", "main")
+    commit_file(repo, "mine", "my unpushed commit")
+
+    queue = CommitQueue(repo, batch_size=1, max_wait=60)
+    future = queue.submit("cycle 1")
+    with pytest.raises(GitError):
+        future.result(timeout=30)
+    queue.close()
+
+    log = git(repo, "log", "--format=%s", "main").splitlines()
+    assert log[:3] == ["cycle 1", "my unpushed commit", "init"]
+    assert (repo / "mine").exists()
+    assert remote_log(remote)[0] == "their commit"
+
+def test_commits_with_paths_use_the_index(repo, remote):
+    (repo / "report.txt").write_text("cycle 1")
+    queue = CommitQueue(repo, batch_size=1, max_wait=60)
+    queue.submit("cycle 1", paths=["report.txt"]).result(timeout=30)
+    queue.close()
+
+    assert remote_log(remote)[0] == "cycle 1"
+    assert git(remote, "show", "main:report.txt") == "cycle 1"
+
+def test_hook_refusal_fails_without_retrying(repo, remote):
+    hook = remote / "hooks" / "pre-receive"
+    hook.write_text("#!/bin/sh\necho 'no pushes today' >&2\nexit 1\n")
+    hook.chmod(0o755)
+
+    queue = CommitQueue(repo, batch_size=1, max_wait=60)
+    with pytest.raises(GitError, match="remote rejected"):
+        queue.submit("cycle 1").result(timeout=30)
+    queue.close()
+
+    assert queue.stats()["push_rejections"] == 0
+    assert remote_log(remote) == ["init"]
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+IMPORT BUDGET
+The quick commands (synthesize, resynthesize, search, the curious CLI
+itself) must start instantly: importing them may not pull in the LLM
+client stack, and their own imports must fit in IMPORT_BUDGET_MS.
+Measured with `python -X importtime`, less what a bare interpreter
+imports anyway.
+
+    python3 -m pytest -q test_import_budget.py
+    python3 test_import_budget.py               # prints each module's cost
+"""
+
+import os
+import sys
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Cumulative import time allowed per quick module (ms); generous enough for
+# a cold disk cache, far below the ~700ms of openai + httpx + pydantic
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "150"))
+
+QUICK_MODULES = ("curious", "synthesize_and_commit", "resynthesize", "search_index")
+
+# Packages only the explorers may load
+HEAVY_PACKAGES = ("openai", "httpx", "httpcore", "anyio", "pydantic")
+
+def import_times(statement):
+    """{top-level module: cumulative µs} for what `statement` imports"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=HERE, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # the column header
+        # Nested imports are indented; the top-level line holds the total
+        if not name.startswith(" " * 2):
+            times[name.strip()] = int(cumulative)
+    return times
+
+def import_cost(module):
+    """(ms spent importing `module`, every top-level module it loaded)"""
+    baseline = import_times("pass")
+    times = {name: us for name, us in import_times(f"import {module}").items()
+             if name not in baseline}
+    return sum(times.values()) / 1000, set(times)
+
+def _loaded(module):
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys, {module}; print('\\n'.join(sys.modules))"],
+        cwd=HERE, capture_output=True, text=True, check=True
+    )
+    return set(result.stdout.split())
+
+def test_quick_commands_skip_the_llm_stack():
+    for module in QUICK_MODULES:
+        heavy = {name.split(".")[0] for name in _loaded(module)} & set(HEAVY_PACKAGES)
+        assert not heavy, f"importing {module} loads {', '.join(sorted(heavy))}"
+
+def test_quick_commands_fit_the_budget():
+    for module in QUICK_MODULES:
+        # Best of three, so one slow disk read doesn't fail the run
+        ms = min(import_cost(module)[0] for _ in range(3))
+        assert ms <= IMPORT_BUDGET_MS, f"importing {module} took {ms:.0f}ms (budget {IMPORT_BUDGET_MS:.0f}ms)"
+
+if __name__ == "__main__":
+    for module in QUICK_MODULES:
+        ms, loaded = import_cost(module)
+        print(f"{module:<24} {ms:6.1f}ms  {', '.join(sorted(loaded))}")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+JOB QUEUE TESTS
+job_queue.JobQueue on a temporary database: claim order and leases,
+reclaiming expired leases and dead local workers, failing and requeueing
+up to max_attempts, retry, and Job.step checkpoints.
+
+    python3 -m pytest -q test_job_queue.py
+"""
+
+import os
+import sys
+import time
+import socket
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from job_queue import JobQueue
+from llm_client import LLMError
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.db"), lease=60, max_attempts=2)
+
+def status(queue, job_id):
+    return queue.get([job_id])[0]["status"]
+
+def test_claims_oldest_first_and_leases_it(queue):
+    first, second = queue.enqueue([1, 2])
+    job = queue.claim("host-a:1")
+    assert (job.id, job.cycle, job.attempt) == (first, 1, 1)
+
+    row = queue.get([first])[0]
+    assert row["status"] == "running" and row["worker"] == "host-a:1"
+    assert row["lease_until"] > time.time() + 50
+    assert queue.claim("host-b:1").id == second
+    assert queue.claim("host-c:1") is None
+
+def test_enqueue_skips_pending_cycles(queue):
+    assert len(queue.enqueue([1, 2])) == 2
+    assert queue.enqueue([1, 2, 3]) == [3]
+    job = queue.claim("host-a:1")
+    queue.complete(job.id, "out.txt")
+    assert len(queue.enqueue([1])) == 1
+    assert queue.enqueue([1], explorer="basic") != []
+
+def test_expired_lease_is_reclaimed(queue):
+    (job_id,) = queue.enqueue([1])
+    queue.claim("host-a:1")
+    assert queue.claim("host-b:1") is None
+
+    queue.connection().execute("UPDATE jobs SET lease_until = ? WHERE id = ?",
+                               (time.time() - 1, job_id))
+    queue.connection().commit()
+    job = queue.claim("host-b:1")
+    assert job.id == job_id and job.attempt == 2
+    assert not queue.renew(job_id, "host-a:1")
+    assert queue.renew(job_id, "host-b:1")
+
+def test_dead_local_worker_is_reclaimed_at_once(queue):
+    (job_id,) = queue.enqueue([1])
+    # The largest pid is never in use
+    queue.claim(f"{socket.gethostname()}:{2 ** 22 + 1}")
+    assert queue.claim("host-b:1").id == job_id
+
+def test_live_local_worker_keeps_its_job(queue):
+    queue.enqueue([1])
+    queue.claim(f"{socket.gethostname()}:{os.getpid()}")
+    assert queue.claim("host-b:1") is None
+
+def test_fail_requeues_until_out_of_attempts(queue):
+    (job_id,) = queue.enqueue([1])
+    queue.claim("w:1")
+    assert queue.fail(job_id, "boom") == "queued"
+    queue.claim("w:1")
+    assert queue.fail(job_id, "boom again") == "failed"
+    assert queue.claim("w:1") is None
+    assert queue.get([job_id])[0]["error"] == "boom again"
+
+    assert queue.retry() == 1
+    assert status(queue, job_id) == "queued"
+    assert queue.claim("w:1").attempt == 1
+
+def test_release_does_not_spend_an_attempt(queue):
+    (job_id,) = queue.enqueue([1])
+    queue.claim("w:1")
+    queue.release(job_id)
+    assert status(queue, job_id) == "queued"
+    assert queue.claim("w:1").attempt == 1
+
+def test_step_runs_once_and_restores_the_rng(queue):
+    queue.enqueue([1])
+    job = queue.claim("w:1")
+    job.rng.random()
+    assert job.step("topic", lambda: "a claim") == "a claim"
+    expected = job.rng.random()
+    queue.release(job.id)
+
+    resumed = queue.claim("w:2")
+    assert resumed.step("topic", lambda: pytest.fail("step ran twice")) == "a claim"
+    assert resumed.rng.random() == expected
+    assert queue.checkpoint_names(job.id) == ["topic"]
+
+def test_failed_call_is_not_checkpointed(queue):
+    queue.enqueue([1])
+    job = queue.claim("w:1")
+    with pytest.raises(LLMError):
+        job.step("phase_1_2", lambda: "ERROR: rate limited")
+    assert queue.checkpoint(job.id, "phase_1_2") is None
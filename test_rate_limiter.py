@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+RATE LIMITER TESTS
+rate_limiter.TokenBucket (refill, cap, wait time) and the RateLimiter
+AIMD controller (additive increase, one halving per second on 429s,
+latency backoff, slot accounting, Retry-After pauses). Clocks are passed
+in or set directly, so nothing sleeps.
+
+    python3 -m pytest -q test_rate_limiter.py
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from rate_limiter import TokenBucket, RateLimiter, POLL_INTERVAL
+
+def test_bucket_starts_full_and_refills_at_rate():
+    bucket = TokenBucket(60)
+    now = bucket.updated
+    assert bucket.wait_time(60, now) == 0.0
+    bucket.take(60)
+    assert bucket.wait_time(1, now) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now + 0.5) == pytest.approx(0.5)
+    assert bucket.wait_time(1, now + 1.0) == 0.0
+
+def test_bucket_holds_one_minute_at_most():
+    bucket = TokenBucket(60)
+    now = bucket.updated
+    bucket.wait_time(1, now + 3600)
+    assert bucket.tokens == 60
+    bucket.give(1000)
+    assert bucket.tokens == 60
+
+def test_oversized_request_waits_for_a_full_bucket_not_forever():
+    bucket = TokenBucket(60)
+    now = bucket.updated
+    bucket.take(30)
+    assert bucket.wait_time(500, now) == pytest.approx(30.0)
+
+def limiter(**overrides):
+    settings = dict(rpm=1000, tpm=1_000_000, min_concurrency=1,
+                    max_concurrency=16, latency_target=10.0)
+    settings.update(overrides)
+    return RateLimiter(**settings)
+
+def test_slots_are_limited_to_the_concurrency_limit():
+    rl = limiter()
+    assert rl.limit == 4
+    for _ in range(4):
+        assert rl._try_acquire(10) == 0.0
+    assert rl._try_acquire(10) == POLL_INTERVAL
+    assert rl.stats()["in_flight"] == 4
+    rl.release(10, used_tokens=10, latency=1.0)
+    assert rl.stats()["in_flight"] == 3
+    assert rl._try_acquire(10) == 0.0
+
+def test_success_grows_the_limit_additively():
+    rl = limiter()
+    for _ in range(4):
+        rl._try_acquire(10)
+        rl.release(10, used_tokens=10, latency=1.0)
+    # +1/limit per success: about one more slot per limit's worth of calls
+    assert 4.9 < rl.limit < 5.0
+    assert rl.stats()["completed"] == 4
+
+def test_limit_is_capped_at_max_concurrency():
+    rl = limiter(max_concurrency=4)
+    rl._try_acquire(10)
+    rl.release(10, latency=1.0)
+    assert rl.limit == 4
+
+def test_slow_responses_shrink_the_limit():
+    rl = limiter()
+    rl._try_acquire(10)
+    rl.release(10, latency=30.0)
+    assert rl.limit == pytest.approx(3.6)
+
+def test_a_burst_of_429s_halves_the_limit_once():
+    rl = limiter(max_concurrency=16)
+    rl.limit = 16.0
+    for _ in range(3):
+        rl._try_acquire(10)
+    for _ in range(3):
+        rl.release(10, outcome="throttled")
+    assert rl.limit == 8
+    assert rl.stats()["throttled"] == 3
+
+    # A second later the next 429 counts again
+    rl.last_decrease -= 1.5
+    rl._try_acquire(10)
+    rl.release(10, outcome="throttled")
+    assert rl.limit == 4
+
+def test_throttling_never_drops_below_min_concurrency():
+    rl = limiter(min_concurrency=3)
+    rl._try_acquire(10)
+    rl.release(10, outcome="throttled")
+    assert rl.limit == 3
+
+def test_retry_after_pauses_admission():
+    rl = limiter()
+    rl._try_acquire(10)
+    rl.release(10, outcome="throttled", retry_after=5)
+    wait = rl._try_acquire(10)
+    assert 4.0 < wait <= 5.0
+    rl.paused_until = time.monotonic() - 1
+    assert rl._try_acquire(10) == 0.0
+
+def test_tokens_are_settled_on_release():
+    rl = limiter(tpm=1000)
+    rl._try_acquire(400)
+    rl.release(400, used_tokens=100, latency=1.0)
+    assert rl.tokens.tokens == pytest.approx(900, abs=1)
+
+    # Failed and rejected calls are refunded in full
+    rl._try_acquire(400)
+    rl.release(400, outcome="error")
+    assert rl.tokens.tokens == pytest.approx(900, abs=1)
+
+def test_cancelled_calls_stay_charged():
+    rl = limiter(tpm=1000)
+    rl._try_acquire(400)
+    rl.release(400, outcome="cancelled")
+    assert rl.stats()["in_flight"] == 0
+    assert rl.tokens.tokens == pytest.approx(600, abs=1)
+    assert rl.limit == 4
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+SCAN TRANSCRIPT TESTS
+synthesize_and_commit.scan_transcript must agree with the per-marker
+extractors it replaced (kept below as the reference), on handwritten
+transcripts and on seeded random ones built from marker fragments.
+
+    python3 -m pytest -q test_scan_transcript.py
+"""
+
+import os
+import re
+import sys
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthesize_and_commit import (scan_transcript, PATH_MARKERS, BOUNDARY_KEYWORDS,
+                                   BOUNDARY_QUESTION)
+
+# ============================================================================
+# REFERENCE: ONE SCAN PER MARKER
+# ============================================================================
+
+def reference_boundary(content):
+    match = re.search(r'What did you start trying to verify\?[^\n]*\n+([^\n]+)',
+                      content, re.IGNORECASE)
+    if match:
+        return re.sub(r'^[-*•]\s*', '', match.group(1).strip())[:100]
+    for line in content.split('\n'):
+        if len(line.strip()) > 20 and not line.startswith('='):
+            return line.strip()[:100]
+    return "Verification topology explored"
+
+def reference_paths(content):
+    upper = content.upper()
+    return [name for marker, name in PATH_MARKERS.items() if marker in upper][:3]
+
+def reference_boundary_types(content):
+    lower = content.lower()
+    return [kind for keyword, kind in BOUNDARY_KEYWORDS.items() if keyword in lower][:3]
+
+def reference_insights(content):
+    lower = content.lower()
+    insights = []
+    if 'route around' in lower or 'routing' in lower:
+        insights.append('Found alternative route')
+    if 'beyond' in lower and 'wall' in lower:
+        insights.append('Explored beyond wall')
+    if 'topology' in lower or 'landscape' in lower:
+        insights.append('Mapped topology')
+    return insights
+
+def assert_matches_reference(content):
+    scan = scan_transcript(content)
+    assert scan["boundary"] == reference_boundary(content), repr(content)
+    assert scan["paths"] == reference_paths(content), repr(content)
+    assert scan["boundary_types"] == reference_boundary_types(content), repr(content)
+    assert scan["insights"] == reference_insights(content), repr(content)
+
+# ============================================================================
+# TESTS
+# ============================================================================
+
+TRANSCRIPT = f"""EXPLORER - CYCLE 7
+{'=' * 70}
+
+{BOUNDARY_QUESTION}
+- That the Great Wall is visible from orbit
+
+PATH C: historical accounts. path a: authority sources. PATH E consensus.
+Hit a HARD boundary, then a circular one; found a way to route around it.
+Beyond the wall the topology looked different.
+"""
+
+def test_full_transcript():
+    scan = scan_transcript(TRANSCRIPT)
+    assert scan["boundary"] == "That the Great Wall is visible from orbit"
+    assert TRANSCRIPT[scan["boundary_offset"]:].startswith("- That the Great Wall")
+    assert scan["paths"] == ["Authority", "Historical", "Consensus"]
+    assert scan["boundary_types"] == ["Hard boundary", "Circular verification", "Authority wall"]
+    assert scan["insights"] == ["Found alternative route", "Explored beyond wall", "Mapped topology"]
+    assert_matches_reference(TRANSCRIPT)
+
+def test_offsets_are_first_positions():
+    scan = scan_transcript("soft then SOFT, wall and beyond")
+    assert scan["offsets"]["soft"] == 0
+    assert scan["offsets"]["wall"] == "soft then SOFT, wall and beyond".index("wall")
+    assert "hard" not in scan["offsets"]
+
+def test_handwritten_cases():
+    cases = [
+        "",
+        "short\n=== a header line that is long enough ===\n",
+        "=" * 30 + "\n   a long enough indented first line   \nsecond",
+        "what did you start trying to verify?\n\n* lowercase question, bulleted\n",
+        "What did you start trying to verify? (in one line)\nThe answer line\n",
+        "What did you start trying to verify?",
+        "What did you start trying to verify?\n   \nwhitespace-only line above",
+        "x" * 150 + "\nrouting beyond",
+        "Path b, path d, PATH A, Path E: more than three",
+        "hardsoftcircularauthoritypermeable",
+        "İstanbul first: What did you start trying to verify?\nDotted capitals shift lengths",
+    ]
+    for content in cases:
+        assert_matches_reference(content)
+
+def test_random_transcripts():
+    fragments = (
+        [m for m in PATH_MARKERS] + [m.lower() for m in PATH_MARKERS] +
+        list(BOUNDARY_KEYWORDS) + [k.upper() for k in BOUNDARY_KEYWORDS] +
+        ["routing", "beyond", "wall", "WALL", "topology", "landscape",
+         BOUNDARY_QUESTION, BOUNDARY_QUESTION.upper(), "\n", "\n\n", "=" * 5,
+         "- ", "* ", "• ", "   ", "path", "rout", "a fairly long line of plain words"]
+    )
+    rng = random.Random(19)
+    for _ in range(2000):
+        content = "".join(rng.choice(fragments) for _ in range(rng.randrange(0, 12)))
+        assert_matches_reference(content)
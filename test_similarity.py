@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+SIMILARITY TESTS
+similarity.ConvergenceMonitor (reseed, then stop, on a plateaued chain;
+failed steps; checkpointed state) and MinHash / MinHashLSH
+(near-duplicates found, unrelated texts not).
+
+    python3 -m pytest -q test_similarity.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from similarity import (ConvergenceMonitor, MinHashLSH, minhash, signature_similarity,
+                        pack_signature, unpack_signature)
+
+IDEA = "Verification is a landscape of walls that can be routed around by measurement"
+SHIFTED = "Verification is a landscape of walls that can be routed around by careful measurement"
+UNRELATED = "Sourdough starters need feeding twice a day in a warm kitchen"
+
+def test_plateau_reseeds_then_stops():
+    monitor = ConvergenceMonitor(threshold=0.6, patience=2, min_steps=4, max_reseeds=1)
+    signals = []
+    for _ in range(8):
+        assert monitor.observe(IDEA, IDEA) == 1.0
+        signals.append(monitor.signal())
+
+    # The streak is long enough at step 2, but min_steps holds it to step 4;
+    # a signal resets the streak, so the next plateau needs patience steps again
+    assert signals == [None, None, None, "reseed", None, "stop", None, "stop"]
+
+def test_a_moving_chain_never_signals():
+    monitor = ConvergenceMonitor(threshold=0.6, patience=2, min_steps=1)
+    for _ in range(6):
+        assert monitor.observe(IDEA, UNRELATED) < 0.6
+        assert monitor.signal() is None
+    assert monitor.streak == 0
+
+def test_failed_steps_count_as_steps_but_not_towards_the_streak():
+    monitor = ConvergenceMonitor(threshold=0.6, patience=2, min_steps=3)
+    assert monitor.observe(IDEA, IDEA) == 1.0
+    assert monitor.observe(IDEA, "ERROR: timeout", failed=True) is None
+    assert monitor.streak == 1
+    assert monitor.signal() is None
+    monitor.observe(IDEA, IDEA)
+    assert monitor.steps == 3
+    assert monitor.signal() == "reseed"
+
+def test_state_round_trips():
+    monitor = ConvergenceMonitor(patience=3, min_steps=1)
+    for _ in range(2):
+        monitor.observe(IDEA, IDEA)
+    resumed = ConvergenceMonitor(patience=3, min_steps=1)
+    resumed.load_state(monitor.state())
+
+    assert resumed.state() == {"steps": 2, "streak": 2, "reseeds": 0}
+    resumed.observe(IDEA, IDEA)
+    assert resumed.signal() == "reseed"
+
+def test_minhash_estimates_similarity():
+    assert minhash(IDEA) == minhash(IDEA.upper())
+    assert signature_similarity(minhash(IDEA), minhash(IDEA)) == 1.0
+    assert signature_similarity(minhash(IDEA), minhash(SHIFTED)) > 0.7
+    assert signature_similarity(minhash(IDEA), minhash(UNRELATED)) < 0.2
+
+def test_signature_packing_round_trips():
+    signature = minhash(IDEA)
+    assert unpack_signature(pack_signature(signature)) == signature
+
+def test_lsh_finds_near_duplicates_only():
+    lsh = MinHashLSH()
+    lsh.add("idea", minhash(IDEA))
+    lsh.add("bread", minhash(UNRELATED))
+    assert len(lsh) == 2
+
+    matches = lsh.query(minhash(SHIFTED), threshold=0.5)
+    assert [key for _, key in matches] == ["idea"]
+    assert lsh.query(minhash("Quarterly tax filings for small shops"), threshold=0.5) == []
+
+def test_lsh_query_is_sorted_most_similar_first():
+    lsh = MinHashLSH()
+    lsh.add("exact", minhash(IDEA))
+    lsh.add("shifted", minhash(SHIFTED))
+    matches = lsh.query(minhash(IDEA), threshold=0.0)
+
+    assert [key for _, key in matches] == ["exact", "shifted"]
+    assert matches[0][0] == 1.0
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+TRANSCRIPT WRITER TESTS
+transcript_writer.GauntletReport fills its fixed-width header slots in
+once the gauntlet is over, and GauntletReportWriter only ever shows the
+finished report at its path: a .partial until finish() renames it, left
+behind by abort(), with the JSON-lines sidecar alongside.
+
+    python3 -m pytest -q test_transcript_writer.py
+"""
+
+import io
+import os
+import sys
+import json
+import re
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from transcript_writer import GauntletReport, GauntletReportWriter
+
+START = datetime(2026, 1, 2, 3, 4, 5)
+
+REFLECTION = {
+    "iteration": 1,
+    "noise_operations": ["inversion", "scale_shift"],
+    "idea_before": "the first idea",
+    "idea_after": "the second idea"
+}
+
+def write_report(report):
+    report.phase_1_2("boundary text")
+    report.phase_3(["invert it"], "the first idea")
+    report.iteration(REFLECTION)
+    return report.finish("the second idea", "in plain words", 1, "converged", 12.345)
+
+def test_slots_are_filled_in():
+    f = io.StringIO()
+    write_report(GauntletReport(f, 7, START))
+    text = f.getvalue()
+
+    assert text.startswith("EXPLORER - DAY 2 - CYCLE 7 [QUANTUM GAUNTLET MODE]\n")
+    assert "Timestamp: 20260102_030405\n" in text
+    assert re.search(r"^Elapsed: +12\.35s$", text, re.M)
+    assert re.search(r"^Gauntlet Iterations: +1$", text, re.M)
+    assert re.search(r"^Iterations: +1$", text, re.M)
+    assert re.search(r"^Stopped: converged$", text, re.M)
+    assert "[Iteration 1] Perturbations: inversion, scale_shift\n" in text
+    assert "After: the second idea...\n" in text
+    assert text.endswith("TRANSLATION (Plain Language)\n" + "=" * 70 +
+                         "\n\nin plain words\n\n" + "=" * 70 + "\n")
+
+def test_wide_values_fill_the_whole_slot():
+    f = io.StringIO()
+    report = GauntletReport(f, 1, START)
+    report.phase_3([], "idea")
+    report.finish("idea", "plain", 999, "completed", 0.5)
+    text = f.getvalue()
+
+    assert "Gauntlet Iterations: 999\n" in text
+    assert "Stopped: completed\n" in text
+    assert re.search(r"^Elapsed: +0\.50s$", text, re.M)
+
+def test_report_is_renamed_into_place_on_finish(tmp_path):
+    path = tmp_path / "cycle_7.txt"
+    writer = GauntletReportWriter(path, 7, START, topic="a claim", sidecar=True)
+    writer.phase_1_2("boundary text")
+
+    partials = sorted(p.name for p in tmp_path.iterdir())
+    assert not path.exists()
+    assert len(partials) == 2 and all(name.endswith(".partial") for name in partials)
+    # Finished sections are already readable in the partial file
+    assert "boundary text" in open(writer.temp_path, encoding="utf-8").read()
+
+    writer.phase_3(["invert it"], "the first idea")
+    writer.iteration(REFLECTION)
+    assert writer.finish("the second idea", "in plain words", 1, "converged", 1.0) == str(path)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["cycle_7.jsonl", "cycle_7.txt"]
+    assert "Stopped: converged" in path.read_text(encoding="utf-8")
+    events = [json.loads(line) for line in (tmp_path / "cycle_7.jsonl").read_text().splitlines()]
+    assert [e["event"] for e in events] == ["start", "phase_1_2", "phase_3", "iteration", "finish"]
+    assert events[0]["topic"] == "a claim"
+    assert events[3]["idea_after"] == "the second idea"
+    assert events[4]["stop_reason"] == "converged"
+
+def test_no_sidecar_by_default(tmp_path):
+    path = tmp_path / "cycle_1.txt"
+    write_report(GauntletReportWriter(path, 1, START))
+    assert [p.name for p in tmp_path.iterdir()] == ["cycle_1.txt"]
+
+def test_abort_leaves_the_partial_and_never_the_report(tmp_path):
+    path = tmp_path / "cycle_3.txt"
+    path.write_text("an earlier finished run")
+    writer = GauntletReportWriter(path, 3, START)
+    writer.phase_1_2("boundary text")
+    writer.abort()
+
+    assert path.read_text() == "an earlier finished run"
+    assert os.path.exists(writer.temp_path)
+    assert "boundary text" in open(writer.temp_path, encoding="utf-8").read()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+TOPIC INDEX
+Local near-duplicate check for generated topics, before a cycle is spent
+- MinHash signatures of every explored topic and gauntlet final idea,
+  persisted in the run store, queried through banded LSH in memory
+- A new topic whose estimated similarity to a past one reaches the
+  threshold is rejected (explorer_gauntlet regenerates it)
+No network: the check is a few hashes and dictionary lookups.
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+from itertools import count
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from config.api_config import TOPIC_DUPLICATE_THRESHOLD
+from similarity import minhash, MinHashLSH, pack_signature, unpack_signature
+from run_store import RunStore, default_store
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS topic_signatures (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER REFERENCES runs (id),
+    kind TEXT NOT NULL,
+    text TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+class TopicIndex:
+    """Explored topics and final ideas; in memory only when store is None"""
+
+    def __init__(self, store=None, threshold=TOPIC_DUPLICATE_THRESHOLD):
+        self.store = store
+        self.threshold = threshold
+        self.lsh = MinHashLSH()
+        self.entries = {}
+        self.last_id = 0
+        self._keys = count(1)
+        self._lock = threading.Lock()
+        if store:
+            with store.connection() as conn:
+                conn.executescript(SCHEMA)
+            self.refresh()
+
+    def refresh(self):
+        """Pick up entries other processes added since the last load"""
+        if not self.store:
+            return
+        rows = self.store.connection().execute(
+            "SELECT id, kind, text, signature FROM topic_signatures WHERE id > ? ORDER BY id",
+            (self.last_id,)
+        ).fetchall()
+        with self._lock:
+            for row in rows:
+                self.lsh.add(row["id"], unpack_signature(row["signature"]))
+                self.entries[row["id"]] = (row["kind"], row["text"])
+                self.last_id = row["id"]
+
+    def find_duplicate(self, text):
+        """(similarity, kind, past text) of the closest past entry over threshold, or None"""
+        self.refresh()
+        with self._lock:
+            matches = self.lsh.query(minhash(text), self.threshold)
+            if not matches:
+                return None
+            similarity, key = matches[0]
+            kind, past = self.entries[key]
+        return similarity, kind, past
+
+    def add(self, text, kind="topic", run_id=None):
+        signature = minhash(text)
+        if self.store:
+            with self.store.connection() as conn:
+                conn.execute(
+                    "INSERT INTO topic_signatures (run_id, kind, text, signature, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (run_id, kind, text, pack_signature(signature), time.time())
+                )
+            self.refresh()
+        else:
+            with self._lock:
+                key = next(self._keys)
+                self.lsh.add(key, signature)
+                self.entries[key] = (kind, text)
+
+    def backfill(self):
+        """Index topics and final ideas of runs recorded before this index existed"""
+        if not self.store:
+            return 0
+        conn = self.store.connection()
+        rows = conn.execute(
+            "SELECT r.id, 'topic' AS kind, r.topic AS text FROM runs r "
+            "WHERE r.topic IS NOT NULL AND NOT EXISTS ("
+            "  SELECT 1 FROM topic_signatures t WHERE t.run_id = r.id AND t.kind = 'topic') "
+            "UNION ALL "
+            "SELECT g.run_id, 'final_idea', g.idea_after FROM gauntlet_iterations g "
+            "WHERE g.iteration = (SELECT MAX(iteration) FROM gauntlet_iterations "
+            "                     WHERE run_id = g.run_id) "
+            "AND NOT EXISTS (SELECT 1 FROM topic_signatures t "
+            "                WHERE t.run_id = g.run_id AND t.kind = 'final_idea')"
+        ).fetchall()
+        for row in rows:
+            if row["text"]:
+                self.add(row["text"], row["kind"], row["id"])
+        return len(rows)
+
+    def __len__(self):
+        return len(self.lsh)
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+def default_topic_index():
+    """Process-wide index over the run store (in memory when RUN_STORE is off)"""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = TopicIndex(default_store())
+        return _default_index
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Near-duplicate topic index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    check = sub.add_parser("check", help="would this topic be rejected?")
+    check.add_argument("topic")
+    sub.add_parser("backfill", help="index topics/final ideas of earlier runs")
+    args = parser.parse_args()
+
+    index = TopicIndex(RunStore())
+
+    if args.command == "backfill":
+        print(f"✅ Indexed {index.backfill()} entries ({len(index)} total)")
+    else:
+        match = index.find_duplicate(args.topic)
+        if match:
+            similarity, kind, past = match
+            print(f"❌ Duplicate ({similarity:.2f}) of past {kind}: {past}")
+            sys.exit(1)
+        print(f"✅ New topic (checked against {len(index)} entries)")
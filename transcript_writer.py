@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+TRANSCRIPT WRITER
+Streams the REASONING/OUTPUT transcript format used by run_explorer.py and
+ProofOfConceptLoop to disk while the completion is still arriving, and the
+gauntlet report (explorer_gauntlet.py) one phase / iteration at a time
+"""
+
+import os
+import json
+import threading
+
+# Room reserved in the header for the elapsed time, filled in on close
+ELAPSED_WIDTH = 10
+
+class TranscriptWriter:
+    """
+    Same layout as the files the explorers write in one go, except the
+    elapsed time is right-aligned in a fixed-width slot. Pass write as the
+    on_delta callback of llm_client.stream_completion.
+    """
+
+    def __init__(self, path, title, timestamp, state):
+        self.path = path
+        self.f = open(path, 'w')
+        self.f.write(f"{title}\n")
+        self.f.write("="*70 + "\n\n")
+        self.f.write(f"Timestamp: {timestamp}\n")
+        self.f.write("Elapsed: ")
+        self.elapsed_at = self.f.tell()
+        self.f.write(" " * ELAPSED_WIDTH + "s\n\n")
+        self.f.write(f"Emotional State:\n{json.dumps(state, indent=2)}\n\n")
+        self.f.write("="*70 + "\n")
+        self.f.write("REASONING:\n")
+        self.f.write("="*70 + "\n\n")
+        self.f.flush()
+        self.in_output = False
+        self.wrote_reasoning = False
+
+    def _open_output(self):
+        if not self.wrote_reasoning:
+            self.f.write("None")
+        self.f.write("\n\n")
+        self.f.write("="*70 + "\n")
+        self.f.write("OUTPUT:\n")
+        self.f.write("="*70 + "\n\n")
+        self.in_output = True
+
+    def write(self, kind, text):
+        """on_delta callback: append a reasoning or content delta"""
+        if kind == "content" and not self.in_output:
+            self._open_output()
+        elif kind == "reasoning":
+            self.wrote_reasoning = True
+        self.f.write(text)
+        self.f.flush()
+
+    def close(self, elapsed):
+        """Finish the OUTPUT section and fill in the elapsed time"""
+        if not self.in_output:
+            self._open_output()
+        self.f.seek(self.elapsed_at)
+        self.f.write(f"{elapsed:.2f}".rjust(ELAPSED_WIDTH))
+        self.f.close()
+
+# ============================================================================
+# GAUNTLET REPORT
+# ============================================================================
+
+# Header slots filled in once the gauntlet is over
+ITERATIONS_WIDTH = 3
+STOP_REASON_WIDTH = 9
+
+RULE = "=" * 70
+
+class GauntletReport:
+    """
+    The gauntlet report layout, written section by section to a text
+    stream. Counts that are only known at the end (elapsed, iterations,
+    stop reason) go in fixed-width slots that finish() fills in.
+    """
+
+    def __init__(self, f, cycle_num, start_time):
+        self.f = f
+        self._slots = {}
+        f.write(f"EXPLORER - DAY 2 - CYCLE {cycle_num} [QUANTUM GAUNTLET MODE]\n{RULE}\n\n")
+        f.write(f"Timestamp: {start_time.strftime('%Y%m%d_%H%M%S')}\n")
+        f.write("Elapsed: ")
+        self._slot("elapsed", ELAPSED_WIDTH)
+        f.write("s\nGauntlet Iterations: ")
+        self._slot("iterations", ITERATIONS_WIDTH)
+        f.write("\n\n")
+
+    def _slot(self, name, width):
+        self._slots.setdefault(name, []).append((self.f.tell(), width))
+        self.f.write(" " * width)
+
+    def _section(self, title):
+        self.f.write(f"{RULE}\n{title}\n{RULE}\n\n")
+
+    def phase_1_2(self, text):
+        self._section("PHASES 1-2: BOUNDARY EXPLORATION")
+        self.f.write(f"{text}\n\n")
+
+    def phase_3(self, perturbations, initial_idea):
+        """Phase 3 and the head of the gauntlet section"""
+        self._section("PHASE 3: INITIAL IDEA (Pre-Gauntlet)")
+        self.f.write(f"Initial Perturbations: {perturbations}\n\n{initial_idea}\n\n")
+        self._section("QUANTUM GAUNTLET: EVOLUTIONARY REFINEMENT")
+        self.f.write("Iterations: ")
+        self._slot("iterations", ITERATIONS_WIDTH)
+        self.f.write("\nStopped: ")
+        self._slot("stop_reason", STOP_REASON_WIDTH)
+        self.f.write("\n\n")
+
+    def iteration(self, reflection):
+        self.f.write(f"\n[Iteration {reflection['iteration']}] Perturbations: "
+                     f"{', '.join(reflection['noise_operations'])}\n")
+        self.f.write(f"Before: {reflection['idea_before'][:100]}...\n")
+        self.f.write(f"After: {reflection['idea_after'][:100]}...\n")
+
+    def finish(self, final_idea, translation, iterations, stop_reason, elapsed):
+        self.f.write("\n")
+        self._section("FINAL IDEA (Post-Gauntlet)")
+        self.f.write(f"{final_idea}\n\n")
+        self._section("TRANSLATION (Plain Language)")
+        self.f.write(f"{translation}\n\n{RULE}\n")
+        end = self.f.tell()
+        for name, value in (("elapsed", f"{elapsed:.2f}"), ("iterations", str(iterations)),
+                            ("stop_reason", stop_reason)):
+            for offset, width in self._slots.get(name, ()):
+                self.f.seek(offset)
+                self.f.write(value.rjust(width))
+        self.f.seek(end)
+
+class GauntletReportWriter(GauntletReport):
+    """
+    GauntletReport streamed to disk: sections land in a private temp file
+    next to path as they complete (partial progress is visible there) and
+    the finished report is renamed over path, so a reader or a concurrent
+    run of the same cycle never sees half a report. With sidecar=True each
+    section is also written as a JSON line to <path stem>.jsonl.
+    """
+
+    def __init__(self, path, cycle_num, start_time, topic=None, sidecar=False):
+        self.path = str(path)
+        tag = f"{os.getpid()}-{threading.get_ident()}"
+        self.temp_path = f"{self.path}.{tag}.partial"
+        self.sidecar_path = os.path.splitext(self.path)[0] + ".jsonl" if sidecar else None
+        self.sidecar = None
+        if sidecar:
+            self.sidecar = open(f"{self.sidecar_path}.{tag}.partial", "w", encoding="utf-8")
+        super().__init__(open(self.temp_path, "w", encoding="utf-8"), cycle_num, start_time)
+        self._event("start", cycle=cycle_num, topic=topic,
+                    timestamp=start_time.strftime('%Y%m%d_%H%M%S'))
+
+    def _event(self, event, **fields):
+        if self.sidecar:
+            self.sidecar.write(json.dumps({"event": event, **fields}, ensure_ascii=False) + "\n")
+            self.sidecar.flush()
+        self.f.flush()
+
+    def phase_1_2(self, text):
+        super().phase_1_2(text)
+        self._event("phase_1_2", text=text)
+
+    def phase_3(self, perturbations, initial_idea):
+        super().phase_3(perturbations, initial_idea)
+        self._event("phase_3", perturbations=perturbations, initial_idea=initial_idea)
+
+    def iteration(self, reflection):
+        super().iteration(reflection)
+        self._event("iteration", **reflection)
+
+    def finish(self, final_idea, translation, iterations, stop_reason, elapsed):
+        """Complete the report and move it (and the sidecar) into place; returns path"""
+        super().finish(final_idea, translation, iterations, stop_reason, elapsed)
+        self._event("finish", final_idea=final_idea, translation=translation,
+                    iterations=iterations, stop_reason=stop_reason, elapsed=round(elapsed, 3))
+        for f, path in ((self.f, self.path), (self.sidecar, self.sidecar_path)):
+            if f is None:
+                continue
+            os.fsync(f.fileno())
+            f.close()
+            os.replace(f.name, path)
+        return self.path
+
+    def abort(self):
+        """Stop writing; the .partial files stay behind for a post-mortem"""
+        for f in (self.f, self.sidecar):
+            if f is not None and not f.closed:
+                f.close()